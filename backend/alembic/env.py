@@ -0,0 +1,51 @@
+from logging.config import fileConfig
+from alembic import context
+from app.utils.database import Base, engine
+# Import every model so its tables are part of Base.metadata
+from app.models import user, movie, showtime, ticket, support, idempotency  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+def include_object_for(dialect_name: str):
+    # Indexes declared with ddl_if(dialect=...) only exist on that database
+    def include_object(object, name, type_, reflected, compare_to):
+        ddl_if = getattr(object, "_ddl_if", None)
+        if ddl_if is None or ddl_if.dialect is None:
+            return True
+        dialects = (ddl_if.dialect,) if isinstance(ddl_if.dialect, str) else ddl_if.dialect
+        return dialect_name in dialects
+    return include_object
+
+def run_migrations_offline():
+    # Emits the SQL instead of running it: alembic upgrade head --sql
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_object=include_object_for(connection.dialect.name),
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,88 @@
+"""seat booking showtime
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 11:03:18.274610
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# Booking statuses whose seats are taken, as the app sets seat_bookings.is_active
+ACTIVE_BOOKING_STATUSES = ('PENDING', 'CONFIRMED')
+
+seat_bookings = sa.table(
+    'seat_bookings',
+    sa.column('booking_id', sa.Integer),
+    sa.column('showtime_id', sa.Integer),
+    sa.column('seat_id', sa.Integer),
+    sa.column('is_active', sa.Boolean),
+)
+bookings = sa.table(
+    'bookings',
+    sa.column('id', sa.Integer),
+    sa.column('showtime_id', sa.Integer),
+    sa.column('status', sa.String),
+)
+
+
+def backfill_seat_bookings():
+    # Seats sold before this revision must keep counting as taken, so every row copies
+    # its booking's showtime and whether that booking still holds its seats
+    of_booking = bookings.c.id == seat_bookings.c.booking_id
+    op.execute(
+        seat_bookings.update().values(
+            showtime_id=sa.select(bookings.c.showtime_id).where(of_booking).scalar_subquery(),
+            is_active=sa.func.coalesce(
+                sa.select(bookings.c.status.in_(ACTIVE_BOOKING_STATUSES)).where(of_booking).scalar_subquery(),
+                sa.false()
+            ),
+        )
+    )
+
+
+def check_no_double_sold_seats():
+    # The unique index cannot be built over seats already sold twice; those need a
+    # decision (which booking to cancel and refund) that a migration should not make
+    if context.is_offline_mode():
+        return
+    duplicates = op.get_bind().execute(
+        sa.select(seat_bookings.c.showtime_id, seat_bookings.c.seat_id, sa.func.count())
+        .where(seat_bookings.c.is_active.is_(True))
+        .group_by(seat_bookings.c.showtime_id, seat_bookings.c.seat_id)
+        .having(sa.func.count() > 1)
+    ).all()
+    if duplicates:
+        sample = ", ".join(f"showtime {row[0]} seat {row[1]}" for row in duplicates[:10])
+        raise RuntimeError(
+            f"{len(duplicates)} seats are held by more than one active booking ({sample}). "
+            "Cancel the extra bookings, then run the migration again."
+        )
+
+
+def upgrade():
+    with op.batch_alter_table('seat_bookings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('showtime_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('is_active', sa.Boolean(), nullable=True))
+        batch_op.create_foreign_key('fk_seat_bookings_showtime_id_showtimes', 'showtimes', ['showtime_id'], ['id'])
+
+    backfill_seat_bookings()
+    check_no_double_sold_seats()
+
+    with op.batch_alter_table('seat_bookings', schema=None) as batch_op:
+        batch_op.create_index('uq_seat_bookings_active_showtime_seat', ['showtime_id', 'seat_id'], unique=True, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+
+
+def downgrade():
+    with op.batch_alter_table('seat_bookings', schema=None) as batch_op:
+        batch_op.drop_index('uq_seat_bookings_active_showtime_seat', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+        batch_op.drop_constraint('fk_seat_bookings_showtime_id_showtimes', type_='foreignkey')
+        batch_op.drop_column('is_active')
+        batch_op.drop_column('showtime_id')
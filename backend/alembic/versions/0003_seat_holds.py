@@ -0,0 +1,51 @@
+"""seat holds
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:05:42.913855
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('seat_holds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('hold_reference', sa.String(), nullable=True),
+    sa.Column('showtime_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('seat_ids', sa.String(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['showtime_id'], ['showtimes.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('seat_holds', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_seat_holds_expires_at'), ['expires_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_seat_holds_hold_reference'), ['hold_reference'], unique=True)
+        batch_op.create_index(batch_op.f('ix_seat_holds_id'), ['id'], unique=False)
+
+    # Pending booking expiry sweeper
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('ix_bookings_status_created_at', ['status', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookings_status_created_at')
+
+    with op.batch_alter_table('seat_holds', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_seat_holds_id'))
+        batch_op.drop_index(batch_op.f('ix_seat_holds_hold_reference'))
+        batch_op.drop_index(batch_op.f('ix_seat_holds_expires_at'))
+
+    op.drop_table('seat_holds')
@@ -0,0 +1,38 @@
+"""showtime occupancy
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:08:27.160342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('showtime_occupancy',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('showtime_id', sa.Integer(), nullable=True),
+    sa.Column('seat_type', sa.String(), nullable=True),
+    sa.Column('total_seats', sa.Integer(), nullable=True),
+    sa.Column('booked_seats', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['showtime_id'], ['showtimes.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('showtime_id', 'seat_type', name='uq_showtime_occupancy_showtime_seat_type')
+    )
+    with op.batch_alter_table('showtime_occupancy', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_showtime_occupancy_id'), ['id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('showtime_occupancy', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_showtime_occupancy_id'))
+
+    op.drop_table('showtime_occupancy')
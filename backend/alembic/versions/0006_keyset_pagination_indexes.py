@@ -0,0 +1,32 @@
+"""keyset pagination indexes
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 11:14:51.037729
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('ix_bookings_user_id_id', ['user_id', 'id'], unique=False)
+
+    with op.batch_alter_table('support_tickets', schema=None) as batch_op:
+        batch_op.create_index('ix_support_tickets_user_id_id', ['user_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('support_tickets', schema=None) as batch_op:
+        batch_op.drop_index('ix_support_tickets_user_id_id')
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookings_user_id_id')
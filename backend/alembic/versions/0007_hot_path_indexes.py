@@ -0,0 +1,73 @@
+"""hot path indexes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 11:20:04.512381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# Bookings that still hold seats
+ACTIVE_BOOKING = sa.text("status IN ('PENDING', 'CONFIRMED')")
+
+
+def upgrade():
+    with op.batch_alter_table('seat_bookings', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_seat_bookings_booking_id'), ['booking_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_seat_bookings_seat_id'), ['seat_id'], unique=False)
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.create_index('ix_bookings_showtime_id_active', ['showtime_id'], unique=False, postgresql_where=ACTIVE_BOOKING, sqlite_where=ACTIVE_BOOKING)
+
+    with op.batch_alter_table('seats', schema=None) as batch_op:
+        batch_op.create_index('ix_seats_theater_id_id', ['theater_id', 'id'], unique=False)
+
+    with op.batch_alter_table('showtimes', schema=None) as batch_op:
+        batch_op.create_index('ix_showtimes_movie_id_start_time', ['movie_id', 'start_time'], unique=False)
+        batch_op.create_index('ix_showtimes_theater_id_start_time', ['theater_id', 'start_time'], unique=False)
+        batch_op.create_index('ix_showtimes_start_time_active', ['start_time'], unique=False, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.create_index('ix_movies_id_active', ['id'], unique=False, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+
+    with op.batch_alter_table('movie_genres', schema=None) as batch_op:
+        batch_op.create_index('ix_movie_genres_genre_id_movie_id', ['genre_id', 'movie_id'], unique=False)
+        batch_op.create_index('ix_movie_genres_movie_id', ['movie_id'], unique=False)
+
+    with op.batch_alter_table('support_interactions', schema=None) as batch_op:
+        batch_op.create_index('ix_support_interactions_ticket_id_created_at', ['support_ticket_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('support_interactions', schema=None) as batch_op:
+        batch_op.drop_index('ix_support_interactions_ticket_id_created_at')
+
+    with op.batch_alter_table('movie_genres', schema=None) as batch_op:
+        batch_op.drop_index('ix_movie_genres_movie_id')
+        batch_op.drop_index('ix_movie_genres_genre_id_movie_id')
+
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_index('ix_movies_id_active', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+
+    with op.batch_alter_table('showtimes', schema=None) as batch_op:
+        batch_op.drop_index('ix_showtimes_start_time_active', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active'))
+        batch_op.drop_index('ix_showtimes_theater_id_start_time')
+        batch_op.drop_index('ix_showtimes_movie_id_start_time')
+
+    with op.batch_alter_table('seats', schema=None) as batch_op:
+        batch_op.drop_index('ix_seats_theater_id_id')
+
+    with op.batch_alter_table('bookings', schema=None) as batch_op:
+        batch_op.drop_index('ix_bookings_showtime_id_active', postgresql_where=ACTIVE_BOOKING, sqlite_where=ACTIVE_BOOKING)
+
+    with op.batch_alter_table('seat_bookings', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_seat_bookings_seat_id'))
+        batch_op.drop_index(batch_op.f('ix_seat_bookings_booking_id'))
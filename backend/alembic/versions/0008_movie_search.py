@@ -0,0 +1,50 @@
+"""movie search
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 11:42:17.208349
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# Same document MovieRepository writes on every movie change
+BACKFILL_SEARCH_VECTOR = """
+UPDATE movies SET search_vector =
+    setweight(to_tsvector('simple', coalesce(movies.title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce((
+        SELECT string_agg(genres.name, ' ')
+        FROM genres JOIN movie_genres ON movie_genres.genre_id = genres.id
+        WHERE movie_genres.movie_id = movies.id
+    ), '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(movies.description, '')), 'C')
+"""
+
+
+def upgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_vector', sa.Text().with_variant(postgresql.TSVECTOR(), 'postgresql'), nullable=True))
+
+    # Other databases search through the in-process index and need neither
+    if op.get_context().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute(BACKFILL_SEARCH_VECTOR)
+        op.create_index('ix_movies_search_vector', 'movies', ['search_vector'], unique=False, postgresql_using='gin')
+        op.create_index('ix_movies_title_trgm', 'movies', ['title'], unique=False, postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+
+
+def downgrade():
+    if op.get_context().dialect.name == 'postgresql':
+        op.drop_index('ix_movies_title_trgm', table_name='movies', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+        op.drop_index('ix_movies_search_vector', table_name='movies', postgresql_using='gin')
+
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_column('search_vector')
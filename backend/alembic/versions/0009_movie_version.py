@@ -0,0 +1,26 @@
+"""movie version
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 12:05:41.530912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('movies', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ..utils.database import get_db
+from ..utils.pagination import set_next_cursor
+from ..utils.fast_json import fast_json
 from ..services.auth_service import AuthService
 from ..schemas.user import User, UserCreate, UserUpdate
 from ..middleware.auth_middleware import get_current_admin_user
 from ..repositories.auth_repository import AuthRepository
+from ..utils.principal_cache import principal_cache
 
 router = APIRouter(
     prefix="/admin",
@@ -18,13 +21,15 @@ auth_repository = AuthRepository()
 
 @router.get("/users/", response_model=List[User])
 def read_users(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    users = auth_repository.get_users(db, skip=skip, limit=limit, cursor=cursor)
+    return fast_json(List[User], set_next_cursor(response, users), response)
 
 @router.get("/users/{user_id}", response_model=User)
 def read_user(
@@ -69,6 +74,7 @@ def update_user(
         setattr(db_user, key, value)
     
     db.commit()
+    principal_cache.invalidate(user_id)
     db.refresh(db_user)
     return db_user
 
@@ -85,5 +91,7 @@ def deactivate_user(
     # Instead of deleting, set is_active to False
     db_user.is_active = False
     db.commit()
+    # Takes effect on this user's next request, not when the cached entry expires
+    principal_cache.invalidate(user_id)
     db.refresh(db_user)
     return db_user
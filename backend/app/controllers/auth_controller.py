@@ -20,8 +20,8 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     return auth_service.register_user(db=db, user=user)
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    return auth_service.login(db=db, username=form_data.username, password=form_data.password)
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    return await auth_service.login(db=db, username=form_data.username, password=form_data.password)
 
 @router.get("/me", response_model=User)
 def read_users_me(current_user: User = Depends(get_current_active_user)):
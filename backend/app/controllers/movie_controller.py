@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from ..utils.database import get_db
+from ..utils.read_replicas import get_read_db, get_async_read_db
 from ..services.movie_service import MovieService
 from ..schemas.movie import Movie, MovieCreate, MovieUpdate, Genre, GenreCreate
 from ..schemas.user import User
@@ -16,27 +18,37 @@ router = APIRouter(
 movie_service = MovieService()
 
 @router.get("/", response_model=List[Movie])
-def read_movies(
+async def read_movies(
     skip: int = 0, 
     limit: int = 100,
     title: Optional[str] = None,
     genre_id: Optional[int] = None,
     is_active: Optional[bool] = True,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    movies = movie_service.get_movies(
+    # Served from the catalog cache as raw JSON, or as a 304 when If-None-Match is current;
+    # response_model still documents the shape
+    cached = await movie_service.get_movies_response_async(
         db, 
         skip=skip, 
         limit=limit,
         title_search=title,
         genre_id=genre_id,
-        is_active=is_active
+        is_active=is_active,
+        cursor=cursor,
+        if_none_match=if_none_match
     )
-    return movies
+    return cached.to_response()
 
 @router.get("/{movie_id}", response_model=Movie)
-def read_movie(movie_id: int, db: Session = Depends(get_db)):
-    return movie_service.get_movie(db, movie_id=movie_id)
+def read_movie(
+    movie_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    return movie_service.get_movie_response(db, movie_id=movie_id, if_none_match=if_none_match).to_response()
 
 @router.post("/", response_model=Movie)
 def create_movie(
@@ -65,12 +77,24 @@ def delete_movie(
 
 # Genre endpoints
 @router.get("/genres/", response_model=List[Genre])
-def read_genres(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    genres = movie_service.get_genres(db, skip=skip, limit=limit)
-    return genres
+async def read_genres(
+    skip: int = 0, 
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    cached = await movie_service.get_genres_response_async(
+        db,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        if_none_match=if_none_match
+    )
+    return cached.to_response()
 
 @router.get("/genres/{genre_id}", response_model=Genre)
-def read_genre(genre_id: int, db: Session = Depends(get_db)):
+def read_genre(genre_id: int, db: Session = Depends(get_read_db)):
     return movie_service.get_genre(db, genre_id=genre_id)
 
 @router.post("/genres/", response_model=Genre)
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime
+from ..utils.database import get_db
+from ..utils.read_replicas import get_read_db
+from ..utils.fast_json import fast_json
+from ..services.showtime_service import ShowtimeService
+from ..schemas.showtime import Showtime, ScheduledShowtime, ShowtimeCreate, ShowtimeUpdate
+from ..schemas.user import User
+from ..middleware.auth_middleware import get_current_admin_user
+
+router = APIRouter(
+    prefix="/showtimes",
+    tags=["showtimes"],
+    responses={404: {"description": "Not found"}},
+)
+
+showtime_service = ShowtimeService()
+
+@router.get("/", response_model=List[ScheduledShowtime])
+def read_schedule(
+    movie_id: Optional[int] = None,
+    theater_id: Optional[int] = None,
+    start: Optional[datetime] = Query(None, description="defaults to now"),
+    end: Optional[datetime] = Query(None, description="defaults to a week after start"),
+    db: Session = Depends(get_read_db)
+):
+    # Active showtimes starting in [start, end), in start time order, from the schedule index
+    return fast_json(List[ScheduledShowtime], showtime_service.get_schedule(db, start=start, end=end, movie_id=movie_id, theater_id=theater_id))
+
+@router.get("/today", response_model=List[ScheduledShowtime])
+def read_todays_schedule(
+    movie_id: Optional[int] = None,
+    theater_id: Optional[int] = None,
+    db: Session = Depends(get_read_db)
+):
+    return fast_json(List[ScheduledShowtime], showtime_service.get_todays_schedule(db, movie_id=movie_id, theater_id=theater_id))
+
+@router.get("/{showtime_id}", response_model=Showtime)
+def read_showtime(showtime_id: int, db: Session = Depends(get_read_db)):
+    return fast_json(Showtime, showtime_service.get_showtime(db, showtime_id=showtime_id))
+
+@router.post("/", response_model=Showtime)
+def create_showtime(
+    showtime: ShowtimeCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    return showtime_service.create_showtime(db=db, showtime=showtime)
+
+@router.put("/{showtime_id}", response_model=Showtime)
+def update_showtime(
+    showtime_id: int,
+    showtime: ShowtimeUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    return showtime_service.update_showtime(db=db, showtime_id=showtime_id, showtime=showtime)
+
+@router.delete("/{showtime_id}", response_model=Showtime)
+def deactivate_showtime(
+    showtime_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    # Takes the showtime off sale; its bookings are kept
+    return showtime_service.deactivate_showtime(db=db, showtime_id=showtime_id)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from ..utils.database import get_db
+from ..utils.read_replicas import get_read_db
+from ..utils.pagination import set_next_cursor
+from ..utils.fast_json import fast_json
 from ..services.support_service import SupportService
 from ..schemas.support import SupportTicket, SupportTicketCreate, SupportTicketUpdate, SupportInteraction, SupportInteractionCreate
 from ..schemas.user import User
@@ -17,10 +20,12 @@ support_service = SupportService()
 
 @router.get("/tickets/", response_model=List[SupportTicket])
 def read_support_tickets(
+    response: Response,
     skip: int = 0, 
     limit: int = 100,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     # Regular users can only see their own tickets
@@ -30,7 +35,8 @@ def read_support_tickets(
             skip=skip, 
             limit=limit,
             user_id=current_user.id,
-            status=status
+            status=status,
+            cursor=cursor
         )
     else:
         # Admins can see all tickets or filter by support agent
@@ -40,14 +46,15 @@ def read_support_tickets(
             skip=skip, 
             limit=limit,
             support_agent_id=support_agent_id,
-            status=status
+            status=status,
+            cursor=cursor
         )
-    return tickets
+    return fast_json(List[SupportTicket], set_next_cursor(response, tickets), response)
 
 @router.get("/tickets/{ticket_id}", response_model=SupportTicket)
 def read_support_ticket(
     ticket_id: int, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     ticket = support_service.get_support_ticket(db, ticket_id=ticket_id)
@@ -64,7 +71,7 @@ def read_support_ticket(
 @router.get("/tickets/reference/{ticket_reference}", response_model=SupportTicket)
 def read_support_ticket_by_reference(
     ticket_reference: str, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     ticket = support_service.get_support_ticket_by_reference(db, ticket_reference=ticket_reference)
@@ -127,7 +134,7 @@ def update_support_ticket(
 @router.get("/tickets/{ticket_id}/interactions", response_model=List[SupportInteraction])
 def read_support_interactions(
     ticket_id: int, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     # Get the ticket to check permissions
@@ -140,7 +147,7 @@ def read_support_interactions(
             detail="Not enough permissions to access interactions for this ticket"
         )
     
-    return support_service.get_support_interactions(db, ticket_id=ticket_id)
+    return fast_json(List[SupportInteraction], support_service.get_support_interactions(db, ticket_id=ticket_id))
 
 @router.post("/interactions/", response_model=SupportInteraction)
 def create_support_interaction(
@@ -1,12 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+import contextlib
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from ..utils.database import get_db
+from ..utils.read_replicas import get_read_db, get_async_read_db
+from ..utils.pagination import set_next_cursor
 from ..services.ticket_service import TicketService
-from ..schemas.ticket import Booking, BookingCreate, BookingUpdate, Payment, PaymentCreate, PaymentUpdate
-from ..schemas.showtime import Seat
+from ..services.booking_queue import BookingQueue
+from ..schemas.ticket import Booking, BookingCreate, BookingUpdate, BestAvailableBookingCreate, Payment, PaymentCreate, PaymentUpdate, SeatHold, SeatHoldCreate
+from ..schemas.showtime import Seat, ShowtimeOccupancy
 from ..schemas.user import User
-from ..middleware.auth_middleware import get_current_active_user, get_current_admin_user
+from ..middleware.auth_middleware import get_current_active_user, get_current_admin_user, get_current_active_user_async
+from ..utils.idempotency import run_idempotent
+from ..utils.seat_map_encoding import (
+    negotiate_seat_map_format, encode_bitset, encode_rle, encode_layout, seat_map_etag,
+    SEAT_MAP_JSON, SEAT_MAP_BITSET, SEAT_MAP_RLE, SEAT_MAP_BITSET_MEDIA_TYPE, SEAT_MAP_RLE_MEDIA_TYPE
+)
+from ..utils.conditional_requests import NotModified, etag_matches, REVALIDATE_CACHE_CONTROL
+from ..utils.fast_json import fast_json
 
 router = APIRouter(
     prefix="/tickets",
@@ -15,13 +29,16 @@ router = APIRouter(
 )
 
 ticket_service = TicketService()
+booking_queue = BookingQueue(ticket_service)
 
 @router.get("/bookings/", response_model=List[Booking])
 def read_bookings(
+    response: Response,
     skip: int = 0, 
     limit: int = 100,
     status: Optional[str] = None,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     # Regular users can only see their own bookings
@@ -31,7 +48,8 @@ def read_bookings(
             skip=skip, 
             limit=limit,
             user_id=current_user.id,
-            status=status
+            status=status,
+            cursor=cursor
         )
     else:
         # Admins can see all bookings
@@ -39,14 +57,16 @@ def read_bookings(
             db, 
             skip=skip, 
             limit=limit,
-            status=status
+            status=status,
+            cursor=cursor
         )
-    return bookings
+    # Pass the X-Next-Cursor value as ?cursor= to get the next page
+    return fast_json(List[Booking], set_next_cursor(response, bookings), response)
 
 @router.get("/bookings/{booking_id}", response_model=Booking)
 def read_booking(
     booking_id: int, 
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     booking = ticket_service.get_booking(db, booking_id=booking_id)
@@ -58,15 +78,15 @@ def read_booking(
             detail="Not enough permissions to access this booking"
         )
     
-    return booking
+    return fast_json(Booking, booking)
 
 @router.get("/bookings/reference/{booking_reference}", response_model=Booking)
-def read_booking_by_reference(
+async def read_booking_by_reference(
     booking_reference: str, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async)
 ):
-    booking = ticket_service.get_booking_by_reference(db, booking_reference=booking_reference)
+    booking = await ticket_service.get_booking_by_reference_async(db, booking_reference=booking_reference)
     
     # Check if user has permission to view this booking
     if not current_user.is_admin and booking.user_id != current_user.id:
@@ -75,21 +95,61 @@ def read_booking_by_reference(
             detail="Not enough permissions to access this booking"
         )
     
-    return booking
+    return fast_json(Booking, booking)
 
 @router.post("/bookings/", response_model=Booking)
 def create_booking(
     booking: BookingCreate, 
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    # Regular users can only create bookings for themselves
-    if not current_user.is_admin and booking.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to create booking for another user"
+    def book():
+        # Regular users can only create bookings for themselves
+        if not current_user.is_admin and booking.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions to create booking for another user"
+            )
+        
+        return submit_booking(db, booking)
+    
+    # Retries with the same Idempotency-Key get the first response back
+    return run_idempotent(idempotency_key, f"{current_user.id}:bookings", booking, Booking, book)
+
+@router.post("/bookings/best-available", response_model=Booking)
+def create_best_available_booking(
+    request: BestAvailableBookingCreate, 
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    def book():
+        # Regular users can only create bookings for themselves
+        if not current_user.is_admin and request.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions to create booking for another user"
+            )
+        
+        # The server picks the most central block of adjacent seats and books it
+        return ticket_service.create_best_available_booking(
+            db, 
+            request, 
+            submit=lambda booking: submit_booking(db, booking)
         )
     
+    return run_idempotent(idempotency_key, f"{current_user.id}:best-available", request, Booking, book)
+
+def submit_booking(db: Session, booking: BookingCreate):
+    # Serialize bookings per showtime so concurrent requests are committed in batches
+    if booking_queue.enabled:
+        # The queue workers draw from the same connection pool, so the request's
+        # connection goes back to it before waiting on them
+        db.close()
+        booking_id = booking_queue.submit(booking)
+        return ticket_service.get_booking(db, booking_id=booking_id)
+    
     return ticket_service.create_booking(db=db, booking=booking)
 
 @router.put("/bookings/{booking_id}", response_model=Booking)
@@ -111,30 +171,183 @@ def update_booking(
     
     return ticket_service.update_booking(db=db, booking_id=booking_id, booking_update=booking_update)
 
+@router.get("/showtimes/occupancy", response_model=List[ShowtimeOccupancy])
+def read_showtime_occupancy(
+    showtime_ids: List[int] = Query(...),
+    db: Session = Depends(get_read_db)
+):
+    # Booked and available counts for many showtimes in one round trip. The service builds
+    # the schema's models itself, so they are only encoded.
+    occupancy = ticket_service.get_showtime_occupancy(db, showtime_ids=showtime_ids)
+    return fast_json(List[ShowtimeOccupancy], occupancy, validated=True)
+
 @router.get("/showtimes/{showtime_id}/seats", response_model=List[Seat])
-def read_available_seats(
+async def read_available_seats(
     showtime_id: int, 
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    format: Optional[str] = Query(None, description="json, bitset or rle"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    return ticket_service.get_available_seats(db, showtime_id=showtime_id)
+    seat_map_format = negotiate_seat_map_format(format, request.headers.get("accept"))
+    if seat_map_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported seat map format"
+        )
+    
+    if seat_map_format in (SEAT_MAP_BITSET, SEAT_MAP_RLE):
+        layout, available_bits = await ticket_service.get_seat_map_state_async(db, showtime_id=showtime_id)
+    else:
+        state = await ticket_service.find_seat_map_state_async(db, showtime_id=showtime_id)
+        if state is None:
+            return []
+        layout, available_bits = state
+    
+    # Polling clients revalidate; an unchanged seat map costs no encoding
+    etag = seat_map_etag(seat_map_format, layout, available_bits)
+    if etag_matches(if_none_match, etag):
+        return NotModified(etag, {"Vary": "Accept"}).to_response()
+    
+    if seat_map_format == SEAT_MAP_JSON:
+        response.headers.update({"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL, "Vary": "Accept"})
+        return fast_json(List[Seat], layout.snapshots_of(available_bits), response)
+    
+    # Compact state that refers to the theater layout by ID and version
+    headers = {
+        "X-Theater-Id": str(layout.theater_id),
+        "X-Layout-Version": layout.version,
+        "X-Seat-Count": str(len(layout)),
+        "Vary": "Accept",
+        "ETag": etag,
+        "Cache-Control": REVALIDATE_CACHE_CONTROL,
+    }
+    if seat_map_format == SEAT_MAP_BITSET:
+        return Response(
+            content=encode_bitset(available_bits, len(layout)),
+            media_type=SEAT_MAP_BITSET_MEDIA_TYPE,
+            headers=headers
+        )
+    return Response(
+        content=encode_rle(available_bits, len(layout)),
+        media_type=SEAT_MAP_RLE_MEDIA_TYPE,
+        headers=headers
+    )
 
-@router.post("/payments/", response_model=Payment)
-def create_payment(
-    payment: PaymentCreate, 
+@router.get("/theaters/{theater_id}/layout")
+def read_theater_layout(theater_id: int, db: Session = Depends(get_read_db)):
+    layout = ticket_service.get_theater_layout(db, theater_id=theater_id)
+    return Response(
+        content=encode_layout(layout),
+        media_type="application/json",
+        headers={"X-Layout-Version": layout.version, "Cache-Control": "public, max-age=300"}
+    )
+
+@router.get("/showtimes/{showtime_id}/seats/stream")
+async def stream_available_seats(showtime_id: int, request: Request):
+    # Server-sent events: one snapshot, then only the seats that change state
+    async def event_stream():
+        events = ticket_service.seat_map_events(showtime_id)
+        try:
+            async for message in events:
+                if await request.is_disconnected():
+                    break
+                if message is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"data: {message}\n\n"
+        finally:
+            await events.aclose()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/showtimes/{showtime_id}/seats/ws")
+async def websocket_available_seats(websocket: WebSocket, showtime_id: int):
+    await websocket.accept()
+    
+    async def forward_events():
+        async for message in ticket_service.seat_map_events(showtime_id):
+            await websocket.send_text(message if message is not None else '{"type": "keepalive"}')
+    
+    forward_task = asyncio.create_task(forward_events())
+    try:
+        # Clients only listen, so receiving just tells us when they go away
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    finally:
+        forward_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, WebSocketDisconnect, RuntimeError):
+            await forward_task
+
+@router.post("/holds/", response_model=SeatHold)
+def create_seat_hold(
+    hold: SeatHoldCreate, 
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    # Get the booking to check permissions
-    booking = ticket_service.get_booking(db, booking_id=payment.booking_id)
+    return ticket_service.create_seat_hold(db=db, hold=hold, user_id=current_user.id)
+
+@router.get("/holds/{hold_id}", response_model=SeatHold)
+def read_seat_hold(
+    hold_id: str, 
+    current_user: User = Depends(get_current_active_user)
+):
+    seat_hold = ticket_service.get_seat_hold(hold_id)
     
-    # Check if user has permission to create payment for this booking
-    if not current_user.is_admin and booking.user_id != current_user.id:
+    # Check if user has permission to view this hold
+    if not current_user.is_admin and seat_hold.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access this seat hold"
+        )
+    
+    return seat_hold
+
+@router.delete("/holds/{hold_id}", response_model=SeatHold)
+def release_seat_hold(
+    hold_id: str, 
+    current_user: User = Depends(get_current_active_user)
+):
+    seat_hold = ticket_service.get_seat_hold(hold_id)
+    
+    # Check if user has permission to release this hold
+    if not current_user.is_admin and seat_hold.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to create payment for this booking"
+            detail="Not enough permissions to release this seat hold"
         )
     
-    return ticket_service.create_payment(db=db, payment=payment)
+    return ticket_service.release_seat_hold(hold_id)
+
+@router.post("/payments/", response_model=Payment)
+def create_payment(
+    payment: PaymentCreate, 
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    def pay():
+        # Get the booking to check permissions
+        booking = ticket_service.get_booking(db, booking_id=payment.booking_id)
+        
+        # Check if user has permission to create payment for this booking
+        if not current_user.is_admin and booking.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions to create payment for this booking"
+            )
+        
+        return ticket_service.create_payment(db=db, payment=payment)
+    
+    # Retries with the same Idempotency-Key get the first response back
+    return run_idempotent(idempotency_key, f"{current_user.id}:payments", payment, Payment, pay)
 
 @router.put("/payments/{payment_id}", response_model=Payment)
 def update_payment(
@@ -1,15 +1,27 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from .controllers import auth_controller, movie_controller, ticket_controller, support_controller, admin_controller
-from .utils.database import engine, Base
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from .controllers import auth_controller, movie_controller, showtime_controller, ticket_controller, support_controller, admin_controller
+from .utils.database import get_pool_stats, DB_POOL_RETRY_AFTER_SECONDS
+from .utils.async_database import dispose_async_engine
+from .utils.read_replicas import replica_router, set_read_your_writes_cookie, READ_REPLICA_HEALTH_CHECK_SECONDS
+from .utils.pagination import NEXT_CURSOR_HEADER
 from .utils.logger import logger
-from .utils.init_db import init_db
+from .utils.password_hasher import password_hasher, PasswordHasherBusy, PASSWORD_HASH_RETRY_AFTER_SECONDS
+from .utils.response_cache import catalog_cache
+from .utils.sql_metrics import install_sql_metrics, route_sql_metrics
+from .middleware.sql_metrics_middleware import SqlMetricsMiddleware
+from .utils.seat_holds import seat_hold_store, ExpirySweeper, SEAT_HOLD_SWEEP_INTERVAL_SECONDS, SEAT_HOLD_PURGE_INTERVAL_SECONDS
+from .utils.idempotency import idempotency_store, IDEMPOTENCY_SWEEP_INTERVAL_SECONDS
+from .utils.principal_cache import user_change_poller, PRINCIPAL_CHANGE_POLL_SECONDS
+from .services.ticket_service import PENDING_BOOKING_SWEEP_INTERVAL_SECONDS, OCCUPANCY_RECONCILE_INTERVAL_SECONDS
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic and seeded by a separate step, not at import:
+#     alembic upgrade head && python -m app.utils.init_db
 
-# Initialize default data
-init_db()
+# Per-request query counts and the slow query log
+install_sql_metrics()
 
 app = FastAPI(
     title="Cinema Ticket Booking API",
@@ -32,11 +44,108 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Server-Timing", "ETag"],
 )
+app.add_middleware(SqlMetricsMiddleware)
+
+@app.exception_handler(PoolTimeoutError)
+def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    # No connection freed up within DB_POOL_TIMEOUT
+    logger.warning(f"Database pool timeout on {request.method} {request.url.path}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database is busy, please retry shortly"},
+        headers={"Retry-After": str(DB_POOL_RETRY_AFTER_SECONDS)}
+    )
+
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    # Every bcrypt worker is busy and the queue is full; refuse now rather than queue a login storm
+    logger.warning(f"Password hasher saturated on {request.method} {request.url.path}")
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many sign-in attempts right now, please retry shortly"},
+        headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)}
+    )
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    # Clients that just booked or paid read their own writes from the primary
+    response = await call_next(request)
+    set_read_your_writes_cookie(request, response)
+    return response
+
+# Background sweepers that return abandoned seats to sale
+seat_hold_sweeper = ExpirySweeper(
+    "seat-hold-sweeper",
+    SEAT_HOLD_SWEEP_INTERVAL_SECONDS,
+    ticket_controller.ticket_service.expire_seat_holds
+)
+seat_hold_purger = ExpirySweeper(
+    "seat-hold-purger",
+    SEAT_HOLD_PURGE_INTERVAL_SECONDS,
+    seat_hold_store.purge_expired
+)
+pending_booking_sweeper = ExpirySweeper(
+    "pending-booking-sweeper",
+    PENDING_BOOKING_SWEEP_INTERVAL_SECONDS,
+    ticket_controller.ticket_service.expire_pending_bookings
+)
+occupancy_reconciler = ExpirySweeper(
+    "occupancy-reconciler",
+    OCCUPANCY_RECONCILE_INTERVAL_SECONDS,
+    ticket_controller.ticket_service.reconcile_occupancy
+)
+idempotency_sweeper = ExpirySweeper(
+    "idempotency-sweeper",
+    IDEMPOTENCY_SWEEP_INTERVAL_SECONDS,
+    idempotency_store.evict_expired
+)
+# Drops cached users that an admin changed through another worker
+user_change_sweeper = ExpirySweeper(
+    "user-change-poller",
+    PRINCIPAL_CHANGE_POLL_SECONDS,
+    user_change_poller.poll
+)
+replica_health_checker = ExpirySweeper(
+    "replica-health-checker",
+    READ_REPLICA_HEALTH_CHECK_SECONDS,
+    replica_router.check_health
+)
+
+@app.on_event("startup")
+def start_sweepers():
+    seat_hold_store.restore()
+    user_change_poller.poll()
+    seat_hold_sweeper.start()
+    seat_hold_purger.start()
+    pending_booking_sweeper.start()
+    occupancy_reconciler.start()
+    idempotency_sweeper.start()
+    replica_health_checker.start()
+    user_change_sweeper.start()
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    seat_hold_sweeper.stop()
+    seat_hold_purger.stop()
+    pending_booking_sweeper.stop()
+    occupancy_reconciler.stop()
+    idempotency_sweeper.stop()
+    replica_health_checker.stop()
+    user_change_sweeper.stop()
+    ticket_controller.booking_queue.shutdown()
+    password_hasher.shutdown()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
+    await replica_router.dispose_async()
 
 # Include routers
 app.include_router(auth_controller.router)
 app.include_router(movie_controller.router)
+app.include_router(showtime_controller.router)
 app.include_router(ticket_controller.router)
 app.include_router(support_controller.router)
 app.include_router(admin_controller.router)
@@ -48,3 +157,28 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/db-pool")
+def db_pool_health():
+    # Connection pool saturation for monitoring
+    return get_pool_stats()
+
+@app.get("/health/db-replicas")
+def db_replicas_health():
+    # Replicas in and out of read rotation
+    return replica_router.stats()
+
+@app.get("/health/sql")
+def sql_health():
+    # Queries and database time per route, to spot N+1 patterns and slow endpoints
+    return route_sql_metrics.snapshot()
+
+@app.get("/health/catalog-cache")
+def catalog_cache_health():
+    # Hit rate of the cached movie and genre responses in this worker
+    return catalog_cache.stats()
+
+@app.get("/health/password-hashing")
+def password_hashing_health():
+    # bcrypt queue depth and latency
+    return password_hasher.stats()
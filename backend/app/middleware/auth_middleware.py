@@ -2,20 +2,25 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..utils.database import get_db
+from ..utils.async_database import get_async_db
 from ..utils.security import SECRET_KEY, ALGORITHM
 from ..schemas.user import TokenData
+from ..models.user import User
 from ..repositories.auth_repository import AuthRepository
+from ..utils.principal_cache import principal_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def decode_token(token: str) -> TokenData:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -23,19 +28,28 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         is_admin: bool = payload.get("is_admin", False)
         
         if username is None or user_id is None:
-            raise credentials_exception
+            raise credentials_exception()
             
-        token_data = TokenData(username=username, user_id=user_id, is_admin=is_admin)
+        return TokenData(username=username, user_id=user_id, is_admin=is_admin)
     except JWTError:
-        raise credentials_exception
-        
+        raise credentials_exception()
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    token_data = decode_token(token)
+    
+    # Active users are served from the principal cache; the session only connects on a miss
+    principal = principal_cache.get(token_data.user_id)
+    if principal is not None:
+        return principal
+    
+    generation = principal_cache.generation(token_data.user_id)
     auth_repository = AuthRepository()
     user = auth_repository.get_user_by_id(db, user_id=token_data.user_id)
     
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
         
-    return user
+    return principal_cache.install(user, generation)
 
 def get_current_active_user(current_user = Depends(get_current_user)):
     if not current_user.is_active:
@@ -49,3 +63,23 @@ def get_current_admin_user(current_user = Depends(get_current_user)):
             detail="Not enough permissions"
         )
     return current_user
+
+# Async variants for endpoints on the async database path
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    token_data = decode_token(token)
+    
+    principal = principal_cache.get(token_data.user_id)
+    if principal is not None:
+        return principal
+    
+    generation = principal_cache.generation(token_data.user_id)
+    user = await db.get(User, token_data.user_id)
+    if user is None:
+        raise credentials_exception()
+    
+    return principal_cache.install(user, generation)
+
+async def get_current_active_user_async(current_user = Depends(get_current_user_async)):
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
@@ -0,0 +1,30 @@
+from ..utils.sql_metrics import RequestSqlStats, current_sql_stats, route_sql_metrics, DEBUG
+
+class SqlMetricsMiddleware:
+    # Plain ASGI middleware: collects the SQL stats of each HTTP request, adds them as a
+    # Server-Timing header in debug mode and folds them into the per-route aggregates
+    def __init__(self, app, server_timing: bool = DEBUG):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSqlStats()
+        token = current_sql_stats.set(stats)
+
+        async def send_with_server_timing(message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"server-timing", stats.server_timing().encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            current_sql_stats.reset(token)
+            # The matched route template, so /movies/1 and /movies/2 are one entry
+            route = scope.get("route")
+            route_sql_metrics.record(scope["method"], getattr(route, "path", "unmatched"), stats)
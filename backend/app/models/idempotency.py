@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from ..utils.database import Base
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String, unique=True, index=True)
+    fingerprint = Column(String)
+    status_code = Column(Integer, nullable=True)  # null while the first request is in progress
+    response_body = Column(Text, nullable=True)
+    expires_at = Column(DateTime, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
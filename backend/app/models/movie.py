@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, ForeignKey
-from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy.sql import func, text
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from ..utils.database import Base
 
 class Genre(Base):
@@ -14,6 +15,23 @@ class Genre(Base):
 
 class Movie(Base):
     __tablename__ = "movies"
+    __table_args__ = (
+        # The catalog lists active movies only, paged by id
+        Index(
+            "ix_movies_id_active",
+            "id",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active")
+        ),
+        # Full-text and type-ahead search; other databases use the in-process index
+        Index("ix_movies_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        Index(
+            "ix_movies_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -26,18 +44,28 @@ class Movie(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Bumped by the repository on every change; the ETags of catalog responses derive from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    # Weighted title (A), genre names (B) and description (C); kept up to date by the repository
+    search_vector = deferred(Column(Text().with_variant(TSVECTOR(), "postgresql")))
     
     # Relationships
-    genres = relationship("MovieGenre", back_populates="movie")
+    genre_links = relationship("MovieGenre", back_populates="movie")
+    genres = relationship("Genre", secondary="movie_genres", viewonly=True)
     showtimes = relationship("Showtime", back_populates="movie")
 
 class MovieGenre(Base):
     __tablename__ = "movie_genres"
+    __table_args__ = (
+        # Genre filter joins on genre_id, genre loading looks up by movie_id
+        Index("ix_movie_genres_genre_id_movie_id", "genre_id", "movie_id"),
+        Index("ix_movie_genres_movie_id", "movie_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     movie_id = Column(Integer, ForeignKey("movies.id"))
     genre_id = Column(Integer, ForeignKey("genres.id"))
     
     # Relationships
-    movie = relationship("Movie", back_populates="genres")
+    movie = relationship("Movie", back_populates="genre_links")
     genre = relationship("Genre", back_populates="movies")
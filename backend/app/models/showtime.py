@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Boolean, UniqueConstraint, Index
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from ..utils.database import Base
 
@@ -16,6 +16,10 @@ class Theater(Base):
 
 class Seat(Base):
     __tablename__ = "seats"
+    __table_args__ = (
+        # Theater layouts are loaded as theater_id = ? ORDER BY id
+        Index("ix_seats_theater_id_id", "theater_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     theater_id = Column(Integer, ForeignKey("theaters.id"))
@@ -29,6 +33,18 @@ class Seat(Base):
 
 class Showtime(Base):
     __tablename__ = "showtimes"
+    __table_args__ = (
+        # Showtimes of a movie or a theater in time order
+        Index("ix_showtimes_movie_id_start_time", "movie_id", "start_time"),
+        Index("ix_showtimes_theater_id_start_time", "theater_id", "start_time"),
+        # Upcoming showtimes still on sale
+        Index(
+            "ix_showtimes_start_time_active",
+            "start_time",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     movie_id = Column(Integer, ForeignKey("movies.id"))
@@ -43,3 +59,15 @@ class Showtime(Base):
     movie = relationship("Movie", back_populates="showtimes")
     theater = relationship("Theater", back_populates="showtimes")
     bookings = relationship("Booking", back_populates="showtime")
+
+class ShowtimeOccupancy(Base):
+    __tablename__ = "showtime_occupancy"
+    __table_args__ = (
+        UniqueConstraint("showtime_id", "seat_type", name="uq_showtime_occupancy_showtime_seat_type"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    showtime_id = Column(Integer, ForeignKey("showtimes.id"))
+    seat_type = Column(String)
+    total_seats = Column(Integer, default=0)
+    booked_seats = Column(Integer, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -18,6 +18,10 @@ class TicketPriority(str, enum.Enum):
 
 class SupportTicket(Base):
     __tablename__ = "support_tickets"
+    __table_args__ = (
+        # Keyset pagination of a user's tickets, newest first
+        Index("ix_support_tickets_user_id_id", "user_id", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -39,6 +43,10 @@ class SupportTicket(Base):
 
 class SupportInteraction(Base):
     __tablename__ = "support_interactions"
+    __table_args__ = (
+        # A ticket's interactions are read in creation order
+        Index("ix_support_interactions_ticket_id_created_at", "support_ticket_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     support_ticket_id = Column(Integer, ForeignKey("support_tickets.id"))
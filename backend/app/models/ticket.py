@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Enum, Boolean, Text
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Enum, Boolean, Text, Index
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 import enum
 from ..utils.database import Base
@@ -24,6 +24,19 @@ class PaymentMethod(str, enum.Enum):
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Lets the expiry sweeper find stale pending bookings without a table scan
+        Index("ix_bookings_status_created_at", "status", "created_at"),
+        # Keyset pagination of a user's bookings, newest first
+        Index("ix_bookings_user_id_id", "user_id", "id"),
+        # Bookings that still hold seats, per showtime
+        Index(
+            "ix_bookings_showtime_id_active",
+            "showtime_id",
+            postgresql_where=text("status IN ('PENDING', 'CONFIRMED')"),
+            sqlite_where=text("status IN ('PENDING', 'CONFIRMED')")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -45,11 +58,24 @@ class Booking(Base):
 
 class SeatBooking(Base):
     __tablename__ = "seat_bookings"
+    __table_args__ = (
+        # A seat can only be held by one active booking per showtime
+        Index(
+            "uq_seat_bookings_active_showtime_seat",
+            "showtime_id",
+            "seat_id",
+            unique=True,
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    booking_id = Column(Integer, ForeignKey("bookings.id"))
-    seat_id = Column(Integer, ForeignKey("seats.id"))
+    booking_id = Column(Integer, ForeignKey("bookings.id"), index=True)
+    showtime_id = Column(Integer, ForeignKey("showtimes.id"))
+    seat_id = Column(Integer, ForeignKey("seats.id"), index=True)
     price = Column(Float)
+    is_active = Column(Boolean, default=True)
     
     # Relationships
     booking = relationship("Booking", back_populates="seat_bookings")
@@ -70,3 +96,14 @@ class Payment(Base):
     
     # Relationships
     booking = relationship("Booking", back_populates="payment")
+
+class SeatHold(Base):
+    __tablename__ = "seat_holds"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    hold_reference = Column(String, unique=True, index=True)
+    showtime_id = Column(Integer, ForeignKey("showtimes.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    seat_ids = Column(String)  # comma separated seat IDs
+    expires_at = Column(DateTime, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
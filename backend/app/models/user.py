@@ -14,4 +14,5 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Indexed for the principal cache, which polls it for users changed by other workers
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), index=True)
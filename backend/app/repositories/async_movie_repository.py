@@ -0,0 +1,98 @@
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from ..models.movie import Movie, Genre, MovieGenre
+from .loading_profiles import MOVIE_RESPONSE
+from .movie_repository import (
+    MOVIE_PAGE_KEY, GENRE_PAGE_KEY, MOVIE_SEARCH_ROWS, MOVIE_GENRE_SEARCH_ROWS, ranked_search_statement, in_rank_order
+)
+from ..utils.pagination import Page, keyset_paginate, to_page, offset_from_cursor, to_offset_page
+from ..utils.text_search import MOVIE_SEARCH_BACKEND, movie_search_index, query_terms
+
+class AsyncMovieRepository:
+    async def get_movies(
+        self, 
+        db: AsyncSession, 
+        skip: int = 0, 
+        limit: int = 100,
+        title_search: Optional[str] = None,
+        genre_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None
+    ):
+        if title_search:
+            return await self.search_movies(
+                db,
+                title_search,
+                skip=skip,
+                limit=limit,
+                genre_id=genre_id,
+                is_active=is_active,
+                cursor=cursor
+            )
+        
+        # Genres are loaded up front; async sessions cannot lazy load them later
+        query = select(Movie).options(*MOVIE_RESPONSE)
+        
+        if genre_id:
+            query = query.join(MovieGenre).where(MovieGenre.genre_id == genre_id)
+        
+        if is_active is not None:
+            query = query.where(Movie.is_active == is_active)
+        
+        query = keyset_paginate(query, MOVIE_PAGE_KEY, limit, cursor=cursor, skip=skip)
+        result = await db.execute(query)
+        return to_page(result.scalars().all(), MOVIE_PAGE_KEY, limit)
+    
+    async def search_movies(
+        self,
+        db: AsyncSession,
+        query_text: str,
+        skip: int = 0,
+        limit: int = 100,
+        genre_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None
+    ):
+        offset = offset_from_cursor(cursor, skip)
+        terms = query_terms(query_text)
+        if not terms:
+            return Page([], None)
+        
+        if MOVIE_SEARCH_BACKEND == "postgres":
+            statement = ranked_search_statement(terms, query_text, genre_id, is_active)\
+                .offset(offset)\
+                .limit(limit + 1)
+            result = await db.scalars(statement)
+            return to_offset_page(result.all(), offset, limit)
+        
+        if not movie_search_index.is_loaded():
+            movie_rows = await db.execute(MOVIE_SEARCH_ROWS)
+            genre_rows = await db.execute(MOVIE_GENRE_SEARCH_ROWS)
+            movie_search_index.load(movie_rows.all(), genre_rows.all())
+        
+        movie_ids = movie_search_index.search(
+            terms,
+            offset + limit + 1,
+            is_active=is_active,
+            genre_id=genre_id
+        )[offset:]
+        result = await db.scalars(select(Movie).options(*MOVIE_RESPONSE).where(Movie.id.in_(movie_ids)))
+        return to_offset_page(in_rank_order(result.all(), movie_ids), offset, limit)
+    
+    async def get_catalog_version(self, db: AsyncSession):
+        # An insert raises the count and an update the version sum, so any change moves the pair.
+        # Scans every movie, so callers keep the result in the catalog cache.
+        result = await db.execute(select(func.count(Movie.id), func.coalesce(func.sum(Movie.version), 0)))
+        return tuple(result.one())
+    
+    # Genre methods
+    async def get_genres_version(self, db: AsyncSession):
+        # Genres are only ever added
+        result = await db.execute(select(func.count(Genre.id), func.coalesce(func.max(Genre.id), 0)))
+        return tuple(result.one())
+    
+    async def get_genres(self, db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        query = keyset_paginate(select(Genre), GENRE_PAGE_KEY, limit, cursor=cursor, skip=skip)
+        result = await db.execute(query)
+        return to_page(result.scalars().all(), GENRE_PAGE_KEY, limit)
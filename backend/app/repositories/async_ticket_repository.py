@@ -0,0 +1,69 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.ticket import Booking, SeatBooking
+from ..models.showtime import Showtime, Seat
+from ..utils.seat_availability import seat_availability_index
+from ..utils.seat_holds import seat_hold_store
+from ..utils.theater_layout import theater_layout_cache
+from ..utils.read_replicas import is_replica_session
+from .loading_profiles import BOOKING_RESPONSE
+
+class AsyncTicketRepository:
+    async def get_booking_by_reference(self, db: AsyncSession, booking_reference: str):
+        query = select(Booking)\
+            .options(*BOOKING_RESPONSE)\
+            .where(Booking.booking_reference == booking_reference)
+        result = await db.execute(query)
+        return result.scalars().first()
+    
+    async def get_seat_availability(self, db: AsyncSession, showtime_id: int):
+        # Same index as the sync path; the database is only read on a miss
+        availability = seat_availability_index.get(showtime_id)
+        if availability is not None:
+            return availability
+        
+        generation = seat_availability_index.generation(showtime_id)
+        query = select(Showtime.theater_id)\
+            .where(Showtime.id == showtime_id)\
+            .where(Showtime.is_active.is_(True))
+        theater_id = await db.scalar(query)
+        if theater_id is None:
+            return None
+        
+        layout = await self.get_theater_layout(db, theater_id)
+        
+        query = select(SeatBooking.seat_id)\
+            .where(SeatBooking.showtime_id == showtime_id)\
+            .where(SeatBooking.is_active.is_(True))
+        booked_seat_ids = await db.scalars(query)
+        return seat_availability_index.install(
+            showtime_id,
+            layout,
+            booked_seat_ids.all(),
+            generation,
+            cache=not is_replica_session(db)
+        )
+    
+    async def get_theater_layout(self, db: AsyncSession, theater_id: int):
+        layout = theater_layout_cache.get(theater_id)
+        if layout is not None:
+            return layout
+        
+        query = select(Seat.id, Seat.row, Seat.number, Seat.seat_type)\
+            .where(Seat.theater_id == theater_id)\
+            .order_by(Seat.id)
+        seat_rows = await db.execute(query)
+        return theater_layout_cache.install(theater_id, seat_rows.all())
+    
+    async def get_available_seats(self, db: AsyncSession, showtime_id: int):
+        availability = await self.get_seat_availability(db, showtime_id)
+        if availability is None:
+            return []
+        
+        available_seats = availability.available_seats()
+        
+        # Seats held during someone's checkout are not on sale either
+        held_seat_ids = seat_hold_store.held_seat_ids(showtime_id)
+        if held_seat_ids:
+            available_seats = [seat for seat in available_seats if seat.id not in held_seat_ids]
+        return available_seats
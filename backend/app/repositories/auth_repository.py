@@ -1,7 +1,13 @@
 from sqlalchemy.orm import Session
+from typing import Optional
 from ..models.user import User
 from ..schemas.user import UserCreate
-from ..utils.security import get_password_hash, verify_password
+from ..utils.security import get_password_hash
+from ..utils.password_hasher import password_hasher
+from ..utils.pagination import keyset_paginate, to_page
+
+# Columns the user list is ordered and paged on
+USER_PAGE_KEY = (User.id,)
 
 class AuthRepository:
     def get_user_by_username(self, db: Session, username: str):
@@ -13,6 +19,10 @@ class AuthRepository:
     def get_user_by_id(self, db: Session, user_id: int):
         return db.query(User).filter(User.id == user_id).first()
     
+    def get_users(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        query = keyset_paginate(db.query(User), USER_PAGE_KEY, limit, cursor=cursor, skip=skip)
+        return to_page(query.all(), USER_PAGE_KEY, limit)
+    
     def create_user(self, db: Session, user: UserCreate):
         hashed_password = get_password_hash(user.password)
         db_user = User(
@@ -31,6 +41,14 @@ class AuthRepository:
         user = self.get_user_by_username(db, username)
         if not user:
             return False
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
             return False
+        if new_hash:
+            self.update_password_hash(db, user, new_hash)
         return user
+    
+    def update_password_hash(self, db: Session, user: User, hashed_password: str):
+        # Stored hashes move to the configured bcrypt cost as their users log in
+        user.hashed_password = hashed_password
+        db.commit()
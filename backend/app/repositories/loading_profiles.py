@@ -0,0 +1,22 @@
+from sqlalchemy.orm import joinedload, selectinload
+# Every mapped class must be registered before loader options are built
+from ..models.user import User
+from ..models.showtime import Showtime
+from ..models.movie import Movie
+from ..models.ticket import Booking
+from ..models.support import SupportTicket
+
+# Loader options matching what each response schema serializes, so a page of
+# results costs a fixed number of queries instead of one per row and relationship.
+
+# schemas.movie.Movie: genres
+MOVIE_RESPONSE = (selectinload(Movie.genres),)
+
+# schemas.showtime.Showtime: the movie with its genres, and the theater
+SHOWTIME_RESPONSE = (joinedload(Showtime.movie).selectinload(Movie.genres), joinedload(Showtime.theater))
+
+# schemas.ticket.Booking: seat_bookings and the optional one-to-one payment
+BOOKING_RESPONSE = (selectinload(Booking.seat_bookings), joinedload(Booking.payment))
+
+# schemas.support.SupportTicket: interactions
+SUPPORT_TICKET_RESPONSE = (selectinload(SupportTicket.interactions),)
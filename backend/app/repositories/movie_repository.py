@@ -1,8 +1,64 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select, update, or_, literal_column
 from typing import List, Optional
 from ..models.movie import Movie, Genre, MovieGenre
 from ..schemas.movie import MovieCreate, MovieUpdate
+from .loading_profiles import MOVIE_RESPONSE
+from ..utils.pagination import Page, keyset_paginate, to_page, offset_from_cursor, to_offset_page
+from ..utils.text_search import MOVIE_SEARCH_BACKEND, movie_search_index, query_terms, prefix_tsquery
+
+# Columns the movie and genre lists are ordered and paged on
+MOVIE_PAGE_KEY = (Movie.id,)
+GENRE_PAGE_KEY = (Genre.id,)
+
+# Text search configuration without stemming, so prefixes match what was typed
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+# Rows the in-process search index is built from
+MOVIE_SEARCH_ROWS = select(Movie.id, Movie.title, Movie.description, Movie.is_active)
+MOVIE_GENRE_SEARCH_ROWS = select(MovieGenre.movie_id, Genre.id, Genre.name)\
+    .join(Genre, Genre.id == MovieGenre.genre_id)
+
+def search_vector_values():
+    # Postgres search document: title weighted A, genre names B, description C.
+    # updated_at is kept as is, the movie itself has not changed.
+    genre_names = select(func.string_agg(Genre.name, " "))\
+        .join(MovieGenre, MovieGenre.genre_id == Genre.id)\
+        .where(MovieGenre.movie_id == Movie.id)\
+        .scalar_subquery()
+    title = func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(Movie.title, "")), "A")
+    genres = func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(genre_names, "")), "B")
+    description = func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(Movie.description, "")), "C")
+    return {"search_vector": title.op("||")(genres).op("||")(description), "updated_at": Movie.updated_at}
+
+def ranked_search_statement(terms: List[str], query_text: str, genre_id: Optional[int], is_active: Optional[bool]):
+    # Every term against the search vector (the last one as a prefix), or a fuzzy trigram
+    # match on the title to forgive typos; both are served by GIN indexes
+    tsquery = func.to_tsquery(SEARCH_CONFIG, prefix_tsquery(terms))
+    rank = func.ts_rank(Movie.search_vector, tsquery) + func.similarity(Movie.title, query_text)
+    statement = select(Movie)\
+        .options(*MOVIE_RESPONSE)\
+        .where(or_(Movie.search_vector.op("@@")(tsquery), Movie.title.op("%")(query_text)))
+    
+    if genre_id:
+        statement = statement.join(MovieGenre).where(MovieGenre.genre_id == genre_id)
+    
+    if is_active is not None:
+        statement = statement.where(Movie.is_active == is_active)
+    
+    return statement.order_by(rank.desc(), Movie.id)
+
+def in_rank_order(movies, movie_ids: List[int]):
+    movies_by_id = {movie.id: movie for movie in movies}
+    return [movies_by_id[movie_id] for movie_id in movie_ids if movie_id in movies_by_id]
+
+def refresh_search_documents(db: Session):
+    # After movies are written outside the repository, e.g. by the seeding scripts
+    if MOVIE_SEARCH_BACKEND == "postgres":
+        db.execute(update(Movie).values(search_vector_values()))
+        db.commit()
+    else:
+        movie_search_index.clear()
 
 class MovieRepository:
     def get_movies(
@@ -12,12 +68,21 @@ class MovieRepository:
         limit: int = 100,
         title_search: Optional[str] = None,
         genre_id: Optional[int] = None,
-        is_active: Optional[bool] = None
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None
     ):
-        query = db.query(Movie)
-        
         if title_search:
-            query = query.filter(Movie.title.ilike(f"%{title_search}%"))
+            return self.search_movies(
+                db,
+                title_search,
+                skip=skip,
+                limit=limit,
+                genre_id=genre_id,
+                is_active=is_active,
+                cursor=cursor
+            )
+        
+        query = db.query(Movie).options(*MOVIE_RESPONSE)
         
         if genre_id:
             query = query.join(MovieGenre).filter(MovieGenre.genre_id == genre_id)
@@ -25,10 +90,64 @@ class MovieRepository:
         if is_active is not None:
             query = query.filter(Movie.is_active == is_active)
         
-        return query.offset(skip).limit(limit).all()
+        query = keyset_paginate(query, MOVIE_PAGE_KEY, limit, cursor=cursor, skip=skip)
+        return to_page(query.all(), MOVIE_PAGE_KEY, limit)
+    
+    def search_movies(
+        self,
+        db: Session,
+        query_text: str,
+        skip: int = 0,
+        limit: int = 100,
+        genre_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None
+    ):
+        # Ranked search over title, description and genre names, best match first
+        offset = offset_from_cursor(cursor, skip)
+        terms = query_terms(query_text)
+        if not terms:
+            return Page([], None)
+        
+        if MOVIE_SEARCH_BACKEND == "postgres":
+            statement = ranked_search_statement(terms, query_text, genre_id, is_active)\
+                .offset(offset)\
+                .limit(limit + 1)
+            return to_offset_page(db.scalars(statement).all(), offset, limit)
+        
+        if not movie_search_index.is_loaded():
+            movie_search_index.load(db.execute(MOVIE_SEARCH_ROWS).all(), db.execute(MOVIE_GENRE_SEARCH_ROWS).all())
+        
+        movie_ids = movie_search_index.search(
+            terms,
+            offset + limit + 1,
+            is_active=is_active,
+            genre_id=genre_id
+        )[offset:]
+        movies = db.scalars(select(Movie).options(*MOVIE_RESPONSE).where(Movie.id.in_(movie_ids))).all()
+        return to_offset_page(in_rank_order(movies, movie_ids), offset, limit)
+    
+    def index_movie(self, db: Session, db_movie: Movie):
+        # Called before the commit that saves the movie, so the search document goes with it
+        db.flush()
+        if MOVIE_SEARCH_BACKEND == "postgres":
+            db.execute(update(Movie).where(Movie.id == db_movie.id).values(search_vector_values()))
+            return
+        
+        genre_rows = db.execute(MOVIE_GENRE_SEARCH_ROWS.where(MovieGenre.movie_id == db_movie.id)).all()
+        movie_search_index.upsert(
+            db_movie.id,
+            db_movie.title,
+            db_movie.description,
+            [(genre_id, name) for _, genre_id, name in genre_rows],
+            db_movie.is_active
+        )
     
     def get_movie(self, db: Session, movie_id: int):
-        return db.query(Movie).filter(Movie.id == movie_id).first()
+        return db.query(Movie).options(*MOVIE_RESPONSE).filter(Movie.id == movie_id).first()
+    
+    def get_movie_version(self, db: Session, movie_id: int) -> Optional[int]:
+        return db.query(Movie.version).filter(Movie.id == movie_id).scalar()
     
     def create_movie(self, db: Session, movie: MovieCreate):
         db_movie = Movie(
@@ -50,6 +169,7 @@ class MovieRepository:
             db_movie_genre = MovieGenre(movie_id=db_movie.id, genre_id=genre_id)
             db.add(db_movie_genre)
         
+        self.index_movie(db, db_movie)
         db.commit()
         db.refresh(db_movie)
         return db_movie
@@ -75,6 +195,9 @@ class MovieRepository:
         for key, value in update_data.items():
             setattr(db_movie, key, value)
         
+        # Also forces an UPDATE when only the genres changed
+        db_movie.version = Movie.version + 1
+        self.index_movie(db, db_movie)
         db.commit()
         db.refresh(db_movie)
         return db_movie
@@ -86,12 +209,15 @@ class MovieRepository:
         
         # Instead of deleting, set is_active to False
         db_movie.is_active = False
+        db_movie.version = Movie.version + 1
+        self.index_movie(db, db_movie)
         db.commit()
         return db_movie
     
     # Genre methods
-    def get_genres(self, db: Session, skip: int = 0, limit: int = 100):
-        return db.query(Genre).offset(skip).limit(limit).all()
+    def get_genres(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        query = keyset_paginate(db.query(Genre), GENRE_PAGE_KEY, limit, cursor=cursor, skip=skip)
+        return to_page(query.all(), GENRE_PAGE_KEY, limit)
     
     def get_genre(self, db: Session, genre_id: int):
         return db.query(Genre).filter(Genre.id == genre_id).first()
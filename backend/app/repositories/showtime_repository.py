@@ -0,0 +1,137 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import List, Optional
+from datetime import date, datetime, time, timedelta
+from ..models.showtime import Showtime, Theater, ShowtimeOccupancy
+from ..models.ticket import SeatBooking
+from ..schemas.showtime import ShowtimeCreate, ShowtimeUpdate
+from .loading_profiles import SHOWTIME_RESPONSE
+from ..utils.showtime_index import showtime_index, ScheduledShowtime, days_between
+from ..utils.seat_availability import seat_availability_index
+from ..utils.read_replicas import is_replica_session
+
+# Columns the schedule index keeps, in ScheduledShowtime argument order
+SCHEDULE_COLUMNS = (
+    Showtime.id,
+    Showtime.movie_id,
+    Showtime.theater_id,
+    Showtime.start_time,
+    Showtime.end_time,
+    Showtime.price,
+    Showtime.is_active,
+    Showtime.created_at,
+)
+
+def scheduled(db_showtime: Showtime) -> ScheduledShowtime:
+    return ScheduledShowtime(*(getattr(db_showtime, column.key) for column in SCHEDULE_COLUMNS))
+
+class ShowtimeRepository:
+    def get_schedule(
+        self,
+        db: Session,
+        start: datetime,
+        end: datetime,
+        movie_id: Optional[int] = None,
+        theater_id: Optional[int] = None
+    ) -> List[ScheduledShowtime]:
+        # Active showtimes starting in [start, end), by start time. Days are contiguous
+        # buckets, so concatenating them keeps the order.
+        showtimes = []
+        for day in days_between(start, end):
+            schedule = self.get_day_schedule(db, day)
+            showtimes.extend(schedule.showtimes(start=start, end=end, theater_id=theater_id, movie_id=movie_id))
+        return showtimes
+    
+    def get_day_schedule(self, db: Session, day: date):
+        # The showtimes table is only read for days not in the index yet
+        schedule = showtime_index.get(day)
+        if schedule is not None:
+            return schedule
+        
+        generation = showtime_index.generation(day)
+        day_start = datetime.combine(day, time.min)
+        rows = db.query(*SCHEDULE_COLUMNS)\
+            .filter(Showtime.is_active.is_(True))\
+            .filter(Showtime.start_time >= day_start)\
+            .filter(Showtime.start_time < day_start + timedelta(days=1))\
+            .all()
+        return showtime_index.install(
+            day,
+            [ScheduledShowtime(*row) for row in rows],
+            generation,
+            cache=not is_replica_session(db)
+        )
+    
+    def get_showtime(self, db: Session, showtime_id: int):
+        return db.query(Showtime).options(*SHOWTIME_RESPONSE).filter(Showtime.id == showtime_id).first()
+    
+    def get_theater(self, db: Session, theater_id: int):
+        return db.query(Theater).filter(Theater.id == theater_id).first()
+    
+    def has_overlap(
+        self,
+        db: Session,
+        theater_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_showtime_id: Optional[int] = None
+    ) -> bool:
+        # Another active showtime in the same theater that runs into [start_time, end_time)
+        query = select(Showtime.id)\
+            .where(Showtime.theater_id == theater_id)\
+            .where(Showtime.is_active.is_(True))\
+            .where(Showtime.start_time < end_time)\
+            .where(Showtime.end_time > start_time)
+        if exclude_showtime_id is not None:
+            query = query.where(Showtime.id != exclude_showtime_id)
+        return db.scalar(query.exists().select())
+    
+    def has_active_bookings(self, db: Session, showtime_id: int) -> bool:
+        query = select(SeatBooking.id)\
+            .where(SeatBooking.showtime_id == showtime_id)\
+            .where(SeatBooking.is_active.is_(True))
+        return db.scalar(query.exists().select())
+    
+    def create_showtime(self, db: Session, showtime: ShowtimeCreate):
+        db_showtime = Showtime(**showtime.dict())
+        db.add(db_showtime)
+        db.commit()
+        db.refresh(db_showtime)
+        showtime_index.upsert(scheduled(db_showtime))
+        return db_showtime
+    
+    def update_showtime(self, db: Session, showtime_id: int, showtime: ShowtimeUpdate):
+        db_showtime = db.query(Showtime).filter(Showtime.id == showtime_id).first()
+        if not db_showtime:
+            return None
+        
+        previous_start = db_showtime.start_time
+        previous_theater_id = db_showtime.theater_id
+        previous_is_active = db_showtime.is_active
+        for key, value in showtime.dict(exclude_unset=True).items():
+            setattr(db_showtime, key, value)
+        
+        if db_showtime.theater_id != previous_theater_id:
+            # Seat counters belong to the old theater's layout; the service counts the new one
+            db.query(ShowtimeOccupancy).filter(ShowtimeOccupancy.showtime_id == showtime_id).delete()
+        db.commit()
+        db.refresh(db_showtime)
+        
+        showtime_index.upsert(scheduled(db_showtime), previous_start=previous_start)
+        if db_showtime.theater_id != previous_theater_id or db_showtime.is_active != previous_is_active:
+            seat_availability_index.invalidate(showtime_id)
+        return db_showtime
+    
+    def deactivate_showtime(self, db: Session, showtime_id: int):
+        db_showtime = db.query(Showtime).filter(Showtime.id == showtime_id).first()
+        if not db_showtime:
+            return None
+        
+        # Showtimes are taken off sale rather than deleted, as bookings refer to them
+        db_showtime.is_active = False
+        db.commit()
+        db.refresh(db_showtime)
+        showtime_index.upsert(scheduled(db_showtime))
+        # Its seat map goes at once here; other workers drop it within the index TTL
+        seat_availability_index.invalidate(showtime_id)
+        return db_showtime
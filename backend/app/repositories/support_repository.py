@@ -3,6 +3,11 @@ from typing import List, Optional
 import uuid
 from ..models.support import SupportTicket, SupportInteraction
 from ..schemas.support import SupportTicketCreate, SupportTicketUpdate, SupportInteractionCreate
+from .loading_profiles import SUPPORT_TICKET_RESPONSE
+from ..utils.pagination import keyset_paginate, to_page
+
+# Columns the ticket list is ordered and paged on
+SUPPORT_TICKET_PAGE_KEY = (SupportTicket.id,)
 
 class SupportRepository:
     def get_support_tickets(
@@ -12,9 +17,10 @@ class SupportRepository:
         limit: int = 100,
         user_id: Optional[int] = None,
         support_agent_id: Optional[int] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
     ):
-        query = db.query(SupportTicket)
+        query = db.query(SupportTicket).options(*SUPPORT_TICKET_RESPONSE)
         
         if user_id:
             query = query.filter(SupportTicket.user_id == user_id)
@@ -25,13 +31,21 @@ class SupportRepository:
         if status:
             query = query.filter(SupportTicket.status == status)
         
-        return query.offset(skip).limit(limit).all()
+        # Newest first
+        query = keyset_paginate(query, SUPPORT_TICKET_PAGE_KEY, limit, cursor=cursor, skip=skip, descending=True)
+        return to_page(query.all(), SUPPORT_TICKET_PAGE_KEY, limit)
     
     def get_support_ticket(self, db: Session, ticket_id: int):
-        return db.query(SupportTicket).filter(SupportTicket.id == ticket_id).first()
+        return db.query(SupportTicket)\
+            .options(*SUPPORT_TICKET_RESPONSE)\
+            .filter(SupportTicket.id == ticket_id)\
+            .first()
     
     def get_support_ticket_by_reference(self, db: Session, ticket_reference: str):
-        return db.query(SupportTicket).filter(SupportTicket.ticket_reference == ticket_reference).first()
+        return db.query(SupportTicket)\
+            .options(*SUPPORT_TICKET_RESPONSE)\
+            .filter(SupportTicket.ticket_reference == ticket_reference)\
+            .first()
     
     def create_support_ticket(self, db: Session, ticket: SupportTicketCreate):
         # Generate a unique ticket reference
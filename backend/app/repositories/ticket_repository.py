@@ -1,9 +1,25 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, or_
 from typing import List, Optional
+from collections import Counter
 import uuid
-from ..models.ticket import Booking, SeatBooking, Payment
-from ..models.showtime import Showtime, Seat
+from datetime import datetime
+from ..models.ticket import Booking, SeatBooking, Payment, BookingStatus
+from ..models.showtime import Showtime, Seat, ShowtimeOccupancy
 from ..schemas.ticket import BookingCreate, BookingUpdate, PaymentCreate, PaymentUpdate
+from ..utils.seat_availability import seat_availability_index, ACTIVE_BOOKING_STATUSES
+from ..utils.theater_layout import theater_layout_cache
+from .loading_profiles import BOOKING_RESPONSE
+from ..utils.pagination import keyset_paginate, to_page
+from ..utils.seat_holds import seat_hold_store
+from ..utils.read_replicas import is_replica_session
+
+# Columns the booking list is ordered and paged on
+BOOKING_PAGE_KEY = (Booking.id,)
+
+# Price multiplier applied to the showtime price for each seat type
+SEAT_TYPE_PRICE_MULTIPLIERS = {"premium": 1.5, "vip": 2}
 
 class TicketRepository:
     def get_bookings(
@@ -12,9 +28,10 @@ class TicketRepository:
         skip: int = 0, 
         limit: int = 100,
         user_id: Optional[int] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
     ):
-        query = db.query(Booking)
+        query = db.query(Booking).options(*BOOKING_RESPONSE)
         
         if user_id:
             query = query.filter(Booking.user_id == user_id)
@@ -22,72 +39,127 @@ class TicketRepository:
         if status:
             query = query.filter(Booking.status == status)
         
-        return query.offset(skip).limit(limit).all()
+        # Newest first
+        query = keyset_paginate(query, BOOKING_PAGE_KEY, limit, cursor=cursor, skip=skip, descending=True)
+        return to_page(query.all(), BOOKING_PAGE_KEY, limit)
     
     def get_booking(self, db: Session, booking_id: int):
-        return db.query(Booking).filter(Booking.id == booking_id).first()
+        return db.query(Booking).options(*BOOKING_RESPONSE).filter(Booking.id == booking_id).first()
     
     def get_booking_by_reference(self, db: Session, booking_reference: str):
-        return db.query(Booking).filter(Booking.booking_reference == booking_reference).first()
+        return db.query(Booking)\
+            .options(*BOOKING_RESPONSE)\
+            .filter(Booking.booking_reference == booking_reference)\
+            .first()
     
     def create_booking(self, db: Session, booking: BookingCreate):
-        # Generate a unique booking reference
-        booking_reference = str(uuid.uuid4())[:8].upper()
-        
-        # Calculate total price based on seats
-        total_price = 0
-        showtime = db.query(Showtime).filter(Showtime.id == booking.showtime_id).first()
-        
-        # Create booking
-        db_booking = Booking(
-            user_id=booking.user_id,
-            showtime_id=booking.showtime_id,
-            booking_reference=booking_reference,
-            total_price=total_price,  # Will be updated after adding seats
-            created_by_support=booking.created_by_support,
-            support_agent_id=booking.support_agent_id
-        )
-        db.add(db_booking)
-        db.commit()
-        db.refresh(db_booking)
+        db_bookings = self.create_bookings(db, [booking])
+        if db_bookings is None:
+            return None
+        return db_bookings[0]
+    
+    def create_bookings(self, db: Session, bookings: List[BookingCreate]):
+        # All bookings must be for the same showtime; they are committed together
+        showtime_id = bookings[0].showtime_id
+        requested_seat_ids = {seat_id for booking in bookings for seat_id in booking.seat_ids}
         
-        # Add seat bookings
-        for seat_id in booking.seat_ids:
-            seat = db.query(Seat).filter(Seat.id == seat_id).first()
-            
-            # Calculate seat price based on seat type
-            seat_price = showtime.price
-            if seat.seat_type == "premium":
-                seat_price *= 1.5
-            elif seat.seat_type == "vip":
-                seat_price *= 2
+        showtime = db.query(Showtime.price, Showtime.theater_id, Showtime.is_active)\
+            .filter(Showtime.id == showtime_id)\
+            .first()
+        # Showtimes taken off sale accept no new bookings
+        if showtime is None or not showtime.is_active:
+            return None
+        showtime_price, theater_id, _ = showtime
+        
+        # Seat types come from the cached theater layout instead of the seats table
+        layout = self.get_theater_layout(db, theater_id)
+        seat_types = {seat_id: layout.seat_type_of(seat_id) for seat_id in requested_seat_ids}
+        if None in seat_types.values():
+            return None
+        
+        # Build the bookings and their seats so they are flushed together
+        db_bookings = []
+        for booking in bookings:
+            db_booking = Booking(
+                user_id=booking.user_id,
+                showtime_id=showtime_id,
+                booking_reference=str(uuid.uuid4())[:8].upper(),
+                created_by_support=booking.created_by_support,
+                support_agent_id=booking.support_agent_id
+            )
             
-            db_seat_booking = SeatBooking(
-                booking_id=db_booking.id,
-                seat_id=seat_id,
-                price=seat_price
+            total_price = 0
+            for seat_id in booking.seat_ids:
+                seat_price = showtime_price * SEAT_TYPE_PRICE_MULTIPLIERS.get(seat_types[seat_id], 1)
+                db_booking.seat_bookings.append(SeatBooking(
+                    showtime_id=showtime_id,
+                    seat_id=seat_id,
+                    price=seat_price,
+                    is_active=True
+                ))
+                total_price += seat_price
+            db_booking.total_price = total_price
+            db_bookings.append(db_booking)
+        
+        # The unique index on active (showtime, seat) rejects concurrent double bookings
+        try:
+            self._ensure_occupancy(db, showtime_id)
+            db.add_all(db_bookings)
+            self._adjust_occupancy(
+                db,
+                showtime_id,
+                [seat_types[seat_id] for booking in bookings for seat_id in booking.seat_ids],
+                1
             )
-            db.add(db_seat_booking)
-            total_price += seat_price
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return None
         
-        # Update total price
-        db_booking.total_price = total_price
-        db.commit()
-        db.refresh(db_booking)
-        return db_booking
+        seat_availability_index.mark_booked(showtime_id, requested_seat_ids)
+        return db_bookings
     
     def update_booking(self, db: Session, booking_id: int, booking_update: BookingUpdate):
         db_booking = db.query(Booking).filter(Booking.id == booking_id).first()
         if not db_booking:
             return None
         
+        was_active = db_booking.status in ACTIVE_BOOKING_STATUSES
+        
         # Update booking attributes
         update_data = booking_update.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_booking, key, value)
         
-        db.commit()
+        # Release or reclaim the seats in the same transaction as the status change
+        is_active = db_booking.status in ACTIVE_BOOKING_STATUSES
+        try:
+            if was_active != is_active:
+                self._ensure_occupancy(db, db_booking.showtime_id)
+                db.query(SeatBooking)\
+                    .filter(SeatBooking.booking_id == booking_id)\
+                    .update({SeatBooking.is_active: is_active}, synchronize_session=False)
+                layout = self.get_showtime_layout(db, db_booking.showtime_id)
+                self._adjust_occupancy(
+                    db,
+                    db_booking.showtime_id,
+                    [layout.seat_type_of(seat_booking.seat_id) for seat_booking in db_booking.seat_bookings],
+                    1 if is_active else -1
+                )
+            db.commit()
+        except IntegrityError:
+            # Another booking took the seats while this one was inactive
+            db.rollback()
+            return None
         db.refresh(db_booking)
+        
+        # Keep the seat availability index in step with status changes
+        if was_active != is_active:
+            seat_ids = [seat_booking.seat_id for seat_booking in db_booking.seat_bookings]
+            if is_active:
+                seat_availability_index.mark_booked(db_booking.showtime_id, seat_ids)
+            else:
+                seat_availability_index.release(db_booking.showtime_id, seat_ids)
         return db_booking
     
     def create_payment(self, db: Session, payment: PaymentCreate):
@@ -116,24 +188,259 @@ class TicketRepository:
         db.refresh(db_payment)
         return db_payment
     
+    def get_seat_availability(self, db: Session, showtime_id: int):
+        availability = seat_availability_index.get(showtime_id)
+        if availability is not None:
+            return availability
+        
+        # Rebuild the showtime bitmap from the database on a miss; showtimes taken
+        # off sale have no seat map, as if they did not exist
+        generation = seat_availability_index.generation(showtime_id)
+        theater_id = db.query(Showtime.theater_id)\
+            .filter(Showtime.id == showtime_id)\
+            .filter(Showtime.is_active.is_(True))\
+            .scalar()
+        if theater_id is None:
+            return None
+        layout = self.get_theater_layout(db, theater_id)
+        
+        booked_seat_ids = db.query(SeatBooking.seat_id)\
+            .filter(SeatBooking.showtime_id == showtime_id)\
+            .filter(SeatBooking.is_active.is_(True))\
+            .all()
+        
+        # A replica may lag behind bookings made here, so its rows are served but not cached
+        return seat_availability_index.install(
+            showtime_id,
+            layout,
+            [seat_id for (seat_id,) in booked_seat_ids],
+            generation,
+            cache=not is_replica_session(db)
+        )
+    
+    def get_theater_layout(self, db: Session, theater_id: int):
+        # The seats table is only read when a theater's layout is not cached yet
+        layout = theater_layout_cache.get(theater_id)
+        if layout is not None:
+            return layout
+        
+        seat_rows = db.query(Seat.id, Seat.row, Seat.number, Seat.seat_type)\
+            .filter(Seat.theater_id == theater_id)\
+            .order_by(Seat.id)\
+            .all()
+        return theater_layout_cache.install(theater_id, seat_rows)
+    
+    def is_showtime_on_sale(self, db: Session, showtime_id: int):
+        # None for an unknown showtime
+        return db.query(Showtime.is_active).filter(Showtime.id == showtime_id).scalar()
+    
+    def get_showtime_layout(self, db: Session, showtime_id: int):
+        availability = seat_availability_index.get(showtime_id)
+        if availability is not None:
+            return availability.layout
+        
+        theater_id = db.query(Showtime.theater_id).filter(Showtime.id == showtime_id).scalar()
+        if theater_id is None:
+            return None
+        return self.get_theater_layout(db, theater_id)
+    
     def get_available_seats(self, db: Session, showtime_id: int):
-        # Get all seats for the theater
-        showtime = db.query(Showtime).filter(Showtime.id == showtime_id).first()
-        if not showtime:
+        availability = self.get_seat_availability(db, showtime_id)
+        if availability is None:
             return []
         
-        all_seats = db.query(Seat).filter(Seat.theater_id == showtime.theater_id).all()
+        available_seats = availability.available_seats()
         
-        # Get booked seats for this showtime
-        booked_seat_ids = db.query(SeatBooking.seat_id)\
+        # Seats held during someone's checkout are not on sale either
+        held_seat_ids = seat_hold_store.held_seat_ids(showtime_id)
+        if held_seat_ids:
+            available_seats = [seat for seat in available_seats if seat.id not in held_seat_ids]
+        return available_seats
+    
+    def get_unavailable_seat_ids(
+        self, 
+        db: Session, 
+        showtime_id: int, 
+        seat_ids: List[int],
+        hold_id: Optional[str] = None
+    ):
+        availability = self.get_seat_availability(db, showtime_id)
+        if availability is None:
+            return list(seat_ids)
+        
+        unavailable_seat_ids = availability.unavailable_seat_ids(seat_ids)
+        
+        # Seats held by another checkout count as taken
+        held_seat_ids = seat_hold_store.conflicting_seat_ids(showtime_id, exclude_hold_id=hold_id)
+        if held_seat_ids:
+            unavailable_seat_ids += [
+                seat_id for seat_id in seat_ids 
+                if seat_id in held_seat_ids and seat_id not in unavailable_seat_ids
+            ]
+        return unavailable_seat_ids
+    
+    def expire_pending_bookings(self, db: Session, created_before: datetime, limit: int = 500):
+        # Unpaid pending bookings past their checkout window, found through the (status, created_at) index
+        expired_bookings = db.query(Booking.id)\
+            .filter(Booking.status == BookingStatus.PENDING)\
+            .filter(Booking.created_at < created_before)\
+            .filter(~Booking.payment.has())\
+            .order_by(Booking.created_at)\
+            .limit(limit)\
+            .all()
+        if not expired_bookings:
+            return {}
+        
+        booking_ids = [booking_id for (booking_id,) in expired_bookings]
+        db.query(Booking)\
+            .filter(Booking.id.in_(booking_ids))\
+            .filter(Booking.status == BookingStatus.PENDING)\
+            .update({Booking.status: BookingStatus.CANCELLED}, synchronize_session=False)
+        
+        # Only release seats of bookings this sweep actually cancelled
+        seat_rows = db.query(SeatBooking.id, SeatBooking.showtime_id, SeatBooking.seat_id)\
             .join(Booking)\
-            .filter(Booking.showtime_id == showtime_id)\
-            .filter(Booking.status.in_(["pending", "confirmed"]))\
+            .filter(Booking.id.in_(booking_ids))\
+            .filter(Booking.status == BookingStatus.CANCELLED)\
+            .filter(SeatBooking.is_active.is_(True))\
             .all()
+        released_seats = {}
+        for _, showtime_id, seat_id in seat_rows:
+            released_seats.setdefault(showtime_id, []).append(seat_id)
         
-        booked_seat_ids = [seat_id for (seat_id,) in booked_seat_ids]
+        if seat_rows:
+            for showtime_id in released_seats:
+                self._ensure_occupancy(db, showtime_id)
+            db.query(SeatBooking)\
+                .filter(SeatBooking.id.in_([seat_booking_id for seat_booking_id, _, _ in seat_rows]))\
+                .update({SeatBooking.is_active: False}, synchronize_session=False)
+            for showtime_id, seat_ids in released_seats.items():
+                layout = self.get_showtime_layout(db, showtime_id)
+                self._adjust_occupancy(db, showtime_id, [layout.seat_type_of(seat_id) for seat_id in seat_ids], -1)
+        db.commit()
         
-        # Filter out booked seats
-        available_seats = [seat for seat in all_seats if seat.id not in booked_seat_ids]
+        for showtime_id, seat_ids in released_seats.items():
+            seat_availability_index.release(showtime_id, seat_ids)
+        return released_seats
+    
+    def get_showtime_occupancy(self, db: Session, showtime_ids: List[int]):
+        occupancy = db.query(ShowtimeOccupancy)\
+            .filter(ShowtimeOccupancy.showtime_id.in_(showtime_ids))\
+            .all()
         
-        return available_seats
+        # Showtimes without counters are counted on the fly and nothing is written,
+        # so the read can run on a replica; counters are created on the primary
+        missing_showtime_ids = set(showtime_ids) - {row.showtime_id for row in occupancy}
+        if missing_showtime_ids:
+            occupancy += self._count_occupancy(db, list(missing_showtime_ids))
+        return occupancy
+    
+    def initialize_occupancy(self, db: Session, showtime_ids: List[int]):
+        try:
+            for showtime_id in showtime_ids:
+                self._ensure_occupancy(db, showtime_id)
+            db.commit()
+        except IntegrityError:
+            # Another request materialized the same showtime first
+            db.rollback()
+    
+    def get_occupancy_showtime_ids(self, db: Session, ends_after: datetime, theater_ids: List[int] = ()):
+        # Showtimes still on sale, plus every showtime of the given theaters
+        query = db.query(Showtime.id)
+        if theater_ids:
+            query = query.filter(or_(Showtime.end_time >= ends_after, Showtime.theater_id.in_(theater_ids)))
+        else:
+            query = query.filter(Showtime.end_time >= ends_after)
+        return [showtime_id for (showtime_id,) in query.order_by(Showtime.id).all()]
+    
+    def reconcile_occupancy(self, db: Session, showtime_ids: List[int]):
+        # Recounts the counters from seats and active seat bookings and fixes the rows that drifted,
+        # including totals after a theater's seats changed. Locking the showtimes and their counters
+        # first makes concurrent writers wait, so the recount sees every booking they commit.
+        # Returns the number of counter rows inserted, updated or deleted.
+        if not showtime_ids:
+            return 0
+        
+        db.query(Showtime.id)\
+            .filter(Showtime.id.in_(showtime_ids))\
+            .order_by(Showtime.id)\
+            .with_for_update()\
+            .all()
+        current_rows = db.query(ShowtimeOccupancy)\
+            .filter(ShowtimeOccupancy.showtime_id.in_(showtime_ids))\
+            .order_by(ShowtimeOccupancy.id)\
+            .with_for_update()\
+            .all()
+        current = {(row.showtime_id, row.seat_type): row for row in current_rows}
+        
+        corrected = 0
+        for counted in self._count_occupancy(db, showtime_ids):
+            row = current.pop((counted.showtime_id, counted.seat_type), None)
+            if row is None:
+                db.add(counted)
+                corrected += 1
+            elif (row.total_seats, row.booked_seats) != (counted.total_seats, counted.booked_seats):
+                row.total_seats = counted.total_seats
+                row.booked_seats = counted.booked_seats
+                corrected += 1
+        # Seat types the theater no longer has
+        for row in current.values():
+            db.delete(row)
+            corrected += 1
+        db.commit()
+        return corrected
+    
+    def _ensure_occupancy(self, db: Session, showtime_id: int):
+        # Creates missing counters inside the caller's transaction, before its seats change.
+        # The showtime row lock makes concurrent writers wait here, so the recount includes
+        # every booking committed before the counters exist and none is adjusted twice.
+        if self._has_occupancy(db, showtime_id):
+            return
+        db.query(Showtime.id).filter(Showtime.id == showtime_id).with_for_update().first()
+        if self._has_occupancy(db, showtime_id):
+            return
+        db.add_all(self._count_occupancy(db, [showtime_id]))
+        db.flush()
+    
+    def _has_occupancy(self, db: Session, showtime_id: int):
+        return db.query(ShowtimeOccupancy.id)\
+            .filter(ShowtimeOccupancy.showtime_id == showtime_id)\
+            .first() is not None
+    
+    def _count_occupancy(self, db: Session, showtime_ids: List[int]):
+        # Unsaved counter rows for the showtimes, counted from their theater's seats and active seat bookings
+        if not showtime_ids:
+            return []
+        
+        total_rows = db.query(Showtime.id, Seat.seat_type, func.count(Seat.id))\
+            .join(Seat, Seat.theater_id == Showtime.theater_id)\
+            .filter(Showtime.id.in_(showtime_ids))\
+            .group_by(Showtime.id, Seat.seat_type)\
+            .all()
+        booked_rows = db.query(SeatBooking.showtime_id, Seat.seat_type, func.count(SeatBooking.id))\
+            .join(Seat, Seat.id == SeatBooking.seat_id)\
+            .filter(SeatBooking.showtime_id.in_(showtime_ids))\
+            .filter(SeatBooking.is_active.is_(True))\
+            .group_by(SeatBooking.showtime_id, Seat.seat_type)\
+            .all()
+        booked_seats = {(showtime_id, seat_type): count for showtime_id, seat_type, count in booked_rows}
+        
+        return [
+            ShowtimeOccupancy(
+                showtime_id=showtime_id,
+                seat_type=seat_type,
+                total_seats=total,
+                booked_seats=booked_seats.get((showtime_id, seat_type), 0)
+            )
+            for showtime_id, seat_type, total in total_rows
+        ]
+    
+    def _adjust_occupancy(self, db: Session, showtime_id: int, seat_types: List[str], direction: int):
+        for seat_type, count in Counter(seat_types).items():
+            db.query(ShowtimeOccupancy)\
+                .filter(ShowtimeOccupancy.showtime_id == showtime_id)\
+                .filter(ShowtimeOccupancy.seat_type == seat_type)\
+                .update(
+                    {ShowtimeOccupancy.booked_seats: ShowtimeOccupancy.booked_seats + direction * count},
+                    synchronize_session=False
+                )
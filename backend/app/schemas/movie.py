@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from datetime import datetime
 
@@ -11,8 +11,7 @@ class GenreCreate(GenreBase):
 class Genre(GenreBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class MovieBase(BaseModel):
     title: str
@@ -44,5 +43,4 @@ class Movie(MovieBase):
     updated_at: Optional[datetime] = None
     genres: List[Genre]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
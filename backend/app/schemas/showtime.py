@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from datetime import datetime
 from .movie import Movie
@@ -13,8 +13,7 @@ class TheaterCreate(TheaterBase):
 class Theater(TheaterBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SeatBase(BaseModel):
     theater_id: int
@@ -28,8 +27,7 @@ class SeatCreate(SeatBase):
 class Seat(SeatBase):
     id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class ShowtimeBase(BaseModel):
     movie_id: int
@@ -50,11 +48,27 @@ class ShowtimeUpdate(BaseModel):
     price: Optional[float] = None
     is_active: Optional[bool] = None
 
-class Showtime(ShowtimeBase):
+class ScheduledShowtime(ShowtimeBase):
+    # Schedule lists come from the showtime index and carry IDs only;
+    # GET /showtimes/{id} returns the movie and theater as well
     id: int
     created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class Showtime(ScheduledShowtime):
     movie: Optional[Movie] = None
     theater: Optional[Theater] = None
 
-    class Config:
-        orm_mode = True
+class SeatTypeOccupancy(BaseModel):
+    seat_type: str
+    total_seats: int
+    booked_seats: int
+    available_seats: int
+
+class ShowtimeOccupancy(BaseModel):
+    showtime_id: int
+    total_seats: int
+    booked_seats: int
+    available_seats: int
+    seat_types: List[SeatTypeOccupancy]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import List, Optional
 from datetime import datetime
 from enum import Enum
@@ -28,8 +28,7 @@ class SupportInteraction(SupportInteractionBase):
     user_id: Optional[int] = None
     created_at: datetime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class SupportTicketBase(BaseModel):
     subject: str
@@ -60,5 +59,4 @@ class SupportTicket(SupportTicketBase):
     updated_at: Optional[datetime] = None
     interactions: List[SupportInteraction] = []
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
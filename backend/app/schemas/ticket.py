@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 from datetime import datetime
 from enum import Enum
@@ -32,8 +32,7 @@ class SeatBooking(SeatBookingBase):
     id: int
     booking_id: int
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class PaymentBase(BaseModel):
     amount: float
@@ -55,8 +54,7 @@ class Payment(PaymentBase):
     created_at: datetime
     updated_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class BookingBase(BaseModel):
     showtime_id: int
@@ -66,6 +64,12 @@ class BookingBase(BaseModel):
 class BookingCreate(BookingBase):
     user_id: int
     seat_ids: List[int]
+    hold_id: Optional[str] = None
+
+class BestAvailableBookingCreate(BookingBase):
+    user_id: int
+    party_size: int
+    seat_type: Optional[str] = None
 
 class BookingUpdate(BaseModel):
     status: Optional[BookingStatus] = None
@@ -81,5 +85,17 @@ class Booking(BookingBase):
     seat_bookings: List[SeatBooking]
     payment: Optional[Payment] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class SeatHoldCreate(BaseModel):
+    showtime_id: int
+    seat_ids: List[int]
+
+class SeatHold(BaseModel):
+    hold_id: str
+    showtime_id: int
+    seat_ids: List[int]
+    user_id: Optional[int] = None
+    expires_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from ..repositories.auth_repository import AuthRepository
 from ..schemas.user import UserCreate, User, Token
 from ..utils.security import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from ..utils.password_hasher import password_hasher
 
 class AuthService:
     def __init__(self):
@@ -28,9 +30,17 @@ class AuthService:
         
         return self.repository.create_user(db=db, user=user)
     
-    def login(self, db: Session, username: str, password: str):
-        user = self.repository.authenticate_user(db, username, password)
-        if not user:
+    async def login(self, db: Session, username: str, password: str):
+        # Only the quick user lookup runs on the threadpool; bcrypt is awaited on the
+        # password hasher's own pool, so a login storm leaves other endpoints their threads
+        user = await run_in_threadpool(self.repository.get_user_by_username, db, username)
+        valid = False
+        if user:
+            valid, new_hash = await password_hasher.verify_and_update_async(password, user.hashed_password)
+            if valid and new_hash:
+                await run_in_threadpool(self.repository.update_password_hash, db, user, new_hash)
+        
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
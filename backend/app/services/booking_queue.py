@@ -0,0 +1,187 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Deque, Dict, List, Set
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from sqlalchemy import inspect
+from ..schemas.ticket import BookingCreate
+from ..utils.database import SessionLocal
+from ..utils.logger import logger
+
+load_dotenv()
+
+BOOKING_QUEUE_ENABLED = os.getenv("BOOKING_QUEUE_ENABLED", "true").lower() == "true"
+BOOKING_QUEUE_BATCH_SIZE = int(os.getenv("BOOKING_QUEUE_BATCH_SIZE", "20"))
+BOOKING_QUEUE_MAX_PENDING = int(os.getenv("BOOKING_QUEUE_MAX_PENDING", "500"))
+BOOKING_QUEUE_WORKERS = int(os.getenv("BOOKING_QUEUE_WORKERS", "4"))
+BOOKING_QUEUE_TIMEOUT_SECONDS = float(os.getenv("BOOKING_QUEUE_TIMEOUT_SECONDS", "10"))
+
+class QueuedBooking:
+    __slots__ = ("booking", "future")
+
+    def __init__(self, booking: BookingCreate):
+        self.booking = booking
+        self.future: Future = Future()
+
+class ShowtimeQueue:
+    __slots__ = ("pending", "claimed_seat_ids", "scheduled")
+
+    def __init__(self):
+        self.pending: Deque[QueuedBooking] = deque()
+        # Seats requested by bookings that are queued or being committed
+        self.claimed_seat_ids: Set[int] = set()
+        self.scheduled = False
+
+class BookingQueue:
+    def __init__(
+        self,
+        ticket_service,
+        session_factory=SessionLocal,
+        enabled: bool = BOOKING_QUEUE_ENABLED,
+        batch_size: int = BOOKING_QUEUE_BATCH_SIZE,
+        max_pending: int = BOOKING_QUEUE_MAX_PENDING,
+        workers: int = BOOKING_QUEUE_WORKERS,
+        timeout_seconds: float = BOOKING_QUEUE_TIMEOUT_SECONDS
+    ):
+        self.ticket_service = ticket_service
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self._lock = threading.Lock()
+        self._queues: Dict[int, ShowtimeQueue] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="booking-queue")
+
+    def submit(self, booking: BookingCreate) -> int:
+        # Blocks the calling request thread until the booking is committed or rejected.
+        # Callers should not hold a pooled connection meanwhile; the workers need one.
+        future = self.enqueue(booking)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            pass
+
+        # A booking still waiting in the queue is withdrawn, so the timeout means it was not made
+        if self._withdraw(booking, future):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Booking is taking too long and was not made, please retry"
+            )
+        # A worker has already started on it; its outcome is the answer
+        return future.result()
+
+    def enqueue(self, booking: BookingCreate) -> Future:
+        queued_booking = QueuedBooking(booking)
+        with self._lock:
+            queue = self._queues.get(booking.showtime_id)
+            if queue is None:
+                queue = self._queues[booking.showtime_id] = ShowtimeQueue()
+
+            # Reject right away if a request ahead in the queue wants the same seat
+            for seat_id in booking.seat_ids:
+                if seat_id in queue.claimed_seat_ids:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail=f"Seat with ID {seat_id} is being booked by another request"
+                    )
+
+            if len(queue.pending) >= self.max_pending:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many booking requests for this showtime, please retry"
+                )
+
+            queue.claimed_seat_ids.update(booking.seat_ids)
+            queue.pending.append(queued_booking)
+            if not queue.scheduled:
+                queue.scheduled = True
+                self._executor.submit(self._drain, booking.showtime_id)
+        return queued_booking.future
+
+    def _withdraw(self, booking: BookingCreate, future: Future) -> bool:
+        with self._lock:
+            # Fails once a worker has marked the booking running
+            if not future.cancel():
+                return False
+            queue = self._queues.get(booking.showtime_id)
+            if queue is not None:
+                for queued_booking in queue.pending:
+                    if queued_booking.future is future:
+                        queue.pending.remove(queued_booking)
+                        queue.claimed_seat_ids.difference_update(booking.seat_ids)
+                        break
+        return True
+
+    def pending_count(self, showtime_id: int) -> int:
+        queue = self._queues.get(showtime_id)
+        return len(queue.pending) if queue is not None else 0
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _drain(self, showtime_id: int):
+        while True:
+            with self._lock:
+                queue = self._queues[showtime_id]
+                if not queue.pending:
+                    queue.scheduled = False
+                    del self._queues[showtime_id]
+                    return
+                batch = [queue.pending.popleft() for _ in range(min(self.batch_size, len(queue.pending)))]
+
+            try:
+                self._process_batch(batch)
+            except Exception as e:
+                logger.error(f"Booking queue batch for showtime {showtime_id} failed: {e}")
+                for queued_booking in batch:
+                    if not queued_booking.future.done():
+                        queued_booking.future.set_exception(e)
+            finally:
+                # Committed seats are now in the availability index, so the claims can go
+                with self._lock:
+                    for queued_booking in batch:
+                        queue.claimed_seat_ids.difference_update(queued_booking.booking.seat_ids)
+
+    def _process_batch(self, batch: List[QueuedBooking]):
+        db = self.session_factory()
+        try:
+            accepted = []
+            for queued_booking in batch:
+                # Skips bookings whose request gave up; the rest can no longer be withdrawn
+                if not queued_booking.future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    self.ticket_service.validate_booking(db, queued_booking.booking)
+                except HTTPException as e:
+                    queued_booking.future.set_exception(e)
+                    continue
+                accepted.append(queued_booking)
+
+            if not accepted:
+                return
+
+            # Requests in a batch never share seats, so they can be committed together
+            db_bookings = self.ticket_service.repository.create_bookings(
+                db,
+                [queued_booking.booking for queued_booking in accepted]
+            )
+            if db_bookings is not None:
+                for queued_booking, db_booking in zip(accepted, db_bookings):
+                    self.ticket_service.complete_booking(queued_booking.booking)
+                    # Read the key from the identity map instead of reloading the expired row
+                    queued_booking.future.set_result(inspect(db_booking).identity[0])
+                return
+
+            # A seat was taken outside this queue: commit one by one to isolate the conflict
+            for queued_booking in accepted:
+                try:
+                    db_booking = self.ticket_service.create_booking(db, queued_booking.booking)
+                except HTTPException as e:
+                    queued_booking.future.set_exception(e)
+                    continue
+                queued_booking.future.set_result(inspect(db_booking).identity[0])
+        finally:
+            db.close()
@@ -1,12 +1,40 @@
+import time
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..repositories.movie_repository import MovieRepository
+from ..repositories.async_movie_repository import AsyncMovieRepository
 from ..schemas.movie import MovieCreate, MovieUpdate, Movie, Genre, GenreCreate
+from ..utils.pagination import Page, NEXT_CURSOR_HEADER
+from ..utils.read_replicas import is_replica_session, READ_YOUR_WRITES_SECONDS
+from ..utils.response_cache import catalog_cache, CachedResponse
+from ..utils.conditional_requests import NotModified, etag_matches
+from ..utils.fast_json import dump_json
+
+# Cache tags: every movie list, one movie's detail, every genre list
+MOVIES_TAG = "movies"
+GENRES_TAG = "genres"
+# Catalog cache key of the movie list ETag
+CATALOG_VERSION_KEY = ("movies", "version")
+
+def movie_tag(movie_id: int) -> str:
+    return f"movie:{movie_id}"
+
+def page_headers(page: Page):
+    return {NEXT_CURSOR_HEADER: page.next_cursor} if page.next_cursor else {}
+
+def settle_seconds(db) -> float:
+    # A replica may still serve the rows a write just replaced
+    return READ_YOUR_WRITES_SECONDS if is_replica_session(db) else 0.0
+
+def revalidated(cached: CachedResponse, if_none_match: Optional[str]):
+    return NotModified(cached.etag) if etag_matches(if_none_match, cached.etag) else cached
 
 class MovieService:
     def __init__(self):
         self.repository = MovieRepository()
+        self.async_repository = AsyncMovieRepository()
     
     def get_movies(
         self, 
@@ -15,7 +43,8 @@ class MovieService:
         limit: int = 100,
         title_search: Optional[str] = None,
         genre_id: Optional[int] = None,
-        is_active: Optional[bool] = None
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None
     ):
         return self.repository.get_movies(
             db, 
@@ -23,9 +52,86 @@ class MovieService:
             limit=limit,
             title_search=title_search,
             genre_id=genre_id,
-            is_active=is_active
+            is_active=is_active,
+            cursor=cursor
+        )
+    
+    async def get_movies_async(
+        self, 
+        db: AsyncSession, 
+        skip: int = 0, 
+        limit: int = 100,
+        title_search: Optional[str] = None,
+        genre_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None
+    ):
+        return await self.async_repository.get_movies(
+            db, 
+            skip=skip, 
+            limit=limit,
+            title_search=title_search,
+            genre_id=genre_id,
+            is_active=is_active,
+            cursor=cursor
+        )
+    
+    async def get_movies_response_async(
+        self, 
+        db: AsyncSession, 
+        skip: int = 0, 
+        limit: int = 100,
+        title_search: Optional[str] = None,
+        genre_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+        cursor: Optional[str] = None,
+        if_none_match: Optional[str] = None
+    ):
+        # Serialized page from the catalog cache; a hit touches neither the database nor pydantic.
+        # Returns NotModified when the client's copy is current.
+        key = ("movies", skip, limit, title_search, genre_id, is_active, cursor)
+        cached = catalog_cache.get(key)
+        if cached is not None:
+            return revalidated(cached, if_none_match)
+        
+        # The version is read before the page, so a concurrent write can only make the ETag older
+        started_at = time.monotonic()
+        etag = await self.get_catalog_etag_async(db, started_at)
+        if etag_matches(if_none_match, etag):
+            return NotModified(etag)
+        
+        page = await self.get_movies_async(
+            db, 
+            skip=skip, 
+            limit=limit,
+            title_search=title_search,
+            genre_id=genre_id,
+            is_active=is_active,
+            cursor=cursor
+        )
+        return catalog_cache.put(
+            key,
+            dump_json(List[Movie], page.items),
+            (MOVIES_TAG,),
+            started_at,
+            headers=page_headers(page),
+            etag=etag,
+            settle_seconds=settle_seconds(db)
         )
     
+    async def get_catalog_etag_async(self, db: AsyncSession, started_at: float):
+        # Computing the version scans the movies table, so it is cached under the movie
+        # list tag: an entry with no body whose ETag every list page shares. Movie writes
+        # drop it along with the pages.
+        cached = catalog_cache.get(CATALOG_VERSION_KEY)
+        if cached is not None:
+            return cached.etag
+        
+        count, version_sum = await self.async_repository.get_catalog_version(db)
+        etag = f'"movies-{count}-{version_sum}"'
+        catalog_cache.put(CATALOG_VERSION_KEY, b"", (MOVIES_TAG,), started_at, etag=etag, settle_seconds=settle_seconds(db))
+        return etag
+    
     def get_movie(self, db: Session, movie_id: int):
         db_movie = self.repository.get_movie(db, movie_id=movie_id)
         if db_movie is None:
@@ -35,6 +141,33 @@ class MovieService:
             )
         return db_movie
     
+    def get_movie_response(self, db: Session, movie_id: int, if_none_match: Optional[str] = None):
+        key = ("movie", movie_id)
+        cached = catalog_cache.get(key)
+        if cached is not None:
+            return revalidated(cached, if_none_match)
+        
+        started_at = time.monotonic()
+        version = self.repository.get_movie_version(db, movie_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Movie not found"
+            )
+        etag = f'"movie-{movie_id}-{version}"'
+        if etag_matches(if_none_match, etag):
+            return NotModified(etag)
+        
+        db_movie = self.get_movie(db, movie_id=movie_id)
+        return catalog_cache.put(
+            key,
+            dump_json(Movie, db_movie),
+            (movie_tag(movie_id),),
+            started_at,
+            etag=etag,
+            settle_seconds=settle_seconds(db)
+        )
+    
     def create_movie(self, db: Session, movie: MovieCreate):
         # Validate that all genre IDs exist
         for genre_id in movie.genre_ids:
@@ -45,7 +178,9 @@ class MovieService:
                     detail=f"Genre with ID {genre_id} not found"
                 )
         
-        return self.repository.create_movie(db=db, movie=movie)
+        db_movie = self.repository.create_movie(db=db, movie=movie)
+        catalog_cache.invalidate(MOVIES_TAG, movie_tag(db_movie.id))
+        return db_movie
     
     def update_movie(self, db: Session, movie_id: int, movie: MovieUpdate):
         # Check if movie exists
@@ -66,7 +201,9 @@ class MovieService:
                         detail=f"Genre with ID {genre_id} not found"
                     )
         
-        return self.repository.update_movie(db=db, movie_id=movie_id, movie=movie)
+        db_movie = self.repository.update_movie(db=db, movie_id=movie_id, movie=movie)
+        catalog_cache.invalidate(MOVIES_TAG, movie_tag(movie_id))
+        return db_movie
     
     def delete_movie(self, db: Session, movie_id: int):
         db_movie = self.repository.delete_movie(db, movie_id=movie_id)
@@ -75,11 +212,45 @@ class MovieService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Movie not found"
             )
+        catalog_cache.invalidate(MOVIES_TAG, movie_tag(movie_id))
         return db_movie
     
     # Genre methods
-    def get_genres(self, db: Session, skip: int = 0, limit: int = 100):
-        return self.repository.get_genres(db, skip=skip, limit=limit)
+    def get_genres(self, db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        return self.repository.get_genres(db, skip=skip, limit=limit, cursor=cursor)
+    
+    async def get_genres_async(self, db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+        return await self.async_repository.get_genres(db, skip=skip, limit=limit, cursor=cursor)
+    
+    async def get_genres_response_async(
+        self,
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        if_none_match: Optional[str] = None
+    ):
+        key = ("genres", skip, limit, cursor)
+        cached = catalog_cache.get(key)
+        if cached is not None:
+            return revalidated(cached, if_none_match)
+        
+        started_at = time.monotonic()
+        count, last_id = await self.async_repository.get_genres_version(db)
+        etag = f'"genres-{count}-{last_id}"'
+        if etag_matches(if_none_match, etag):
+            return NotModified(etag)
+        
+        page = await self.get_genres_async(db, skip=skip, limit=limit, cursor=cursor)
+        return catalog_cache.put(
+            key,
+            dump_json(List[Genre], page.items),
+            (GENRES_TAG,),
+            started_at,
+            headers=page_headers(page),
+            etag=etag,
+            settle_seconds=settle_seconds(db)
+        )
     
     def get_genre(self, db: Session, genre_id: int):
         db_genre = self.repository.get_genre(db, genre_id=genre_id)
@@ -91,4 +262,6 @@ class MovieService:
         return db_genre
     
     def create_genre(self, db: Session, genre: GenreCreate):
-        return self.repository.create_genre(db=db, name=genre.name)
+        db_genre = self.repository.create_genre(db=db, name=genre.name)
+        catalog_cache.invalidate(GENRES_TAG)
+        return db_genre
@@ -0,0 +1,144 @@
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime, timedelta
+from fastapi import HTTPException, status
+from ..repositories.showtime_repository import ShowtimeRepository
+from ..repositories.movie_repository import MovieRepository
+from ..repositories.ticket_repository import TicketRepository
+from ..schemas.showtime import ShowtimeCreate, ShowtimeUpdate
+from ..utils.showtime_index import local_naive
+
+# Longest date range one schedule request may cover
+MAX_SCHEDULE_DAYS = 31
+# Schedule shown when no range is given
+DEFAULT_SCHEDULE_DAYS = 7
+
+class ShowtimeService:
+    def __init__(self):
+        self.repository = ShowtimeRepository()
+        self.movie_repository = MovieRepository()
+        self.ticket_repository = TicketRepository()
+    
+    def get_schedule(
+        self,
+        db: Session,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        movie_id: Optional[int] = None,
+        theater_id: Optional[int] = None
+    ):
+        start = local_naive(start) if start else datetime.now()
+        end = local_naive(end) if end else start + timedelta(days=DEFAULT_SCHEDULE_DAYS)
+        if end <= start:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="End must be after start"
+            )
+        if end - start > timedelta(days=MAX_SCHEDULE_DAYS):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_SCHEDULE_DAYS} days can be requested at once"
+            )
+        
+        return self.repository.get_schedule(db, start, end, movie_id=movie_id, theater_id=theater_id)
+    
+    def get_todays_schedule(self, db: Session, movie_id: Optional[int] = None, theater_id: Optional[int] = None):
+        # Everything still to start today: one in-memory day bucket
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return self.repository.get_schedule(db, now, midnight, movie_id=movie_id, theater_id=theater_id)
+    
+    def get_showtime(self, db: Session, showtime_id: int):
+        db_showtime = self.repository.get_showtime(db, showtime_id)
+        if db_showtime is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Showtime not found"
+            )
+        return db_showtime
+    
+    def create_showtime(self, db: Session, showtime: ShowtimeCreate):
+        showtime.start_time = local_naive(showtime.start_time)
+        showtime.end_time = local_naive(showtime.end_time)
+        self._validate(db, showtime.movie_id, showtime.theater_id, showtime.start_time, showtime.end_time)
+        
+        db_showtime = self.repository.create_showtime(db, showtime)
+        # Seat counters start out with every seat available
+        self.ticket_repository.initialize_occupancy(db, [db_showtime.id])
+        return self.repository.get_showtime(db, db_showtime.id)
+    
+    def update_showtime(self, db: Session, showtime_id: int, showtime: ShowtimeUpdate):
+        db_showtime = self.get_showtime(db, showtime_id)
+        
+        if showtime.start_time is not None:
+            showtime.start_time = local_naive(showtime.start_time)
+        if showtime.end_time is not None:
+            showtime.end_time = local_naive(showtime.end_time)
+        
+        theater_id = showtime.theater_id if showtime.theater_id is not None else db_showtime.theater_id
+        theater_changed = theater_id != db_showtime.theater_id
+        if theater_changed and self.repository.has_active_bookings(db, showtime_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Showtime has bookings and cannot move to another theater"
+            )
+        
+        self._validate(
+            db,
+            showtime.movie_id if showtime.movie_id is not None else db_showtime.movie_id,
+            theater_id,
+            showtime.start_time or db_showtime.start_time,
+            showtime.end_time or db_showtime.end_time,
+            showtime_id=showtime_id,
+            is_active=showtime.is_active if showtime.is_active is not None else db_showtime.is_active
+        )
+        
+        self.repository.update_showtime(db, showtime_id, showtime)
+        if theater_changed:
+            # Counters of the old theater were dropped; count the new one's seats
+            self.ticket_repository.initialize_occupancy(db, [showtime_id])
+        return self.repository.get_showtime(db, showtime_id)
+    
+    def deactivate_showtime(self, db: Session, showtime_id: int):
+        db_showtime = self.repository.deactivate_showtime(db, showtime_id)
+        if db_showtime is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Showtime not found"
+            )
+        return self.repository.get_showtime(db, showtime_id)
+    
+    def _validate(
+        self,
+        db: Session,
+        movie_id: int,
+        theater_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        showtime_id: Optional[int] = None,
+        is_active: bool = True
+    ):
+        if end_time <= start_time:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Showtime must end after it starts"
+            )
+        
+        if self.movie_repository.get_movie_version(db, movie_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Movie with ID {movie_id} not found"
+            )
+        
+        if self.repository.get_theater(db, theater_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Theater with ID {theater_id} not found"
+            )
+        
+        # Inactive showtimes are off sale and may overlap anything
+        if is_active and self.repository.has_overlap(db, theater_id, start_time, end_time, exclude_showtime_id=showtime_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Theater already has a showtime at that time"
+            )
@@ -15,7 +15,8 @@ class SupportService:
         limit: int = 100,
         user_id: Optional[int] = None,
         support_agent_id: Optional[int] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
     ):
         return self.repository.get_support_tickets(
             db, 
@@ -23,7 +24,8 @@ class SupportService:
             limit=limit,
             user_id=user_id,
             support_agent_id=support_agent_id,
-            status=status
+            status=status,
+            cursor=cursor
         )
     
     def get_support_ticket(self, db: Session, ticket_id: int):
@@ -1,12 +1,62 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Callable, List, Optional
+from datetime import datetime, timedelta, timezone
+import asyncio
+import json
+import os
+import threading
 from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from ..repositories.ticket_repository import TicketRepository
-from ..schemas.ticket import BookingCreate, BookingUpdate, PaymentCreate, PaymentUpdate
+from ..repositories.async_ticket_repository import AsyncTicketRepository
+from ..schemas.ticket import BookingCreate, BookingUpdate, BestAvailableBookingCreate, PaymentCreate, PaymentUpdate, SeatHoldCreate
+from ..schemas.showtime import ShowtimeOccupancy, SeatTypeOccupancy
+from ..utils.database import SessionLocal
+from ..utils.seat_holds import seat_hold_store, SEAT_HOLD_TTL_MINUTES
+from ..utils.seat_availability import ACTIVE_BOOKING_STATUSES
+from ..utils.seat_allocator import find_best_block
+from ..utils.seat_events import seat_event_broker, SEAT_HELD, SEAT_BOOKED, SEAT_RELEASED, SEAT_EVENTS_KEEPALIVE_SECONDS
+from ..utils.showtime_index import local_naive
+from ..utils.theater_layout import theater_layout_cache
+
+# Upper bound on showtimes per occupancy request
+MAX_OCCUPANCY_SHOWTIMES = 200
+
+# Largest group the best-available allocator will seat together
+MAX_PARTY_SIZE = int(os.getenv("MAX_PARTY_SIZE", "10"))
+# Allocation rounds before giving up when other requests keep taking the chosen block
+BEST_AVAILABLE_ATTEMPTS = 3
+
+# Unpaid pending bookings older than this are cancelled by the expiry sweeper
+PENDING_BOOKING_TTL_MINUTES = float(os.getenv("PENDING_BOOKING_TTL_MINUTES", "15"))
+PENDING_BOOKING_SWEEP_INTERVAL_SECONDS = float(os.getenv("PENDING_BOOKING_SWEEP_INTERVAL_SECONDS", "30"))
+
+# Seat counters of showtimes still on sale are recounted this often to repair any drift
+OCCUPANCY_RECONCILE_INTERVAL_SECONDS = float(os.getenv("OCCUPANCY_RECONCILE_INTERVAL_SECONDS", "300"))
+# Showtimes recounted per transaction
+OCCUPANCY_RECONCILE_BATCH_SIZE = 100
+
+def publish_seat_hold_event(event: str, hold):
+    state = SEAT_HELD if event == "held" else SEAT_RELEASED
+    seat_event_broker.publish(hold.showtime_id, state, hold.seat_ids)
+
+seat_hold_store.add_listener(publish_seat_hold_event)
+
+# Theaters whose seats changed; the next reconcile recounts all of their showtimes
+changed_theater_ids = set()
+changed_theater_lock = threading.Lock()
+
+def mark_theater_changed(theater_id: int):
+    with changed_theater_lock:
+        changed_theater_ids.add(theater_id)
+
+theater_layout_cache.add_listener(mark_theater_changed)
 
 class TicketService:
     def __init__(self):
         self.repository = TicketRepository()
+        self.async_repository = AsyncTicketRepository()
     
     def get_bookings(
         self, 
@@ -14,14 +64,16 @@ class TicketService:
         skip: int = 0, 
         limit: int = 100,
         user_id: Optional[int] = None,
-        status: Optional[str] = None
+        status: Optional[str] = None,
+        cursor: Optional[str] = None
     ):
         return self.repository.get_bookings(
             db, 
             skip=skip, 
             limit=limit,
             user_id=user_id,
-            status=status
+            status=status,
+            cursor=cursor
         )
     
     def get_booking(self, db: Session, booking_id: int):
@@ -42,20 +94,119 @@ class TicketService:
             )
         return db_booking
     
+    async def get_booking_by_reference_async(self, db: AsyncSession, booking_reference: str):
+        db_booking = await self.async_repository.get_booking_by_reference(db, booking_reference=booking_reference)
+        if db_booking is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Booking not found"
+            )
+        return db_booking
+    
     def create_booking(self, db: Session, booking: BookingCreate):
-        # Check if seats are available
-        available_seats = self.repository.get_available_seats(db, booking.showtime_id)
-        available_seat_ids = [seat.id for seat in available_seats]
+        self.validate_booking(db, booking)
+        
+        db_booking = self.repository.create_booking(db=db, booking=booking)
+        if db_booking is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="One or more seats are no longer available"
+            )
+        
+        self.complete_booking(booking)
+        return db_booking
+    
+    def validate_booking(self, db: Session, booking: BookingCreate):
+        self._validate_seat_ids(booking.seat_ids)
+        self._validate_on_sale(db, booking.showtime_id)
         
-        # Validate that all requested seats are available
-        for seat_id in booking.seat_ids:
-            if seat_id not in available_seat_ids:
+        # A booking may claim seats held for the same user during checkout
+        if booking.hold_id:
+            hold = seat_hold_store.get(booking.hold_id)
+            if hold is None or hold.showtime_id != booking.showtime_id or hold.user_id != booking.user_id:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Seat with ID {seat_id} is not available"
+                    detail="Seat hold not found or expired"
                 )
         
-        return self.repository.create_booking(db=db, booking=booking)
+        # Fail fast on seats the availability index already knows are taken
+        unavailable_seat_ids = self.repository.get_unavailable_seat_ids(
+            db, 
+            booking.showtime_id, 
+            booking.seat_ids,
+            hold_id=booking.hold_id
+        )
+        if unavailable_seat_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Seat with ID {unavailable_seat_ids[0]} is not available"
+            )
+    
+    def create_best_available_booking(
+        self, 
+        db: Session, 
+        request: BestAvailableBookingCreate,
+        submit: Callable[[BookingCreate], object]
+    ):
+        self._validate_on_sale(db, request.showtime_id)
+        
+        excluded_seat_ids = set()
+        for attempt in range(BEST_AVAILABLE_ATTEMPTS):
+            seat_ids = self.find_best_available_seats(
+                db, 
+                request.showtime_id, 
+                request.party_size, 
+                seat_type=request.seat_type,
+                excluded_seat_ids=excluded_seat_ids
+            )
+            booking = BookingCreate(
+                showtime_id=request.showtime_id,
+                user_id=request.user_id,
+                seat_ids=seat_ids,
+                created_by_support=request.created_by_support,
+                support_agent_id=request.support_agent_id
+            )
+            try:
+                return submit(booking)
+            except HTTPException as e:
+                # Another request got part of the block first: pick again without it
+                if e.status_code not in (status.HTTP_400_BAD_REQUEST, status.HTTP_409_CONFLICT) \
+                        or attempt == BEST_AVAILABLE_ATTEMPTS - 1:
+                    raise
+                excluded_seat_ids.update(seat_ids)
+    
+    def find_best_available_seats(
+        self, 
+        db: Session, 
+        showtime_id: int, 
+        party_size: int,
+        seat_type: Optional[str] = None,
+        excluded_seat_ids=()
+    ):
+        if not 1 <= party_size <= MAX_PARTY_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Party size must be between 1 and {MAX_PARTY_SIZE}"
+            )
+        
+        layout, available_bits = self.get_seat_map_state(db, showtime_id)
+        if excluded_seat_ids:
+            available_bits &= ~layout.mask(excluded_seat_ids)
+        
+        seat_ids = find_best_block(layout, available_bits, party_size, seat_type=seat_type)
+        if seat_ids is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"No {party_size} adjacent {seat_type + ' ' if seat_type else ''}seats are available"
+            )
+        return seat_ids
+    
+    def complete_booking(self, booking: BookingCreate):
+        # The hold has served its purpose once the seats are booked
+        if booking.hold_id:
+            seat_hold_store.release(booking.hold_id, notify=False)
+        
+        seat_event_broker.publish(booking.showtime_id, SEAT_BOOKED, booking.seat_ids)
     
     def update_booking(self, db: Session, booking_id: int, booking_update: BookingUpdate):
         # Check if booking exists
@@ -66,7 +217,19 @@ class TicketService:
                 detail="Booking not found"
             )
         
-        return self.repository.update_booking(db=db, booking_id=booking_id, booking_update=booking_update)
+        was_active = db_booking.status in ACTIVE_BOOKING_STATUSES
+        
+        db_booking = self.repository.update_booking(db=db, booking_id=booking_id, booking_update=booking_update)
+        if db_booking is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="One or more seats of this booking are no longer available"
+            )
+        
+        is_active = db_booking.status in ACTIVE_BOOKING_STATUSES
+        if was_active != is_active:
+            self._publish_booking_seats(db_booking, SEAT_BOOKED if is_active else SEAT_RELEASED)
+        return db_booking
     
     def create_payment(self, db: Session, payment: PaymentCreate):
         # Check if booking exists
@@ -105,9 +268,246 @@ class TicketService:
         # If payment is completed, update booking status to confirmed
         if db_payment.status == "completed":
             booking_update = BookingUpdate(status="confirmed")
-            self.repository.update_booking(db=db, booking_id=db_payment.booking_id, booking_update=booking_update)
+            db_booking = self.repository.update_booking(db=db, booking_id=db_payment.booking_id, booking_update=booking_update)
+            if db_booking is not None:
+                self._publish_booking_seats(db_booking, SEAT_BOOKED)
         
         return db_payment
     
     def get_available_seats(self, db: Session, showtime_id: int):
         return self.repository.get_available_seats(db, showtime_id=showtime_id)
+    
+    async def get_available_seats_async(self, db: AsyncSession, showtime_id: int):
+        return await self.async_repository.get_available_seats(db, showtime_id=showtime_id)
+    
+    def get_showtime_occupancy(self, db: Session, showtime_ids: List[int]):
+        if len(showtime_ids) > MAX_OCCUPANCY_SHOWTIMES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"At most {MAX_OCCUPANCY_SHOWTIMES} showtimes can be requested at once"
+            )
+        
+        rows_by_showtime = {}
+        for row in self.repository.get_showtime_occupancy(db, showtime_ids):
+            rows_by_showtime.setdefault(row.showtime_id, []).append(row)
+        
+        occupancy = []
+        for showtime_id in dict.fromkeys(showtime_ids):
+            rows = rows_by_showtime.get(showtime_id)
+            if not rows:
+                continue
+            seat_types = [
+                SeatTypeOccupancy(
+                    seat_type=row.seat_type,
+                    total_seats=row.total_seats,
+                    booked_seats=row.booked_seats,
+                    available_seats=row.total_seats - row.booked_seats
+                )
+                for row in sorted(rows, key=lambda row: row.seat_type)
+            ]
+            total_seats = sum(seat_type.total_seats for seat_type in seat_types)
+            booked_seats = sum(seat_type.booked_seats for seat_type in seat_types)
+            occupancy.append(ShowtimeOccupancy(
+                showtime_id=showtime_id,
+                total_seats=total_seats,
+                booked_seats=booked_seats,
+                available_seats=total_seats - booked_seats,
+                seat_types=seat_types
+            ))
+        return occupancy
+    
+    def get_seat_map_state(self, db: Session, showtime_id: int):
+        availability = self.repository.get_seat_availability(db, showtime_id)
+        if availability is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Showtime not found"
+            )
+        
+        return availability.layout, availability.available_bits(seat_hold_store.held_seat_ids(showtime_id))
+    
+    async def get_seat_map_state_async(self, db: AsyncSession, showtime_id: int):
+        state = await self.find_seat_map_state_async(db, showtime_id)
+        if state is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Showtime not found"
+            )
+        return state
+    
+    async def find_seat_map_state_async(self, db: AsyncSession, showtime_id: int):
+        # Layout and bookable-seat bitmap (held seats excluded), or None for an unknown showtime
+        availability = await self.async_repository.get_seat_availability(db, showtime_id)
+        if availability is None:
+            return None
+        
+        return availability.layout, availability.available_bits(seat_hold_store.held_seat_ids(showtime_id))
+    
+    def get_theater_layout(self, db: Session, theater_id: int):
+        layout = self.repository.get_theater_layout(db, theater_id)
+        if not len(layout):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Theater not found"
+            )
+        return layout
+    
+    def get_seat_map_snapshot(self, showtime_id: int):
+        # Uses a short-lived session so long-running streams do not pin a connection
+        db = SessionLocal()
+        try:
+            seats = self.repository.get_available_seats(db, showtime_id=showtime_id)
+        finally:
+            db.close()
+        
+        return json.dumps({
+            "type": "snapshot",
+            "showtime_id": showtime_id,
+            "seats": [
+                {
+                    "id": seat.id,
+                    "theater_id": seat.theater_id,
+                    "row": seat.row,
+                    "number": seat.number,
+                    "seat_type": seat.seat_type
+                }
+                for seat in seats
+            ]
+        })
+    
+    async def seat_map_events(self, showtime_id: int):
+        # Yields a snapshot, then seat deltas as they happen; None means nothing changed lately
+        subscription = seat_event_broker.subscribe(showtime_id)
+        try:
+            yield await run_in_threadpool(self.get_seat_map_snapshot, showtime_id)
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.queue.get(), timeout=SEAT_EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                
+                yield message
+                
+                # A viewer that fell behind gets a fresh snapshot instead of the lost deltas
+                if subscription.overflowed and subscription.queue.empty():
+                    subscription.overflowed = False
+                    yield await run_in_threadpool(self.get_seat_map_snapshot, showtime_id)
+        finally:
+            seat_event_broker.unsubscribe(subscription)
+    
+    # Seat hold methods
+    def create_seat_hold(self, db: Session, hold: SeatHoldCreate, user_id: int):
+        self._validate_seat_ids(hold.seat_ids)
+        self._validate_on_sale(db, hold.showtime_id)
+        
+        unavailable_seat_ids = self.repository.get_unavailable_seat_ids(db, hold.showtime_id, hold.seat_ids)
+        if unavailable_seat_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Seat with ID {unavailable_seat_ids[0]} is not available"
+            )
+        
+        seat_hold = seat_hold_store.create_hold(
+            hold.showtime_id, 
+            hold.seat_ids, 
+            user_id=user_id,
+            ttl_seconds=SEAT_HOLD_TTL_MINUTES * 60
+        )
+        if seat_hold is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="One or more seats are already held"
+            )
+        return seat_hold
+    
+    def get_seat_hold(self, hold_id: str):
+        seat_hold = seat_hold_store.get(hold_id)
+        if seat_hold is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Seat hold not found"
+            )
+        return seat_hold
+    
+    def release_seat_hold(self, hold_id: str):
+        seat_hold = seat_hold_store.release(hold_id)
+        if seat_hold is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Seat hold not found"
+            )
+        return seat_hold
+    
+    # Expiry sweeper tasks
+    def expire_seat_holds(self):
+        return seat_hold_store.expire_due()
+    
+    def expire_pending_bookings(self):
+        db = SessionLocal()
+        try:
+            created_before = datetime.now(timezone.utc) - timedelta(minutes=PENDING_BOOKING_TTL_MINUTES)
+            released_seats = self.repository.expire_pending_bookings(db, created_before=created_before)
+        finally:
+            db.close()
+        
+        for showtime_id, seat_ids in released_seats.items():
+            seat_event_broker.publish(showtime_id, SEAT_RELEASED, seat_ids)
+        return released_seats
+    
+    def reconcile_occupancy(self):
+        with changed_theater_lock:
+            theater_ids = list(changed_theater_ids)
+            changed_theater_ids.clear()
+        
+        db = SessionLocal()
+        try:
+            showtime_ids = self.repository.get_occupancy_showtime_ids(
+                db,
+                ends_after=local_naive(datetime.now(timezone.utc)),
+                theater_ids=theater_ids
+            )
+            corrected = 0
+            for start in range(0, len(showtime_ids), OCCUPANCY_RECONCILE_BATCH_SIZE):
+                corrected += self.repository.reconcile_occupancy(
+                    db,
+                    showtime_ids[start:start + OCCUPANCY_RECONCILE_BATCH_SIZE]
+                )
+        except Exception:
+            # Try the changed theaters again on the next run
+            with changed_theater_lock:
+                changed_theater_ids.update(theater_ids)
+            raise
+        finally:
+            db.close()
+        return corrected
+    
+    def _publish_booking_seats(self, db_booking, state: str):
+        seat_ids = [seat_booking.seat_id for seat_booking in db_booking.seat_bookings]
+        seat_event_broker.publish(db_booking.showtime_id, state, seat_ids)
+    
+    def _validate_on_sale(self, db: Session, showtime_id: int):
+        is_active = self.repository.is_showtime_on_sale(db, showtime_id)
+        if is_active is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Showtime not found"
+            )
+        if not is_active:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Showtime is no longer on sale"
+            )
+    
+    def _validate_seat_ids(self, seat_ids: List[int]):
+        if not seat_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least one seat must be selected"
+            )
+        
+        if len(set(seat_ids)) != len(seat_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Duplicate seat IDs in request"
+            )
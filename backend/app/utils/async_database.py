@@ -0,0 +1,54 @@
+import os
+from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from .database import (
+    DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+)
+
+load_dotenv()
+
+# Async drivers for the URL schemes the sync engine understands
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(database_url: str) -> str:
+    scheme, separator, rest = database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+def async_engine_options(database_url: str):
+    if database_url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+# Sessions keep loaded attributes after commit, since async code cannot lazy load them again
+AsyncSessionLocal = async_sessionmaker(class_=AsyncSession, expire_on_commit=False, autoflush=False)
+async_engine = None
+
+def get_async_engine():
+    # Created on first use so the async driver is only needed by processes that use it
+    global async_engine
+    if async_engine is None:
+        async_engine = create_async_engine(ASYNC_DATABASE_URL, **async_engine_options(ASYNC_DATABASE_URL))
+        AsyncSessionLocal.configure(bind=async_engine)
+    return async_engine
+
+async def dispose_async_engine():
+    if async_engine is not None:
+        await async_engine.dispose()
+
+# Dependency to get an async database session for non-blocking read endpoints
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,82 @@
+import csv
+import enum
+import io
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, Sequence
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+# Rows sent per COPY or executemany round trip
+BULK_INSERT_BATCH_SIZE = 50000
+
+# COPY ... NULL marker, distinct from an empty string
+COPY_NULL = "\\N"
+
+def batches(rows: Iterable[Sequence], size: int):
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+def copy_value(value):
+    if value is None:
+        return COPY_NULL
+    # Enum columns store the member name, as SQLAlchemy's Enum type does
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+def copy_rows(db: Session, table, columns: Sequence[str], rows: Iterable[Sequence], batch_size: int) -> int:
+    # psycopg2 streams each batch as CSV through COPY ... FROM STDIN
+    cursor = db.connection().connection.cursor()
+    statement = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    count = 0
+    try:
+        for batch in batches(rows, batch_size):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows([copy_value(value) for value in row] for row in batch)
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            count += len(batch)
+    finally:
+        cursor.close()
+    return count
+
+def bulk_insert(
+    db: Session,
+    model,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    batch_size: int = BULK_INSERT_BATCH_SIZE
+) -> int:
+    # Inserts plain tuples in the order of `columns`, skipping the ORM unit of work.
+    # Runs in the caller's transaction; the caller commits.
+    table = model.__table__
+    if db.get_bind().dialect.driver == "psycopg2":
+        return copy_rows(db, table, columns, rows, batch_size)
+
+    count = 0
+    statement = insert(table)
+    for batch in batches(rows, batch_size):
+        db.execute(statement, [dict(zip(columns, row)) for row in batch])
+        count += len(batch)
+    return count
+
+def next_id(db: Session, model) -> int:
+    # First free primary key, for rows inserted with explicit IDs
+    return (db.query(model.id).order_by(model.id.desc()).limit(1).scalar() or 0) + 1
+
+def reset_id_sequence(db: Session, model):
+    # After inserting explicit IDs, Postgres sequences must skip past them
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    table = model.__table__.name
+    db.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), coalesce(max(id), 0) + 1, false) FROM {table}"
+    ))
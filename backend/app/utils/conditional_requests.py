@@ -0,0 +1,36 @@
+import hashlib
+from typing import Dict, Optional
+from fastapi import Response, status
+
+# Clients may keep responses but must revalidate them with If-None-Match before reuse
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    # If-None-Match compares weakly: a W/ prefix is ignored and * matches any current representation
+    if not if_none_match or not etag:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+def bitmap_digest(bits: int, size: int) -> str:
+    # Short digest of a seat bitmap, for ETags that must change with any seat
+    return hashlib.blake2b(bits.to_bytes((size + 7) // 8, "little"), digest_size=8).hexdigest()
+
+class NotModified:
+    __slots__ = ("etag", "headers")
+
+    def __init__(self, etag: str, headers: Optional[Dict[str, str]] = None):
+        self.etag = etag
+        self.headers = headers or {}
+
+    def to_response(self) -> Response:
+        # A 304 repeats the validator and caching headers the full response would have sent
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={**self.headers, "ETag": self.etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+        )
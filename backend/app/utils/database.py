@@ -1,21 +1,65 @@
+from fastapi import HTTPException, status
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
+from .db_pool import InstrumentedQueuePool
 
 load_dotenv()
 
 # Get database connection details from environment variables
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/cinema_db")
 
-engine = create_engine(DATABASE_URL)
+# Connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Seconds to wait for a free connection before giving up with a 503
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+# Requests already waiting for a connection before new ones are turned away at once
+DB_POOL_MAX_WAITING = int(os.getenv("DB_POOL_MAX_WAITING", str(DB_POOL_SIZE)))
+DB_POOL_RETRY_AFTER_SECONDS = int(os.getenv("DB_POOL_RETRY_AFTER_SECONDS", "1"))
+
+def engine_options(database_url: str):
+    # In-memory SQLite keeps a single connection per thread, so pool sizing does not apply
+    if database_url.startswith("sqlite") and (":memory:" in database_url or database_url == "sqlite://"):
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+def get_pool_stats():
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool": type(pool).__name__}
+    return pool.stats()
+
+def raise_if_pool_saturated():
+    # Fail fast instead of queueing more request threads behind an exhausted pool
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool) and pool.is_saturated(DB_POOL_MAX_WAITING):
+        pool.metrics.record_shed()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database is busy, please retry shortly",
+            headers={"Retry-After": str(DB_POOL_RETRY_AFTER_SECONDS)}
+        )
+
 # Dependency to get the database session
 def get_db():
+    raise_if_pool_saturated()
     db = SessionLocal()
     try:
         yield db
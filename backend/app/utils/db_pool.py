@@ -0,0 +1,82 @@
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.shed = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            if wait_seconds > self.max_wait_seconds:
+                self.max_wait_seconds = wait_seconds
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def record_shed(self):
+        with self._lock:
+            self.shed += 1
+
+    def add_waiting(self, delta: int):
+        with self._lock:
+            self.waiting += delta
+
+class InstrumentedQueuePool(QueuePool):
+    # QueuePool that records how long callers wait for a connection
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        metrics = self.metrics
+        metrics.add_waiting(1)
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            metrics.record_timeout()
+            raise
+        finally:
+            metrics.add_waiting(-1)
+        metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+    @property
+    def capacity(self) -> int:
+        return self.size() + max(self._max_overflow, 0)
+
+    def is_saturated(self, max_waiting: int) -> bool:
+        # Every connection is in use and enough requests are already queued for one
+        return self.checkedout() >= self.capacity and self.metrics.waiting >= max_waiting
+
+    def stats(self):
+        metrics = self.metrics
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "waiting": metrics.waiting,
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "shed": metrics.shed,
+            "avg_wait_ms": round(metrics.total_wait_seconds * 1000 / metrics.checkouts, 3) if metrics.checkouts else 0.0,
+            "max_wait_ms": round(metrics.max_wait_seconds * 1000, 3),
+        }
@@ -0,0 +1,54 @@
+import os
+from functools import lru_cache
+from typing import Any, Optional
+from dotenv import load_dotenv
+from fastapi import Response, status
+from pydantic import TypeAdapter
+
+load_dotenv()
+
+# Turns every fast JSON route back into FastAPI's regular response_model handling
+FAST_JSON_ENABLED = os.getenv("FAST_JSON_ENABLED", "true").lower() == "true"
+
+@lru_cache(maxsize=None)
+def serializer(annotation) -> TypeAdapter:
+    # One adapter per response type; building one compiles its pydantic-core schema
+    return TypeAdapter(annotation)
+
+def dump_json(annotation, content: Any, validated: bool = False) -> bytes:
+    # ORM objects are read into the schema once, straight from their attributes, and
+    # encoded by pydantic-core. Content already built from the schema's models is
+    # passed with validated=True and only encoded.
+    adapter = serializer(annotation)
+    if not validated:
+        content = adapter.validate_python(content, from_attributes=True)
+    return adapter.dump_json(content)
+
+class FastJSONResponse(Response):
+    # Body that is already encoded JSON
+    media_type = "application/json"
+
+    def render(self, content: bytes) -> bytes:
+        return content
+
+def fast_json(
+    annotation,
+    content: Any,
+    response: Optional[Response] = None,
+    validated: bool = False,
+    status_code: int = status.HTTP_200_OK
+):
+    # Returned from a route in place of content, with the route's response_model as the
+    # annotation. FastAPI hands a Response back untouched, so the content is not
+    # validated a second time against response_model, turned into dicts and lists, and
+    # re-encoded by json.dumps. Headers set on the route's injected response are carried
+    # over. See benchmarks/bench_serialization.py for what each step costs.
+    if not FAST_JSON_ENABLED:
+        return content
+    fast_response = FastJSONResponse(dump_json(annotation, content, validated=validated), status_code=status_code)
+    if response is not None:
+        fast_response.raw_headers.extend(
+            (name, value) for name, value in response.raw_headers
+            if name not in (b"content-length", b"content-type")
+        )
+    return fast_response
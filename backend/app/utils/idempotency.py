@@ -0,0 +1,239 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, Optional, Type
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from .database import SessionLocal
+from .fast_json import dump_json
+from ..models.idempotency import IdempotencyKey
+
+load_dotenv()
+
+# memory keeps responses in this process only, database shares them between workers
+IDEMPOTENCY_STORE = os.getenv("IDEMPOTENCY_STORE", "memory")
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "100000"))
+IDEMPOTENCY_SWEEP_INTERVAL_SECONDS = float(os.getenv("IDEMPOTENCY_SWEEP_INTERVAL_SECONDS", "60"))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+class StoredResponse:
+    __slots__ = ("fingerprint", "status_code", "body", "expires_at_ts")
+
+    def __init__(self, fingerprint: str, status_code: Optional[int], body: Optional[bytes], expires_at_ts: float):
+        self.fingerprint = fingerprint
+        self.status_code = status_code
+        self.body = body
+        self.expires_at_ts = expires_at_ts
+
+    @property
+    def in_progress(self) -> bool:
+        return self.status_code is None
+
+class InMemoryIdempotencyStore:
+    def __init__(
+        self,
+        ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS,
+        lock_seconds: float = IDEMPOTENCY_LOCK_SECONDS,
+        max_entries: int = IDEMPOTENCY_MAX_ENTRIES
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Insertion ordered, so the oldest entries are evicted first
+        self._entries: "OrderedDict[str, StoredResponse]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at_ts <= time.time():
+            return None
+        return entry
+
+    def begin(self, key: str, fingerprint: str) -> bool:
+        # Reserves the key for the first request; False if another request holds it
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at_ts > now:
+                return False
+            self._entries.pop(key, None)
+            self._entries[key] = StoredResponse(fingerprint, None, None, now + self.lock_seconds)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def complete(self, key: str, status_code: int, body: bytes):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.status_code = status_code
+            entry.body = body
+            entry.expires_at_ts = time.time() + self.ttl_seconds
+
+    def abandon(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def evict_expired(self):
+        now = time.time()
+        with self._lock:
+            expired_keys = [key for key, entry in self._entries.items() if entry.expires_at_ts <= now]
+            for key in expired_keys:
+                del self._entries[key]
+        return len(expired_keys)
+
+class DatabaseIdempotencyStore:
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS,
+        lock_seconds: float = IDEMPOTENCY_LOCK_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        db = self.session_factory()
+        try:
+            row = db.query(IdempotencyKey)\
+                .filter(IdempotencyKey.key == key)\
+                .filter(IdempotencyKey.expires_at > datetime.utcnow())\
+                .first()
+            if row is None:
+                return None
+            return StoredResponse(
+                row.fingerprint,
+                row.status_code,
+                row.response_body.encode() if row.response_body is not None else None,
+                (row.expires_at - datetime(1970, 1, 1)).total_seconds()
+            )
+        finally:
+            db.close()
+
+    def begin(self, key: str, fingerprint: str) -> bool:
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            # An expired record with the same key no longer counts
+            db.query(IdempotencyKey)\
+                .filter(IdempotencyKey.key == key)\
+                .filter(IdempotencyKey.expires_at <= now)\
+                .delete(synchronize_session=False)
+            db.add(IdempotencyKey(
+                key=key,
+                fingerprint=fingerprint,
+                expires_at=now + timedelta(seconds=self.lock_seconds)
+            ))
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+        finally:
+            db.close()
+
+    def complete(self, key: str, status_code: int, body: bytes):
+        db = self.session_factory()
+        try:
+            db.query(IdempotencyKey)\
+                .filter(IdempotencyKey.key == key)\
+                .update({
+                    IdempotencyKey.status_code: status_code,
+                    IdempotencyKey.response_body: body.decode(),
+                    IdempotencyKey.expires_at: datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                }, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def abandon(self, key: str):
+        db = self.session_factory()
+        try:
+            db.query(IdempotencyKey)\
+                .filter(IdempotencyKey.key == key)\
+                .delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def evict_expired(self):
+        db = self.session_factory()
+        try:
+            deleted = db.query(IdempotencyKey)\
+                .filter(IdempotencyKey.expires_at <= datetime.utcnow())\
+                .delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+def create_idempotency_store(backend: str = IDEMPOTENCY_STORE):
+    if backend == "database":
+        return DatabaseIdempotencyStore()
+    return InMemoryIdempotencyStore()
+
+idempotency_store = create_idempotency_store()
+
+def run_idempotent(
+    idempotency_key: Optional[str],
+    scope: str,
+    payload: BaseModel,
+    response_model: Type[BaseModel],
+    handler: Callable
+):
+    # Without a key the request is handled as usual
+    if not idempotency_key:
+        return handler()
+
+    if len(idempotency_key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Idempotency-Key is too long"
+        )
+
+    # Keys are scoped per user and endpoint so clients cannot replay each other's responses
+    store_key = f"{scope}:{idempotency_key}"
+    fingerprint = hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+    stored = idempotency_store.get(store_key)
+    if stored is None and idempotency_store.begin(store_key, fingerprint):
+        try:
+            result = handler()
+        except Exception:
+            # Failed requests are not stored, so the client can retry them
+            idempotency_store.abandon(store_key)
+            raise
+
+        body = dump_json(response_model, result)
+        idempotency_store.complete(store_key, status.HTTP_200_OK, body)
+        return Response(content=body, media_type="application/json")
+
+    # Another request with this key got there first
+    stored = stored or idempotency_store.get(store_key)
+    if stored is None or stored.in_progress:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed"
+        )
+    if stored.fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request body"
+        )
+
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"}
+    )
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
 from ..models.user import User
+# Run standalone, so every model must be imported before the mappers are configured
+from ..models import movie, showtime, ticket, support, idempotency  # noqa: F401
 from ..utils.security import get_password_hash
-from ..utils.database import SessionLocal, engine, Base
+from ..utils.database import SessionLocal
 from ..utils.logger import logger
 from .sample_data import create_sample_data
 
@@ -22,4 +22,21 @@ def setup_logger():
     
     return logging.getLogger(__name__)
 
+# Slow statements go to their own file, not the application log
+def setup_slow_query_logger():
+    log_dir = "logs"
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+    
+    log_file = f"{log_dir}/slow_queries_{datetime.now().strftime('%Y-%m-%d')}.log"
+    handler = logging.FileHandler(log_file)
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+    
+    slow_query_logger = logging.getLogger("app.slow_queries")
+    slow_query_logger.setLevel(logging.WARNING)
+    slow_query_logger.addHandler(handler)
+    slow_query_logger.propagate = False
+    return slow_query_logger
+
 logger = setup_logger()
+slow_query_logger = setup_slow_query_logger()
@@ -0,0 +1,109 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from fastapi import HTTPException, Response, status
+from sqlalchemy import BigInteger, tuple_
+
+# Response header carrying the cursor of the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Largest values the database accepts for INTEGER and BIGINT key columns
+MAX_INTEGER = 2 ** 31 - 1
+MAX_BIG_INTEGER = 2 ** 63 - 1
+
+class Page:
+    __slots__ = ("items", "next_cursor")
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str]):
+        self.items = items
+        self.next_cursor = next_cursor
+
+def invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise invalid_cursor()
+    return values
+
+def is_integer(value: Any, maximum: int) -> bool:
+    # bool is an int to Python but not to the database
+    return isinstance(value, int) and not isinstance(value, bool) and -maximum - 1 <= value <= maximum
+
+def key_value(value: Any, column) -> Any:
+    # Cursors come back from clients, so each value must fit its key column before it
+    # reaches the WHERE clause; otherwise the database rejects it with a 500
+    python_type = column.type.python_type
+    if python_type is int:
+        if is_integer(value, MAX_BIG_INTEGER if isinstance(column.type, BigInteger) else MAX_INTEGER):
+            return value
+    elif python_type is datetime:
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                pass
+    elif python_type is str:
+        if isinstance(value, str):
+            return value
+    raise invalid_cursor()
+
+def decode_key_cursor(cursor: str, columns) -> List[Any]:
+    values = decode_cursor(cursor, len(columns))
+    return [key_value(value, column) for value, column in zip(values, columns)]
+
+def keyset_paginate(query, columns, limit: int, cursor: Optional[str] = None, skip: int = 0, descending: bool = False):
+    # Orders on the (indexed, unique together) key columns and seeks past the cursor, so
+    # every page costs the same. Without a cursor the old skip/limit offset still applies.
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+
+    if cursor:
+        values = decode_key_cursor(cursor, columns)
+        key = tuple_(*columns) if len(columns) > 1 else columns[0]
+        bound = tuple_(*values) if len(columns) > 1 else values[0]
+        query = query.where(key < bound if descending else key > bound)
+    elif skip:
+        query = query.offset(skip)
+
+    # One extra row tells whether there is a next page
+    return query.limit(limit + 1)
+
+def to_page(rows: Sequence[Any], columns, limit: int) -> Page:
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return Page(items, None)
+    last = items[-1]
+    return Page(items, encode_cursor([getattr(last, column.key) for column in columns]))
+
+def set_next_cursor(response: Response, page: Page) -> List[Any]:
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
+
+def offset_from_cursor(cursor: Optional[str], skip: int = 0) -> int:
+    # Ranked results have no stable key to seek on, so their cursor is the next offset
+    if not cursor:
+        return skip
+    offset = decode_cursor(cursor, 1)[0]
+    if not is_integer(offset, MAX_BIG_INTEGER) or offset < 0:
+        raise invalid_cursor()
+    return offset
+
+def to_offset_page(rows: Sequence[Any], offset: int, limit: int) -> Page:
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return Page(items, None)
+    return Page(items, encode_cursor([offset + limit]))
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+from dotenv import load_dotenv
+from passlib.context import CryptContext
+
+load_dotenv()
+
+# bcrypt cost factor; hashes made with another cost are re-hashed on the next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# bcrypt releases the GIL, so threads hash in parallel; one per core is enough
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+# Hashes allowed to wait for a worker before new ones are refused
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "32"))
+PASSWORD_HASH_RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "2"))
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+class PasswordHasherBusy(Exception):
+    pass
+
+class HasherMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_hash_seconds = 0.0
+        self.max_hash_seconds = 0.0
+
+    def record_start(self, wait_seconds: float):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.total_wait_seconds += wait_seconds
+
+    def record_done(self, hash_seconds: float):
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+            self.total_hash_seconds += hash_seconds
+            if hash_seconds > self.max_hash_seconds:
+                self.max_hash_seconds = hash_seconds
+
+    def record_queued(self):
+        with self._lock:
+            self.queued += 1
+
+    def record_rejected(self):
+        with self._lock:
+            self.rejected += 1
+
+class PasswordHasher:
+    # bcrypt runs on its own small pool so a login storm cannot take over the threads
+    # that serve every other sync endpoint. Work beyond the queue limit fails at once.
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, max_queue: int = PASSWORD_HASH_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.metrics = HasherMetrics()
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def submit(self, function: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            self.metrics.record_rejected()
+            raise PasswordHasherBusy()
+        self.metrics.record_queued()
+        enqueued = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            self.metrics.record_start(started - enqueued)
+            try:
+                return function(*args)
+            finally:
+                self.metrics.record_done(time.perf_counter() - started)
+                self._slots.release()
+
+        try:
+            return self._get_executor().submit(run)
+        except RuntimeError:
+            # Executor shut down
+            self._slots.release()
+            raise
+
+    def hash(self, password: str) -> str:
+        return self.submit(pwd_context.hash, password).result()
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self.submit(pwd_context.verify, password, hashed_password).result()
+
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        # (valid, new hash) where the new hash is set when the stored one uses another cost
+        return self.submit(pwd_context.verify_and_update, password, hashed_password).result()
+
+    async def verify_and_update_async(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        # Awaits the hash without holding a threadpool thread
+        return await asyncio.wrap_future(self.submit(pwd_context.verify_and_update, password, hashed_password))
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self):
+        metrics = self.metrics
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "bcrypt_rounds": BCRYPT_ROUNDS,
+            "queued": metrics.queued,
+            "running": metrics.running,
+            "completed": metrics.completed,
+            "rejected": metrics.rejected,
+            "avg_wait_ms": round(metrics.total_wait_seconds * 1000 / metrics.completed, 3) if metrics.completed else 0.0,
+            "avg_hash_ms": round(metrics.total_hash_seconds * 1000 / metrics.completed, 3) if metrics.completed else 0.0,
+            "max_hash_ms": round(metrics.max_hash_seconds * 1000, 3),
+        }
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use so that CLI scripts importing this module start no threads
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+            return self._executor
+
+password_hasher = PasswordHasher()
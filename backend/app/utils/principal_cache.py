@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from dotenv import load_dotenv
+from sqlalchemy import func
+from ..models.user import User
+from .database import SessionLocal
+
+load_dotenv()
+
+# Admin changes invalidate the worker that made them at once and every other worker on
+# its next poll of users.updated_at; the TTL only bounds how stale an entry can get if
+# polling fails
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30"))
+PRINCIPAL_CHANGE_POLL_SECONDS = float(os.getenv("PRINCIPAL_CHANGE_POLL_SECONDS", "1"))
+# Rows are re-read this far behind the newest updated_at seen, since a transaction can
+# commit after one that stamped a later time
+PRINCIPAL_CHANGE_OVERLAP_SECONDS = 10
+# Authenticated users kept per worker; 0 turns the cache off
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+class Principal:
+    # What requests need to know about the authenticated user, detached from any session.
+    # Carries the fields of schemas.user.User, but never the password hash.
+    __slots__ = (
+        "id", "email", "username", "full_name", "phone_number",
+        "is_active", "is_admin", "created_at", "updated_at", "expires_at"
+    )
+
+    def __init__(
+        self,
+        id: int,
+        email: str,
+        username: str,
+        full_name: Optional[str],
+        phone_number: Optional[str],
+        is_active: bool,
+        is_admin: bool,
+        created_at: datetime,
+        updated_at: Optional[datetime],
+        expires_at: float
+    ):
+        set_attribute = object.__setattr__
+        set_attribute(self, "id", id)
+        set_attribute(self, "email", email)
+        set_attribute(self, "username", username)
+        set_attribute(self, "full_name", full_name)
+        set_attribute(self, "phone_number", phone_number)
+        set_attribute(self, "is_active", is_active)
+        set_attribute(self, "is_admin", is_admin)
+        set_attribute(self, "created_at", created_at)
+        set_attribute(self, "updated_at", updated_at)
+        set_attribute(self, "expires_at", expires_at)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Principal is immutable")
+
+class PrincipalCache:
+    def __init__(self, ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._principals: "OrderedDict[int, Principal]" = OrderedDict()
+        # Bumped on every invalidation so a lookup that raced with an admin change is not cached
+        self._generations: Dict[int, int] = {}
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        with self._lock:
+            principal = self._principals.get(user_id)
+            if principal is None:
+                return None
+            if principal.expires_at <= time.monotonic():
+                del self._principals[user_id]
+                return None
+            self._principals.move_to_end(user_id)
+            return principal
+
+    def generation(self, user_id: int) -> int:
+        return self._generations.get(user_id, 0)
+
+    def install(self, user, generation: int) -> Principal:
+        # Snapshot of a users row; only active users are kept
+        principal = Principal(
+            user.id,
+            user.email,
+            user.username,
+            user.full_name,
+            user.phone_number,
+            user.is_active,
+            user.is_admin,
+            user.created_at,
+            user.updated_at,
+            time.monotonic() + self.ttl_seconds
+        )
+        if not self.max_entries or not principal.is_active:
+            return principal
+        with self._lock:
+            if self._generations.get(user.id, 0) == generation:
+                self._principals[user.id] = principal
+                self._principals.move_to_end(user.id)
+                while len(self._principals) > self.max_entries:
+                    self._principals.popitem(last=False)
+        return principal
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._principals.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._principals.clear()
+            self._generations.clear()
+
+class UserChangePoller:
+    # Invalidates cached users whose row changed, whichever worker changed it.
+    # Each poll is one range scan of the users.updated_at index; users changed within
+    # the overlap window are invalidated again on every poll until they fall out of it.
+    def __init__(
+        self,
+        cache: PrincipalCache,
+        session_factory=SessionLocal,
+        overlap_seconds: float = PRINCIPAL_CHANGE_OVERLAP_SECONDS
+    ):
+        self.cache = cache
+        self.session_factory = session_factory
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self._started = False
+        self._watermark: Optional[datetime] = None
+
+    def poll(self) -> int:
+        db = self.session_factory()
+        try:
+            if not self._started:
+                # Nothing is cached before the first poll, so older changes do not matter
+                self._watermark = db.query(func.max(User.updated_at)).scalar()
+                self._started = True
+                return 0
+            query = db.query(User.id, User.updated_at).filter(User.updated_at.isnot(None))
+            if self._watermark is not None:
+                query = query.filter(User.updated_at >= self._watermark - self.overlap)
+            changes = query.all()
+        finally:
+            db.close()
+
+        for user_id, updated_at in changes:
+            self.cache.invalidate(user_id)
+            if self._watermark is None or updated_at > self._watermark:
+                self._watermark = updated_at
+        return len(changes)
+
+principal_cache = PrincipalCache()
+user_change_poller = UserChangePoller(principal_cache)
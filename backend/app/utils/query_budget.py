@@ -0,0 +1,44 @@
+import contextlib
+from typing import List
+from sqlalchemy import event
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+@contextlib.contextmanager
+def count_queries(*engines):
+    # Counts every statement the engines execute inside the block; async engines
+    # are counted through their sync_engine.
+    if not engines:
+        from .database import engine
+        from .async_database import get_async_engine
+        engines = (engine, get_async_engine())
+
+    counter = QueryCounter()
+    sync_engines = [getattr(bound_engine, "sync_engine", bound_engine) for bound_engine in engines]
+    for sync_engine in sync_engines:
+        event.listen(sync_engine, "before_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        for sync_engine in sync_engines:
+            event.remove(sync_engine, "before_cursor_execute", counter._record)
+
+@contextlib.contextmanager
+def assert_query_budget(max_queries: int, *engines):
+    # For tests: fails when the block runs more statements than the budget, e.g.
+    #     with assert_query_budget(4):
+    #         client.get("/tickets/bookings/?limit=100", headers=headers)
+    with count_queries(*engines) as counter:
+        yield counter
+    if counter.count > max_queries:
+        statements = "\n".join(f"  {statement}" for statement in counter.statements)
+        raise AssertionError(f"Expected at most {max_queries} queries, ran {counter.count}:\n{statements}")
@@ -0,0 +1,165 @@
+import itertools
+import os
+import threading
+import time
+from typing import List, Optional
+from dotenv import load_dotenv
+from fastapi import Request, Response
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from .database import SessionLocal, engine_options, raise_if_pool_saturated
+from .async_database import AsyncSessionLocal, get_async_engine, to_async_url, async_engine_options
+from .logger import logger
+
+load_dotenv()
+
+# Comma-separated replicas that serve read-only endpoints; empty sends every read to the primary
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+READ_REPLICA_HEALTH_CHECK_SECONDS = float(os.getenv("READ_REPLICA_HEALTH_CHECK_SECONDS", "5"))
+# After a successful write the client reads from the primary for this long, so it sees
+# its own booking even while the replicas catch up
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_COOKIE = "read_primary_until"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = url
+        self.engine = create_engine(url, **engine_options(url))
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine, info={"replica": True})
+        self.healthy = True
+        self.failures = 0
+        self._async_engine = None
+        self._async_session_factory = None
+
+    @property
+    def name(self) -> str:
+        # Without credentials, for logs and the health endpoint
+        return self.engine.url.render_as_string(hide_password=True)
+
+    @property
+    def async_session_factory(self):
+        # Created on first use, like the primary async engine
+        if self._async_session_factory is None:
+            async_url = to_async_url(self.url)
+            self._async_engine = create_async_engine(async_url, **async_engine_options(async_url))
+            self._async_session_factory = async_sessionmaker(
+                bind=self._async_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+                info={"replica": True}
+            )
+        return self._async_session_factory
+
+    async def dispose_async(self):
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+
+class ReplicaRouter:
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def choose(self) -> Optional[Replica]:
+        # Round-robin over the replicas that passed their last health check
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        with self._lock:
+            turn = next(self._counter)
+        return healthy[turn % len(healthy)]
+
+    def mark_unhealthy(self, replica: Replica, error: Exception):
+        if replica.healthy:
+            logger.warning(f"Read replica {replica.name} taken out of rotation: {error}")
+        replica.healthy = False
+        replica.failures += 1
+
+    def check_health(self):
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+            except SQLAlchemyError as e:
+                self.mark_unhealthy(replica, e)
+            else:
+                if not replica.healthy:
+                    logger.info(f"Read replica {replica.name} back in rotation")
+                replica.healthy = True
+
+    async def dispose_async(self):
+        for replica in self.replicas:
+            await replica.dispose_async()
+
+    def stats(self):
+        return [
+            {"replica": replica.name, "healthy": replica.healthy, "failures": replica.failures}
+            for replica in self.replicas
+        ]
+
+replica_router = ReplicaRouter(DATABASE_REPLICA_URLS)
+
+def is_replica_session(db) -> bool:
+    return db.info.get("replica", False)
+
+def reads_from_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+def choose_replica(request: Request) -> Optional[Replica]:
+    if reads_from_primary(request):
+        return None
+    return replica_router.choose()
+
+def set_read_your_writes_cookie(request: Request, response: Response):
+    # Only writes that went through are worth reading back
+    if not replica_router.replicas or request.method in SAFE_METHODS or response.status_code >= 400:
+        return
+    response.set_cookie(
+        READ_YOUR_WRITES_COOKIE,
+        str(time.time() + READ_YOUR_WRITES_SECONDS),
+        max_age=READ_YOUR_WRITES_SECONDS,
+        httponly=True,
+        samesite="lax"
+    )
+
+# Dependency for read-only endpoints: a replica session, or the primary when no replica is
+# healthy or the client has just written. Booking and payment paths keep using get_db.
+def get_read_db(request: Request):
+    replica = choose_replica(request)
+    if replica is None:
+        raise_if_pool_saturated()
+        db = SessionLocal()
+    else:
+        db = replica.session_factory()
+    try:
+        yield db
+    except OperationalError as e:
+        # An unreachable replica stays out of rotation until the next health check passes
+        if replica is not None:
+            replica_router.mark_unhealthy(replica, e)
+        raise
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    replica = choose_replica(request)
+    if replica is None:
+        get_async_engine()
+        session_factory = AsyncSessionLocal
+    else:
+        session_factory = replica.async_session_factory
+    async with session_factory() as db:
+        try:
+            yield db
+        except OperationalError as e:
+            if replica is not None:
+                replica_router.mark_unhealthy(replica, e)
+            raise
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+from dotenv import load_dotenv
+from fastapi import Response
+from .conditional_requests import REVALIDATE_CACHE_CONTROL
+
+load_dotenv()
+
+# Catalog responses kept in memory per worker; 0 turns the cache off
+CATALOG_CACHE_MAX_ENTRIES = int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", "1000"))
+# Writes invalidate this worker at once; other workers catch up within the TTL
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "60"))
+
+class CachedResponse:
+    __slots__ = ("body", "headers", "etag", "tags", "expires_at")
+
+    def __init__(self, body: bytes, headers: Dict[str, str], etag: Optional[str], tags: Tuple[str, ...], expires_at: float):
+        self.body = body
+        self.headers = headers
+        self.etag = etag
+        self.tags = tags
+        self.expires_at = expires_at
+
+    def to_response(self) -> Response:
+        # A fresh Response per request, since middleware may add headers to it
+        headers = dict(self.headers)
+        if self.etag:
+            headers["ETag"] = self.etag
+            headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+class ResponseCache:
+    # LRU of serialized response bodies. Every entry carries tags naming the data it was
+    # built from, and a write invalidates exactly the entries holding its tags.
+    def __init__(self, max_entries: int = CATALOG_CACHE_MAX_ENTRIES, ttl_seconds: float = CATALOG_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[Hashable]] = {}
+        self._invalidated_at: Dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        if not self.max_entries:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._discard(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(
+        self,
+        key: Hashable,
+        body: bytes,
+        tags: Iterable[str],
+        started_at: float,
+        headers: Optional[Dict[str, str]] = None,
+        etag: Optional[str] = None,
+        settle_seconds: float = 0.0
+    ) -> CachedResponse:
+        # started_at is the time.monotonic() at which the data was read. A response read
+        # before a write to one of its tags (or within settle_seconds after it, for reads
+        # from a lagging replica) is returned but not kept.
+        entry = CachedResponse(body, headers or {}, etag, tuple(tags), time.monotonic() + self.ttl_seconds)
+        if not self.max_entries:
+            return entry
+        with self._lock:
+            for tag in entry.tags:
+                invalidated_at = self._invalidated_at.get(tag)
+                if invalidated_at is not None and invalidated_at >= started_at - settle_seconds:
+                    return entry
+
+            self._discard(key)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return entry
+
+    def invalidate(self, *tags: str):
+        now = time.monotonic()
+        with self._lock:
+            for tag in tags:
+                self._invalidated_at[tag] = now
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._invalidated_at.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _discard(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+
+catalog_cache = ResponseCache()
@@ -1,9 +1,13 @@
 from datetime import datetime, timedelta
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from ..models.movie import Movie, Genre, MovieGenre
 from ..models.showtime import Theater, Seat, Showtime
 from ..utils.database import SessionLocal
 from ..utils.logger import logger
+from ..utils.bulk_insert import bulk_insert
+from ..utils.theater_layout import theater_layout_cache
+from ..repositories.movie_repository import refresh_search_documents
 
 def create_sample_genres(db: Session):
     genres = [
@@ -12,23 +16,23 @@ def create_sample_genres(db: Session):
         "Romance", "Science Fiction", "Thriller"
     ]
     
-    for genre_name in genres:
-        # Check if genre already exists
-        existing_genre = db.query(Genre).filter(Genre.name == genre_name).first()
-        if not existing_genre:
-            genre = Genre(name=genre_name)
-            db.add(genre)
-            logger.info(f"Created genre: {genre_name}")
+    # One query for the genres that already exist
+    existing_genres = set(db.scalars(select(Genre.name).where(Genre.name.in_(genres))))
+    missing_genres = [genre_name for genre_name in genres if genre_name not in existing_genres]
+    if missing_genres:
+        bulk_insert(db, Genre, ("name",), [(genre_name,) for genre_name in missing_genres])
+        logger.info(f"Created {len(missing_genres)} genres")
     
     db.commit()
 
 def create_sample_movies(db: Session):
     # Get genres
-    action_genre = db.query(Genre).filter(Genre.name == "Action").first()
-    adventure_genre = db.query(Genre).filter(Genre.name == "Adventure").first()
-    scifi_genre = db.query(Genre).filter(Genre.name == "Science Fiction").first()
-    comedy_genre = db.query(Genre).filter(Genre.name == "Comedy").first()
-    drama_genre = db.query(Genre).filter(Genre.name == "Drama").first()
+    genres_by_name = {genre.name: genre for genre in db.query(Genre).all()}
+    action_genre = genres_by_name.get("Action")
+    adventure_genre = genres_by_name.get("Adventure")
+    scifi_genre = genres_by_name.get("Science Fiction")
+    comedy_genre = genres_by_name.get("Comedy")
+    drama_genre = genres_by_name.get("Drama")
     
     # Sample movies
     movies = [
@@ -84,10 +88,9 @@ def create_sample_movies(db: Session):
         }
     ]
     
+    existing_titles = set(db.scalars(select(Movie.title).where(Movie.title.in_([movie_data["title"] for movie_data in movies]))))
     for movie_data in movies:
-        # Check if movie already exists
-        existing_movie = db.query(Movie).filter(Movie.title == movie_data["title"]).first()
-        if not existing_movie:
+        if movie_data["title"] not in existing_titles:
             # Create movie
             genres = movie_data.pop("genres")
             movie = Movie(**movie_data)
@@ -102,6 +105,7 @@ def create_sample_movies(db: Session):
             logger.info(f"Created movie: {movie_data['title']}")
     
     db.commit()
+    refresh_search_documents(db)
 
 def create_sample_theaters(db: Session):
     theaters = [
@@ -110,27 +114,29 @@ def create_sample_theaters(db: Session):
         {"name": "IMAX Experience", "capacity": 200}
     ]
     
-    for theater_data in theaters:
-        # Check if theater already exists
-        existing_theater = db.query(Theater).filter(Theater.name == theater_data["name"]).first()
-        if not existing_theater:
-            theater = Theater(**theater_data)
-            db.add(theater)
-            logger.info(f"Created theater: {theater_data['name']}")
+    existing_theaters = set(db.scalars(select(Theater.name)))
+    missing_theaters = [theater_data for theater_data in theaters if theater_data["name"] not in existing_theaters]
+    if missing_theaters:
+        bulk_insert(
+            db,
+            Theater,
+            ("name", "capacity"),
+            [(theater_data["name"], theater_data["capacity"]) for theater_data in missing_theaters]
+        )
+        logger.info(f"Created {len(missing_theaters)} theaters")
     
     db.commit()
     
-    # Create seats for each theater
-    theaters = db.query(Theater).all()
-    for theater in theaters:
-        # Check if seats already exist for this theater
-        existing_seats = db.query(Seat).filter(Seat.theater_id == theater.id).count()
-        if existing_seats == 0:
-            create_seats_for_theater(db, theater)
+    # Seats for every theater that has none yet, in one insert
+    theaters_with_seats = select(Seat.theater_id).distinct()
+    theaters = db.query(Theater).filter(Theater.id.not_in(theaters_with_seats)).all()
+    if theaters:
+        create_seats_for_theaters(db, theaters)
 
-def create_seats_for_theater(db: Session, theater):
+def seat_rows_for_theater(theater_id: int, capacity: int):
+    # (theater_id, row, number, seat_type) for a theater's standard ten-row layout
     rows = ["A", "B", "C", "D", "E", "F", "G", "H", "I", "J"]
-    seats_per_row = theater.capacity // len(rows)
+    seats_per_row = capacity // len(rows)
     
     for row in rows:
         for seat_num in range(1, seats_per_row + 1):
@@ -148,16 +154,36 @@ def create_seats_for_theater(db: Session, theater):
             if (row == "J" and seat_num in [1, 2, seats_per_row - 1, seats_per_row]):
                 seat_type = "accessible"
             
-            seat = Seat(
-                theater_id=theater.id,
-                row=row,
-                number=seat_num,
-                seat_type=seat_type
-            )
-            db.add(seat)
-    
+            yield (theater_id, row, seat_num, seat_type)
+
+SEAT_COLUMNS = ("theater_id", "row", "number", "seat_type")
+
+def create_seats_for_theaters(db: Session, theaters):
+    seat_count = bulk_insert(
+        db,
+        Seat,
+        SEAT_COLUMNS,
+        (seat_row for theater in theaters for seat_row in seat_rows_for_theater(theater.id, theater.capacity))
+    )
     db.commit()
-    logger.info(f"Created seats for theater: {theater.name}")
+    for theater in theaters:
+        theater_layout_cache.invalidate(theater.id)
+    logger.info(f"Created {seat_count} seats for {len(theaters)} theaters")
+
+def showtime_price(theater_name: str, start_time: datetime) -> float:
+    # Set price based on theater and time
+    base_price = 10.99
+    if theater_name == "VIP Theater":
+        base_price = 15.99
+    elif theater_name == "IMAX Experience":
+        base_price = 13.99
+    
+    # Evening shows cost more
+    if start_time.hour >= 18:
+        base_price += 2.00
+    return base_price
+
+SHOWTIME_COLUMNS = ("movie_id", "theater_id", "start_time", "end_time", "price", "is_active")
 
 def create_sample_showtimes(db: Session):
     # Get movies that are already released
@@ -169,53 +195,42 @@ def create_sample_showtimes(db: Session):
         logger.warning("No movies or theaters found for creating showtimes")
         return
     
-    # Create showtimes for the next 7 days
+    # Morning, afternoon, evening showtimes for the next 7 days
+    start_times = []
     for day in range(7):
-        show_date = current_date + timedelta(days=day)
-        
-        # Morning, afternoon, evening showtimes
-        show_times = [
+        # Whole seconds, so a rerun finds the showtimes it created before
+        show_date = (current_date + timedelta(days=day)).replace(microsecond=0)
+        start_times.extend([
             show_date.replace(hour=10, minute=0, second=0),  # 10:00 AM
             show_date.replace(hour=14, minute=30, second=0),  # 2:30 PM
             show_date.replace(hour=18, minute=0, second=0),   # 6:00 PM
             show_date.replace(hour=21, minute=30, second=0)   # 9:30 PM
-        ]
-        
-        for movie in movies:
-            for theater in theaters:
-                for start_time in show_times:
-                    # Check if showtime already exists
-                    existing_showtime = db.query(Showtime).filter(
-                        Showtime.movie_id == movie.id,
-                        Showtime.theater_id == theater.id,
-                        Showtime.start_time == start_time
-                    ).first()
-                    
-                    if not existing_showtime:
-                        # Calculate end time based on movie duration
-                        end_time = start_time + timedelta(minutes=movie.duration_minutes)
-                        
-                        # Set price based on theater and time
-                        base_price = 10.99
-                        if theater.name == "VIP Theater":
-                            base_price = 15.99
-                        elif theater.name == "IMAX Experience":
-                            base_price = 13.99
-                        
-                        # Evening shows cost more
-                        if start_time.hour >= 18:
-                            base_price += 2.00
-                        
-                        showtime = Showtime(
-                            movie_id=movie.id,
-                            theater_id=theater.id,
-                            start_time=start_time,
-                            end_time=end_time,
-                            price=base_price,
-                            is_active=True
-                        )
-                        db.add(showtime)
-                        logger.info(f"Created showtime: {movie.title} at {theater.name} on {start_time}")
+        ])
+    
+    # Showtimes that already exist in the window, fetched in one query
+    existing_showtimes = set(
+        db.query(Showtime.movie_id, Showtime.theater_id, Showtime.start_time)
+            .filter(Showtime.start_time.between(start_times[0], start_times[-1]))
+            .all()
+    )
+    
+    showtime_rows = [
+        (
+            movie.id,
+            theater.id,
+            start_time,
+            start_time + timedelta(minutes=movie.duration_minutes),
+            showtime_price(theater.name, start_time),
+            True
+        )
+        for start_time in start_times
+        for movie in movies
+        for theater in theaters
+        if (movie.id, theater.id, start_time) not in existing_showtimes
+    ]
+    if showtime_rows:
+        bulk_insert(db, Showtime, SHOWTIME_COLUMNS, showtime_rows)
+        logger.info(f"Created {len(showtime_rows)} showtimes")
     
     db.commit()
 
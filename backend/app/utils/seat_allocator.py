@@ -0,0 +1,60 @@
+import os
+from typing import List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Preferred depth of the block, 0 is the front row and 1 the back row
+BEST_AVAILABLE_ROW_DEPTH = float(os.getenv("BEST_AVAILABLE_ROW_DEPTH", "0.6"))
+
+def find_best_block(
+    layout,
+    available_bits: int,
+    party_size: int,
+    seat_type: Optional[str] = None,
+    row_depth: float = BEST_AVAILABLE_ROW_DEPTH
+) -> Optional[List[int]]:
+    # Returns the seat IDs of the most central block of adjacent available seats, if any
+    rows = layout.rows
+    if party_size < 1 or not rows:
+        return None
+    if seat_type is not None:
+        available_bits &= layout.type_masks.get(seat_type, 0)
+
+    ideal_row = (len(rows) - 1) * row_depth
+    best = None
+    for row_index, row in enumerate(rows):
+        width = len(row.positions)
+        if width < party_size:
+            continue
+
+        # Row-local availability: bit j is seat j of the row counted by seat number
+        row_bits = 0
+        for j, position in enumerate(row.positions):
+            if available_bits >> position & 1:
+                row_bits |= 1 << j
+        if not row_bits:
+            continue
+
+        # Sliding window: bit j survives when seats j .. j + party_size - 1 are free and side by side
+        starts = row_bits
+        for offset in range(1, party_size):
+            starts &= row_bits >> offset
+            starts &= row.links >> (offset - 1)
+
+        row_score = abs(row_index - ideal_row) / len(rows)
+        row_center = (width - 1) / 2
+        while starts:
+            lowest = starts & -starts
+            start = lowest.bit_length() - 1
+            starts ^= lowest
+
+            score = row_score + abs(start + (party_size - 1) / 2 - row_center) / width
+            if best is None or score < best[0]:
+                best = (score, row, start)
+
+    if best is None:
+        return None
+
+    _, row, start = best
+    return [layout.seat_ids[position] for position in row.positions[start:start + party_size]]
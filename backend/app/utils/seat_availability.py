@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from dotenv import load_dotenv
+from .theater_layout import TheaterLayout, SeatSnapshot, theater_layout_cache
+
+load_dotenv()
+
+# Entries older than this are rebuilt from the database so that bookings made by
+# other worker processes become visible. 0 keeps entries until invalidated.
+SEAT_INDEX_TTL_SECONDS = float(os.getenv("SEAT_INDEX_TTL_SECONDS", "30"))
+
+# Booking statuses that keep a seat off the market
+ACTIVE_BOOKING_STATUSES = ("pending", "confirmed")
+
+class ShowtimeAvailability:
+    __slots__ = ("showtime_id", "layout", "booked", "loaded_at")
+
+    def __init__(self, showtime_id: int, layout: TheaterLayout, booked: int):
+        self.showtime_id = showtime_id
+        self.layout = layout
+        self.booked = booked
+        self.loaded_at = time.monotonic()
+
+    def available_seats(self) -> List[SeatSnapshot]:
+        booked = self.booked
+        if not booked:
+            return self.layout.snapshots()
+        return self.layout.snapshots(position for position in range(len(self.layout)) if not booked >> position & 1)
+
+    def available_bits(self, held_seat_ids: Iterable[int] = ()) -> int:
+        # Bit i is set when the seat at layout position i can be booked
+        return self.layout.all_seats_mask & ~self.booked & ~self.layout.mask(held_seat_ids)
+
+    def unavailable_seat_ids(self, seat_ids: Iterable[int]) -> List[int]:
+        booked = self.booked
+        positions = self.layout.positions
+        unavailable = []
+        for seat_id in seat_ids:
+            position = positions.get(seat_id)
+            if position is None or booked >> position & 1:
+                unavailable.append(seat_id)
+        return unavailable
+
+class SeatAvailabilityIndex:
+    def __init__(self, ttl_seconds: float = SEAT_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._showtimes: Dict[int, ShowtimeAvailability] = {}
+        # Bumped on every change so a rebuild that raced with a booking is discarded
+        self._generations: Dict[int, int] = {}
+
+    def get(self, showtime_id: int) -> Optional[ShowtimeAvailability]:
+        entry = self._showtimes.get(showtime_id)
+        if entry is None:
+            return None
+        if self.ttl_seconds and time.monotonic() - entry.loaded_at > self.ttl_seconds:
+            return None
+        return entry
+
+    def generation(self, showtime_id: int) -> int:
+        return self._generations.get(showtime_id, 0)
+
+    def install(
+        self,
+        showtime_id: int,
+        layout: TheaterLayout,
+        booked_seat_ids: Iterable[int],
+        generation: int,
+        cache: bool = True
+    ) -> ShowtimeAvailability:
+        entry = ShowtimeAvailability(showtime_id, layout, layout.mask(booked_seat_ids))
+        if not cache:
+            return entry
+        with self._lock:
+            # Only cache the rebuild if no booking changed the showtime meanwhile
+            if self._generations.get(showtime_id, 0) == generation:
+                self._showtimes[showtime_id] = entry
+        return entry
+
+    def mark_booked(self, showtime_id: int, seat_ids: Iterable[int]):
+        self._apply(showtime_id, seat_ids, booked=True)
+
+    def release(self, showtime_id: int, seat_ids: Iterable[int]):
+        self._apply(showtime_id, seat_ids, booked=False)
+
+    def invalidate(self, showtime_id: int):
+        with self._lock:
+            self._generations[showtime_id] = self._generations.get(showtime_id, 0) + 1
+            self._showtimes.pop(showtime_id, None)
+
+    def invalidate_theater(self, theater_id: int):
+        # Showtime bitmaps are positioned by the layout, so they go with it
+        with self._lock:
+            for showtime_id, entry in list(self._showtimes.items()):
+                if entry.layout.theater_id == theater_id:
+                    self._generations[showtime_id] = self._generations.get(showtime_id, 0) + 1
+                    del self._showtimes[showtime_id]
+
+    def clear(self):
+        with self._lock:
+            self._showtimes.clear()
+            self._generations.clear()
+
+    def _apply(self, showtime_id: int, seat_ids: Iterable[int], booked: bool):
+        with self._lock:
+            self._generations[showtime_id] = self._generations.get(showtime_id, 0) + 1
+            entry = self._showtimes.get(showtime_id)
+            if entry is None:
+                return
+
+            mask = 0
+            positions = entry.layout.positions
+            for seat_id in seat_ids:
+                position = positions.get(seat_id)
+                if position is None:
+                    # Unknown seat means the cached layout is stale
+                    del self._showtimes[showtime_id]
+                    return
+                mask |= 1 << position
+
+            if booked:
+                entry.booked |= mask
+            else:
+                entry.booked &= ~mask
+
+seat_availability_index = SeatAvailabilityIndex()
+theater_layout_cache.add_listener(seat_availability_index.invalidate_theater)
@@ -0,0 +1,82 @@
+import asyncio
+import json
+import os
+import threading
+from typing import Dict, Iterable, Set
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SEAT_EVENTS_QUEUE_SIZE = int(os.getenv("SEAT_EVENTS_QUEUE_SIZE", "256"))
+SEAT_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("SEAT_EVENTS_KEEPALIVE_SECONDS", "15"))
+
+# Seat states sent in delta events
+SEAT_HELD = "held"
+SEAT_BOOKED = "booked"
+SEAT_RELEASED = "released"
+
+class SeatEventSubscription:
+    def __init__(self, showtime_id: int, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.showtime_id = showtime_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        # Set when the subscriber fell behind and needs a fresh snapshot
+        self.overflowed = False
+
+    def deliver(self, message: str):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+class SeatEventBroker:
+    def __init__(self, queue_size: int = SEAT_EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[int, Set[SeatEventSubscription]] = {}
+
+    def subscribe(self, showtime_id: int) -> SeatEventSubscription:
+        # Must be called from the event loop that will consume the subscription
+        subscription = SeatEventSubscription(showtime_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(showtime_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: SeatEventSubscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.showtime_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.showtime_id]
+
+    def subscriber_count(self, showtime_id: int) -> int:
+        return len(self._subscriptions.get(showtime_id, ()))
+
+    def publish(self, showtime_id: int, state: str, seat_ids: Iterable[int]):
+        # Safe to call from any thread; the event is encoded once for all viewers
+        subscriptions = self._subscriptions.get(showtime_id)
+        if not subscriptions:
+            return
+
+        seat_ids = sorted(seat_ids)
+        if not seat_ids:
+            return
+        message = json.dumps({
+            "type": "delta",
+            "showtime_id": showtime_id,
+            "state": state,
+            "seat_ids": seat_ids
+        })
+
+        with self._lock:
+            subscriptions = list(subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                # The subscriber's event loop has already shut down
+                self.unsubscribe(subscription)
+
+seat_event_broker = SeatEventBroker()
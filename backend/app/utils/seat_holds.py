@@ -0,0 +1,371 @@
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from dotenv import load_dotenv
+from .logger import logger
+
+load_dotenv()
+
+SEAT_HOLD_TTL_MINUTES = float(os.getenv("SEAT_HOLD_TTL_MINUTES", "10"))
+SEAT_HOLD_SWEEP_INTERVAL_SECONDS = float(os.getenv("SEAT_HOLD_SWEEP_INTERVAL_SECONDS", "1"))
+# memory keeps holds in this process only, database also writes them to seat_holds
+SEAT_HOLD_PERSISTENCE = os.getenv("SEAT_HOLD_PERSISTENCE", "memory")
+# Persisted holds left behind by workers that died are deleted this often
+SEAT_HOLD_PURGE_INTERVAL_SECONDS = float(os.getenv("SEAT_HOLD_PURGE_INTERVAL_SECONDS", "300"))
+
+class HoldEntry:
+    __slots__ = ("hold_id", "showtime_id", "seat_ids", "user_id", "expires_at_ts")
+
+    def __init__(self, hold_id: str, showtime_id: int, seat_ids: Iterable[int], user_id: Optional[int], expires_at_ts: float):
+        self.hold_id = hold_id
+        self.showtime_id = showtime_id
+        self.seat_ids = tuple(seat_ids)
+        self.user_id = user_id
+        self.expires_at_ts = expires_at_ts
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.utcfromtimestamp(self.expires_at_ts)
+
+def hold_from_row(row) -> HoldEntry:
+    return HoldEntry(
+        row.hold_reference,
+        row.showtime_id,
+        [int(seat_id) for seat_id in row.seat_ids.split(",") if seat_id],
+        row.user_id,
+        (row.expires_at - datetime(1970, 1, 1)).total_seconds()
+    )
+
+class HoldPersistence:
+    # Default backend: holds live only in memory and are lost on restart
+    # Shared backends are seen by every worker, so they decide hold conflicts
+    shared = False
+
+    def save(self, hold: HoldEntry) -> bool:
+        # False when the seats are already held elsewhere
+        return True
+
+    def delete(self, hold_ids: List[str]):
+        pass
+
+    def delete_expired(self, now_ts: float) -> int:
+        return 0
+
+    def load(self, hold_id: str, now_ts: float) -> Optional[HoldEntry]:
+        return None
+
+    def load_active(self, now_ts: float) -> List[HoldEntry]:
+        return []
+
+    def active_hold_ids(self, hold_ids: Iterable[str], now_ts: float) -> Set[str]:
+        return set()
+
+    def held_seat_ids(self, showtime_id: int, now_ts: float, exclude_hold_id: Optional[str] = None) -> Set[int]:
+        return set()
+
+class DatabaseHoldPersistence(HoldPersistence):
+    shared = True
+
+    def __init__(self, session_factory=None):
+        from .database import SessionLocal
+        self.session_factory = session_factory or SessionLocal
+
+    def save(self, hold: HoldEntry) -> bool:
+        from ..models.showtime import Showtime
+        from ..models.ticket import SeatHold
+        db = self.session_factory()
+        try:
+            # Locking the showtime row serializes hold checks for it across workers
+            db.query(Showtime.id).filter(Showtime.id == hold.showtime_id).with_for_update().first()
+            if self._held_seat_ids(db, hold.showtime_id, time.time()) & set(hold.seat_ids):
+                db.rollback()
+                return False
+            db.add(SeatHold(
+                hold_reference=hold.hold_id,
+                showtime_id=hold.showtime_id,
+                user_id=hold.user_id,
+                seat_ids=",".join(str(seat_id) for seat_id in hold.seat_ids),
+                expires_at=hold.expires_at
+            ))
+            db.commit()
+            return True
+        finally:
+            db.close()
+
+    def delete(self, hold_ids: List[str]):
+        from ..models.ticket import SeatHold
+        db = self.session_factory()
+        try:
+            db.query(SeatHold)\
+                .filter(SeatHold.hold_reference.in_(hold_ids))\
+                .delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def delete_expired(self, now_ts: float) -> int:
+        # Rows of holds whose worker died before its sweeper could delete them
+        from ..models.ticket import SeatHold
+        db = self.session_factory()
+        try:
+            deleted = db.query(SeatHold)\
+                .filter(SeatHold.expires_at <= datetime.utcfromtimestamp(now_ts))\
+                .delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def load_active(self, now_ts: float) -> List[HoldEntry]:
+        from ..models.ticket import SeatHold
+        db = self.session_factory()
+        try:
+            rows = db.query(SeatHold)\
+                .filter(SeatHold.expires_at > datetime.utcfromtimestamp(now_ts))\
+                .all()
+            return [hold_from_row(row) for row in rows]
+        finally:
+            db.close()
+
+    def load(self, hold_id: str, now_ts: float) -> Optional[HoldEntry]:
+        from ..models.ticket import SeatHold
+        db = self.session_factory()
+        try:
+            row = db.query(SeatHold)\
+                .filter(SeatHold.hold_reference == hold_id)\
+                .filter(SeatHold.expires_at > datetime.utcfromtimestamp(now_ts))\
+                .first()
+            return hold_from_row(row) if row else None
+        finally:
+            db.close()
+
+    def active_hold_ids(self, hold_ids: Iterable[str], now_ts: float) -> Set[str]:
+        from ..models.ticket import SeatHold
+        db = self.session_factory()
+        try:
+            rows = db.query(SeatHold.hold_reference)\
+                .filter(SeatHold.hold_reference.in_(list(hold_ids)))\
+                .filter(SeatHold.expires_at > datetime.utcfromtimestamp(now_ts))\
+                .all()
+            return {row.hold_reference for row in rows}
+        finally:
+            db.close()
+
+    def held_seat_ids(self, showtime_id: int, now_ts: float, exclude_hold_id: Optional[str] = None) -> Set[int]:
+        db = self.session_factory()
+        try:
+            return self._held_seat_ids(db, showtime_id, now_ts, exclude_hold_id)
+        finally:
+            db.close()
+
+    def _held_seat_ids(self, db, showtime_id: int, now_ts: float, exclude_hold_id: Optional[str] = None) -> Set[int]:
+        from ..models.ticket import SeatHold
+        query = db.query(SeatHold.seat_ids)\
+            .filter(SeatHold.showtime_id == showtime_id)\
+            .filter(SeatHold.expires_at > datetime.utcfromtimestamp(now_ts))
+        if exclude_hold_id is not None:
+            query = query.filter(SeatHold.hold_reference != exclude_hold_id)
+        return {int(seat_id) for row in query.all() for seat_id in row.seat_ids.split(",") if seat_id}
+
+class SeatHoldStore:
+    def __init__(self, persistence: Optional[HoldPersistence] = None, tick_seconds: float = 1.0):
+        self.persistence = persistence or HoldPersistence()
+        self.tick_seconds = tick_seconds
+        self._lock = threading.Lock()
+        self._holds: Dict[str, HoldEntry] = {}
+        # showtime_id -> {seat_id: hold_id}
+        self._held_seats: Dict[int, Dict[int, str]] = {}
+        # Timing wheel: expiry tick -> hold ids due in that tick
+        self._wheel: Dict[int, Set[str]] = {}
+        self._last_tick = self._tick(time.time())
+        self._listeners: List[Callable[[str, HoldEntry], None]] = []
+
+    def add_listener(self, listener: Callable[[str, HoldEntry], None]):
+        # Called with ("held" | "released" | "expired", hold) outside the store lock
+        self._listeners.append(listener)
+
+    def create_hold(
+        self,
+        showtime_id: int,
+        seat_ids: Iterable[int],
+        user_id: Optional[int] = None,
+        ttl_seconds: float = SEAT_HOLD_TTL_MINUTES * 60
+    ) -> Optional[HoldEntry]:
+        hold = HoldEntry(str(uuid.uuid4()), showtime_id, seat_ids, user_id, time.time() + ttl_seconds)
+        with self._lock:
+            conflicts = self._conflicting_hold_ids(hold)
+            if not conflicts:
+                self._add(hold)
+
+        if conflicts:
+            if not self.persistence.shared:
+                return None
+            # Holds known here may have been released or booked through another worker
+            if self.persistence.active_hold_ids(conflicts, time.time()):
+                return None
+            with self._lock:
+                for hold_id in conflicts:
+                    self._remove(hold_id)
+                if self._conflicting_hold_ids(hold):
+                    return None
+                self._add(hold)
+
+        # A shared backend also refuses seats held through other workers
+        if not self.persistence.save(hold):
+            with self._lock:
+                self._remove(hold.hold_id)
+            return None
+        self._notify("held", hold)
+        return hold
+
+    def get(self, hold_id: str) -> Optional[HoldEntry]:
+        hold = self._holds.get(hold_id)
+        if hold is None and self.persistence.shared:
+            # Created by another worker
+            hold = self.persistence.load(hold_id, time.time())
+        if hold is None or hold.expires_at_ts <= time.time():
+            return None
+        return hold
+
+    def release(self, hold_id: str, notify: bool = True) -> Optional[HoldEntry]:
+        with self._lock:
+            hold = self._remove(hold_id)
+        if hold is None and self.persistence.shared:
+            hold = self.persistence.load(hold_id, time.time())
+        if hold is None:
+            return None
+
+        self.persistence.delete([hold_id])
+        if notify:
+            self._notify("released", hold)
+        return hold
+
+    def held_seat_ids(self, showtime_id: int, exclude_hold_id: Optional[str] = None) -> Set[int]:
+        held_seats = self._held_seats.get(showtime_id)
+        if not held_seats:
+            return set()
+        return {seat_id for seat_id, hold_id in list(held_seats.items()) if hold_id != exclude_hold_id}
+
+    def conflicting_seat_ids(self, showtime_id: int, exclude_hold_id: Optional[str] = None) -> Set[int]:
+        # Seats a booking may not take. held_seat_ids only knows this worker's holds and is
+        # kept for seat maps; a shared backend answers for every worker.
+        if self.persistence.shared:
+            return self.persistence.held_seat_ids(showtime_id, time.time(), exclude_hold_id)
+        return self.held_seat_ids(showtime_id, exclude_hold_id)
+
+    def expire_due(self, now: Optional[float] = None) -> List[HoldEntry]:
+        now = time.time() if now is None else now
+        now_tick = self._tick(now)
+        expired = []
+        with self._lock:
+            if now_tick - self._last_tick > len(self._wheel):
+                # Long pause: visit only the occupied slots instead of every tick
+                due_ticks = sorted(tick for tick in self._wheel if tick <= now_tick)
+            else:
+                due_ticks = range(self._last_tick, now_tick + 1)
+            for tick in due_ticks:
+                for hold_id in self._wheel.pop(tick, ()):
+                    hold = self._holds.get(hold_id)
+                    if hold is None:
+                        continue
+                    if hold.expires_at_ts > now:
+                        # Not due until later in this tick
+                        self._wheel.setdefault(tick, set()).add(hold_id)
+                        continue
+                    self._remove(hold_id)
+                    expired.append(hold)
+            self._last_tick = now_tick
+
+        if expired:
+            self.persistence.delete([hold.hold_id for hold in expired])
+            for hold in expired:
+                self._notify("expired", hold)
+        return expired
+
+    def purge_expired(self) -> int:
+        # Expired holds are filtered out of every read; this only keeps the table small
+        return self.persistence.delete_expired(time.time())
+
+    def restore(self):
+        holds = self.persistence.load_active(time.time())
+        with self._lock:
+            for hold in holds:
+                if hold.hold_id not in self._holds:
+                    self._add(hold)
+        return len(holds)
+
+    def _add(self, hold: HoldEntry):
+        self._holds[hold.hold_id] = hold
+        held_seats = self._held_seats.setdefault(hold.showtime_id, {})
+        for seat_id in hold.seat_ids:
+            held_seats[seat_id] = hold.hold_id
+        self._wheel.setdefault(self._tick(hold.expires_at_ts), set()).add(hold.hold_id)
+
+    def _remove(self, hold_id: str) -> Optional[HoldEntry]:
+        hold = self._holds.pop(hold_id, None)
+        if hold is None:
+            return None
+
+        held_seats = self._held_seats.get(hold.showtime_id, {})
+        for seat_id in hold.seat_ids:
+            if held_seats.get(seat_id) == hold_id:
+                del held_seats[seat_id]
+        if not held_seats:
+            self._held_seats.pop(hold.showtime_id, None)
+
+        bucket = self._wheel.get(self._tick(hold.expires_at_ts))
+        if bucket is not None:
+            bucket.discard(hold_id)
+        return hold
+
+    def _conflicting_hold_ids(self, hold: HoldEntry) -> Set[str]:
+        held_seats = self._held_seats.get(hold.showtime_id, {})
+        return {held_seats[seat_id] for seat_id in hold.seat_ids if seat_id in held_seats}
+
+    def _tick(self, timestamp: float) -> int:
+        return int(timestamp // self.tick_seconds)
+
+    def _notify(self, event: str, hold: HoldEntry):
+        for listener in self._listeners:
+            try:
+                listener(event, hold)
+            except Exception as e:
+                logger.error(f"Seat hold listener failed: {e}")
+
+class ExpirySweeper:
+    def __init__(self, name: str, interval_seconds: float, task: Callable[[], object]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.task = task
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval_seconds + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            try:
+                self.task()
+            except Exception as e:
+                logger.error(f"{self.name} failed: {e}")
+
+def create_hold_persistence(backend: str = SEAT_HOLD_PERSISTENCE) -> HoldPersistence:
+    if backend == "database":
+        return DatabaseHoldPersistence()
+    return HoldPersistence()
+
+seat_hold_store = SeatHoldStore(create_hold_persistence())
@@ -0,0 +1,57 @@
+import json
+from itertools import groupby
+from typing import Optional
+from .conditional_requests import bitmap_digest
+
+SEAT_MAP_JSON = "json"
+SEAT_MAP_BITSET = "bitset"
+SEAT_MAP_RLE = "rle"
+
+SEAT_MAP_BITSET_MEDIA_TYPE = "application/vnd.cinema.seatmap.bitset"
+SEAT_MAP_RLE_MEDIA_TYPE = "text/vnd.cinema.seatmap.rle"
+
+MEDIA_TYPE_FORMATS = {
+    SEAT_MAP_BITSET_MEDIA_TYPE: SEAT_MAP_BITSET,
+    SEAT_MAP_RLE_MEDIA_TYPE: SEAT_MAP_RLE,
+}
+
+def negotiate_seat_map_format(format: Optional[str], accept: Optional[str]) -> Optional[str]:
+    # An explicit ?format= wins over the Accept header; None means the format is unknown
+    if format:
+        return format if format in (SEAT_MAP_JSON, SEAT_MAP_BITSET, SEAT_MAP_RLE) else None
+
+    if accept:
+        for media_range in accept.split(","):
+            media_type = media_range.split(";")[0].strip()
+            if media_type in MEDIA_TYPE_FORMATS:
+                return MEDIA_TYPE_FORMATS[media_type]
+    return SEAT_MAP_JSON
+
+def seat_map_etag(seat_map_format: str, layout, available_bits: int) -> str:
+    # From the layout version and the seat states, so it is known before anything is encoded
+    return f'"{seat_map_format}-{layout.theater_id}-{layout.version}-{bitmap_digest(available_bits, len(layout))}"'
+
+def encode_bitset(bits: int, seat_count: int) -> bytes:
+    # Seat at layout position i is bit (i % 8) of byte (i // 8)
+    return bits.to_bytes((seat_count + 7) // 8, "little")
+
+def encode_rle(bits: int, seat_count: int) -> str:
+    # Dot separated run lengths alternating available/unavailable, starting with available,
+    # e.g. "12.3.40" is 12 available, 3 taken, then 40 available seats in layout order
+    if not seat_count:
+        return ""
+    states = format(bits, f"0{seat_count}b")[::-1]
+    runs = [] if states[0] == "1" else ["0"]
+    runs.extend(str(sum(1 for _ in run)) for _, run in groupby(states))
+    return ".".join(runs)
+
+def encode_layout(layout) -> bytes:
+    # Static per-theater part of the seat map, listed in bit position order
+    return json.dumps({
+        "theater_id": layout.theater_id,
+        "version": layout.version,
+        "seats": [
+            [layout.seat_ids[position], layout.row_labels[position], layout.numbers[position], layout.seat_type(position)]
+            for position in range(len(layout))
+        ]
+    }, separators=(",", ":")).encode()
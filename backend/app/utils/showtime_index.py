@@ -0,0 +1,205 @@
+import bisect
+import heapq
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Days older than this are reloaded so that other workers' schedule changes show up
+SHOWTIME_INDEX_TTL_SECONDS = float(os.getenv("SHOWTIME_INDEX_TTL_SECONDS", "60"))
+# Days kept in memory; the least recently read are dropped first
+SHOWTIME_INDEX_MAX_DAYS = int(os.getenv("SHOWTIME_INDEX_MAX_DAYS", "62"))
+
+def local_naive(value: datetime) -> datetime:
+    # Showtimes are stored as naive local times; aware input is converted to match
+    if value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+def days_between(start: datetime, end: datetime) -> Iterator[date]:
+    # Every day a [start, end) range touches
+    day = start.date()
+    last = (end - timedelta(microseconds=1)).date()
+    while day <= last:
+        yield day
+        day += timedelta(days=1)
+
+class ScheduledShowtime:
+    __slots__ = ("id", "movie_id", "theater_id", "start_time", "end_time", "price", "is_active", "created_at")
+
+    def __init__(
+        self,
+        id: int,
+        movie_id: int,
+        theater_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        price: float,
+        is_active: bool,
+        created_at: datetime
+    ):
+        self.id = id
+        self.movie_id = movie_id
+        self.theater_id = theater_id
+        self.start_time = start_time
+        self.end_time = end_time
+        self.price = price
+        self.is_active = is_active
+        self.created_at = created_at
+
+    @property
+    def sort_key(self):
+        return (self.start_time, self.id)
+
+class DaySchedule:
+    # One day's active showtimes, per theater in start time order
+    __slots__ = ("day", "theaters", "loaded_at")
+
+    def __init__(self, day: date, showtimes: Iterable[ScheduledShowtime]):
+        self.day = day
+        self.theaters: Dict[int, List[ScheduledShowtime]] = {}
+        for showtime in showtimes:
+            self.theaters.setdefault(showtime.theater_id, []).append(showtime)
+        for showtimes_of_theater in self.theaters.values():
+            showtimes_of_theater.sort(key=lambda showtime: showtime.sort_key)
+        self.loaded_at = time.monotonic()
+
+    def __iter__(self):
+        return iter(self.showtimes())
+
+    # Theater lists are replaced rather than modified, so readers never see one mid-change
+    def add(self, showtime: ScheduledShowtime):
+        showtimes = list(self.theaters.get(showtime.theater_id, ()))
+        bisect.insort(showtimes, showtime, key=lambda entry: entry.sort_key)
+        self.theaters[showtime.theater_id] = showtimes
+
+    def remove(self, showtime: ScheduledShowtime):
+        showtimes = [entry for entry in self.theaters.get(showtime.theater_id, ()) if entry.id != showtime.id]
+        if showtimes:
+            self.theaters[showtime.theater_id] = showtimes
+        else:
+            self.theaters.pop(showtime.theater_id, None)
+
+    def showtimes(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        theater_id: Optional[int] = None,
+        movie_id: Optional[int] = None
+    ) -> List[ScheduledShowtime]:
+        # Showtimes starting in [start, end), by start time: a bisect per theater, then a merge
+        if theater_id is not None:
+            candidates = [self.theaters.get(theater_id, [])]
+        else:
+            candidates = list(self.theaters.copy().values())
+
+        ranges = []
+        for showtimes in candidates:
+            low = 0 if start is None else bisect.bisect_left(showtimes, start, key=lambda entry: entry.start_time)
+            high = len(showtimes) if end is None else bisect.bisect_left(showtimes, end, key=lambda entry: entry.start_time)
+            if low < high:
+                ranges.append(showtimes[low:high])
+
+        merged = ranges[0] if len(ranges) == 1 else heapq.merge(*ranges, key=lambda entry: entry.sort_key)
+        if movie_id is None:
+            return list(merged)
+        return [showtime for showtime in merged if showtime.movie_id == movie_id]
+
+class ShowtimeIndex:
+    # Active showtimes bucketed by start day and theater, loaded a day at a time and
+    # patched in place when this worker changes a showtime
+    def __init__(self, ttl_seconds: float = SHOWTIME_INDEX_TTL_SECONDS, max_days: int = SHOWTIME_INDEX_MAX_DAYS):
+        self.ttl_seconds = ttl_seconds
+        self.max_days = max_days
+        self._lock = threading.Lock()
+        self._days: "OrderedDict[date, DaySchedule]" = OrderedDict()
+        # Day each indexed showtime is filed under
+        self._days_by_showtime: Dict[int, date] = {}
+        # Bumped on every change so a day load that raced with a write is discarded
+        self._generations: Dict[date, int] = {}
+
+    def get(self, day: date) -> Optional[DaySchedule]:
+        with self._lock:
+            schedule = self._days.get(day)
+            if schedule is None:
+                return None
+            if self.ttl_seconds and time.monotonic() - schedule.loaded_at > self.ttl_seconds:
+                return None
+            self._days.move_to_end(day)
+            return schedule
+
+    def generation(self, day: date) -> int:
+        return self._generations.get(day, 0)
+
+    def install(
+        self,
+        day: date,
+        showtimes: Iterable[ScheduledShowtime],
+        generation: int,
+        cache: bool = True
+    ) -> DaySchedule:
+        schedule = DaySchedule(day, showtimes)
+        if not cache:
+            return schedule
+        with self._lock:
+            # Only cache the load if no showtime of the day changed meanwhile
+            if self._generations.get(day, 0) != generation:
+                return schedule
+            self._drop(day)
+            self._days[day] = schedule
+            for showtime in schedule:
+                self._days_by_showtime[showtime.id] = day
+            while len(self._days) > self.max_days:
+                self._drop(next(iter(self._days)))
+        return schedule
+
+    def upsert(self, showtime: ScheduledShowtime, previous_start: Optional[datetime] = None):
+        # Files the showtime under its (possibly new) day; inactive ones are only removed.
+        # previous_start names the day it moved from, in case that day is being loaded.
+        day = showtime.start_time.date()
+        with self._lock:
+            self._remove(showtime.id)
+            for changed_day in {day, previous_start.date() if previous_start else day}:
+                self._generations[changed_day] = self._generations.get(changed_day, 0) + 1
+            schedule = self._days.get(day)
+            if schedule is not None and showtime.is_active:
+                schedule.add(showtime)
+                self._days_by_showtime[showtime.id] = day
+
+    def remove(self, showtime_id: int):
+        with self._lock:
+            self._remove(showtime_id)
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+            self._days_by_showtime.clear()
+            self._generations.clear()
+
+    def _remove(self, showtime_id: int):
+        day = self._days_by_showtime.pop(showtime_id, None)
+        if day is None:
+            return
+        self._generations[day] = self._generations.get(day, 0) + 1
+        schedule = self._days.get(day)
+        if schedule is None:
+            return
+        for showtime in schedule:
+            if showtime.id == showtime_id:
+                schedule.remove(showtime)
+                return
+
+    def _drop(self, day: date):
+        schedule = self._days.pop(day, None)
+        if schedule is None:
+            return
+        for showtime in schedule:
+            if self._days_by_showtime.get(showtime.id) == day:
+                del self._days_by_showtime[showtime.id]
+
+showtime_index = ShowtimeIndex()
@@ -0,0 +1,165 @@
+import contextvars
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .logger import slow_query_logger
+
+try:
+    import greenlet
+except ImportError:
+    greenlet = None
+
+load_dotenv()
+
+SQL_METRICS_ENABLED = os.getenv("SQL_METRICS_ENABLED", "true").lower() == "true"
+# Statements slower than this are written to the slow query log
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+# Adds a Server-Timing header with each response's database time
+DEBUG = os.getenv("DEBUG", "false").lower() == "true"
+
+# Frames from these packages are where a slow statement was issued from
+CALLER_PACKAGES = ("/app/repositories/", "/app/services/", "/app/utils/")
+SQL_METRICS_FILE = os.path.abspath(__file__)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+IN_LIST_PATTERN = re.compile(r"\bIN \((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+STRING_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_PATTERN = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+def normalize_statement(statement: str) -> str:
+    # One shape per query: literals and IN lists of any length collapse to placeholders
+    statement = WHITESPACE_PATTERN.sub(" ", statement).strip()
+    statement = STRING_LITERAL_PATTERN.sub("?", statement)
+    statement = NUMBER_LITERAL_PATTERN.sub("?", statement)
+    return IN_LIST_PATTERN.sub("IN (...)", statement)
+
+def application_frame(frame) -> Optional[str]:
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename != SQL_METRICS_FILE and any(package in filename for package in CALLER_PACKAGES):
+            return f"{os.path.basename(filename)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+def caller_location() -> str:
+    # Nearest application frame below the engine, e.g. "ticket_repository.py:201 get_seat_availability"
+    location = application_frame(sys._getframe(1))
+    if location is None and greenlet is not None:
+        # The async engine runs the driver in a child greenlet; the awaiting coroutine is in its parent
+        parent = greenlet.getcurrent().parent
+        if parent is not None:
+            location = application_frame(parent.gr_frame)
+    return location or "unknown"
+
+class RequestSqlStats:
+    __slots__ = ("queries", "seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, seconds: float):
+        self.queries += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.queries} queries"'
+
+class RouteSqlStats:
+    __slots__ = ("requests", "queries", "seconds", "max_queries", "max_seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.seconds = 0.0
+        self.max_queries = 0
+        self.max_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def add(self, stats: RequestSqlStats):
+        self.requests += 1
+        self.queries += stats.queries
+        self.seconds += stats.seconds
+        self.max_queries = max(self.max_queries, stats.queries)
+        self.max_seconds = max(self.max_seconds, stats.seconds)
+        if stats.slowest_seconds > self.slowest_seconds:
+            self.slowest_seconds = stats.slowest_seconds
+            # Normalised only here, once per new slowest statement
+            self.slowest_statement = normalize_statement(stats.slowest_statement)
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "avg_queries": round(self.queries / self.requests, 2),
+            "max_queries": self.max_queries,
+            "avg_db_ms": round(self.seconds * 1000 / self.requests, 3),
+            "max_db_ms": round(self.max_seconds * 1000, 3),
+            "slowest_query_ms": round(self.slowest_seconds * 1000, 3),
+            "slowest_query": self.slowest_statement,
+        }
+
+class RouteSqlMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteSqlStats] = {}
+
+    def record(self, method: str, route: str, stats: RequestSqlStats):
+        with self._lock:
+            route_stats = self._routes.get((method, route))
+            if route_stats is None:
+                route_stats = self._routes[(method, route)] = RouteSqlStats()
+            route_stats.add(stats)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                f"{method} {route}": route_stats.as_dict()
+                for (method, route), route_stats in sorted(self._routes.items(), key=lambda item: item[0][1])
+            }
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+route_sql_metrics = RouteSqlMetrics()
+
+# Stats of the request being handled; copied into the threads sync endpoints run in
+current_sql_stats: contextvars.ContextVar[Optional[RequestSqlStats]] = contextvars.ContextVar("current_sql_stats", default=None)
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._sql_metrics_started = time.perf_counter()
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_sql_metrics_started", None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+
+    stats = current_sql_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+    if seconds * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+        slow_query_logger.warning(
+            f"{seconds * 1000:.1f}ms {caller_location()} {normalize_statement(statement)}"
+        )
+
+def install_sql_metrics():
+    # Listens on the Engine class, which covers the primary, async and replica engines alike
+    if not SQL_METRICS_ENABLED or event.contains(Engine, "after_cursor_execute", after_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", after_cursor_execute)
@@ -0,0 +1,289 @@
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from ..models.user import User
+from ..models.movie import Movie, Genre, MovieGenre
+from ..models.showtime import Theater, Seat, Showtime
+from ..models.ticket import Booking, SeatBooking, Payment, BookingStatus, PaymentStatus, PaymentMethod
+# Imported so every mapper is configured when run standalone
+from ..models import support, idempotency  # noqa: F401
+from ..utils.database import SessionLocal
+from ..utils.logger import logger
+from ..utils.security import get_password_hash
+from ..utils.bulk_insert import bulk_insert, next_id, reset_id_sequence
+from ..repositories.movie_repository import refresh_search_documents
+from ..repositories.ticket_repository import SEAT_TYPE_PRICE_MULTIPLIERS
+from .sample_data import create_sample_genres, seat_rows_for_theater, SEAT_COLUMNS, SHOWTIME_COLUMNS
+
+# Every generated user logs in with this password
+SYNTHETIC_USER_PASSWORD = "loadtest123"
+
+THEATER_CAPACITIES = (50, 100, 150, 200, 300)
+MAX_PARTY_SIZE = 6
+# Share of bookings that were cancelled and release their seats
+CANCELLED_SHARE = 0.05
+FIRST_SHOW_HOUR = 10
+LAST_SHOW_HOUR = 23
+MIN_MOVIE_MINUTES = 80
+MAX_MOVIE_MINUTES = 180
+# Gap between the end of one show and the start of the next in the same theater
+CLEANING_MINUTES = 20
+
+TITLE_WORDS = (
+    "Last", "Silent", "Broken", "Golden", "Hidden", "Crimson", "Distant", "Final", "Lost", "Midnight",
+    "Iron", "Wild", "Frozen", "Secret", "Burning", "Shadow", "Electric", "Endless", "Savage", "Quiet",
+    "Horizon", "Empire", "Garden", "Signal", "Harbor", "Machine", "River", "Kingdom", "Echo", "Storm",
+    "Protocol", "Voyage", "Frontier", "Legacy", "Paradox", "Orbit", "Witness", "Heist", "Summer", "Station",
+)
+DESCRIPTION_WORDS = (
+    "a", "the", "young", "detective", "family", "crew", "city", "journey", "secret", "war", "love",
+    "betrayal", "mission", "island", "future", "past", "friends", "rival", "escape", "truth", "danger",
+    "small", "town", "must", "find", "before", "after", "against", "every", "hope", "fight", "discover",
+)
+
+MOVIE_COLUMNS = (
+    "id", "title", "description", "duration_minutes", "release_date", "rating", "is_active", "created_at"
+)
+BOOKING_COLUMNS = (
+    "id", "user_id", "showtime_id", "booking_reference", "status", "total_price", "created_by_support", "created_at"
+)
+SEAT_BOOKING_COLUMNS = ("id", "booking_id", "showtime_id", "seat_id", "price", "is_active")
+PAYMENT_COLUMNS = ("booking_id", "amount", "payment_method", "status", "transaction_id", "created_at")
+
+def generate_users(db: Session, rng: random.Random, run: str, count: int):
+    # Hashing is the slow part of creating users, so they all share one hash
+    hashed_password = get_password_hash(SYNTHETIC_USER_PASSWORD)
+    first_id = next_id(db, User)
+    now = datetime.now()
+    bulk_insert(
+        db,
+        User,
+        ("id", "email", "username", "hashed_password", "full_name", "is_active", "is_admin", "created_at"),
+        (
+            (
+                user_id,
+                f"load_{run}_{user_id}@example.com",
+                f"load_{run}_{user_id}",
+                hashed_password,
+                f"Load Test User {user_id}",
+                True,
+                False,
+                now
+            )
+            for user_id in range(first_id, first_id + count)
+        )
+    )
+    return list(range(first_id, first_id + count))
+
+def generate_movies(db: Session, rng: random.Random, count: int):
+    genre_ids = [genre_id for (genre_id,) in db.query(Genre.id).all()]
+    first_id = next_id(db, Movie)
+    now = datetime.now()
+    movie_rows = []
+    movie_genre_rows = []
+    durations = {}
+    for movie_id in range(first_id, first_id + count):
+        title = " ".join(rng.sample(TITLE_WORDS, rng.randint(2, 3)))
+        description = " ".join(rng.choice(DESCRIPTION_WORDS) for _ in range(rng.randint(12, 30))).capitalize() + "."
+        duration = rng.randint(MIN_MOVIE_MINUTES, MAX_MOVIE_MINUTES)
+        durations[movie_id] = duration
+        movie_rows.append((
+            movie_id,
+            f"{title} {movie_id}",
+            description,
+            duration,
+            now - timedelta(days=rng.randint(1, 365)),
+            round(rng.uniform(4.0, 9.5), 1),
+            True,
+            now
+        ))
+        movie_genre_rows.extend((movie_id, genre_id) for genre_id in rng.sample(genre_ids, rng.randint(1, 3)))
+
+    bulk_insert(db, Movie, MOVIE_COLUMNS, movie_rows)
+    bulk_insert(db, MovieGenre, ("movie_id", "genre_id"), movie_genre_rows)
+    return durations
+
+def generate_theaters(db: Session, rng: random.Random, run: str, count: int):
+    first_theater_id = next_id(db, Theater)
+    first_seat_id = next_id(db, Seat)
+    theater_rows = []
+    seat_rows = []
+    # theater_id -> {seat_id: seat_type, ...}
+    theaters = {}
+    for theater_id in range(first_theater_id, first_theater_id + count):
+        capacity = rng.choice(THEATER_CAPACITIES)
+        theater_rows.append((theater_id, f"Theater {run}-{theater_id}", capacity))
+        seat_types = {}
+        for seat_row in seat_rows_for_theater(theater_id, capacity):
+            seat_id = first_seat_id + len(seat_rows)
+            seat_rows.append((seat_id,) + seat_row)
+            seat_types[seat_id] = seat_row[SEAT_COLUMNS.index("seat_type")]
+        theaters[theater_id] = seat_types
+
+    bulk_insert(db, Theater, ("id", "name", "capacity"), theater_rows)
+    bulk_insert(db, Seat, ("id",) + SEAT_COLUMNS, seat_rows)
+    return theaters
+
+def show_start_times(day: datetime, slots: int, longest_minutes: int = MAX_MOVIE_MINUTES):
+    # Spread the day's slots evenly between the first and the last show, but never closer
+    # than the longest movie plus cleaning, so shows in one theater cannot overlap. Slots
+    # that would start after the last show hour are dropped.
+    window = (LAST_SHOW_HOUR - FIRST_SHOW_HOUR) * 60
+    step = max(window // max(slots, 1), longest_minutes + CLEANING_MINUTES)
+    first_show = day.replace(hour=FIRST_SHOW_HOUR, minute=0, second=0, microsecond=0)
+    return [first_show + timedelta(minutes=step * slot) for slot in range(slots) if step * slot <= window]
+
+def generate_showtimes_and_bookings(
+    db: Session,
+    rng: random.Random,
+    theaters,
+    durations,
+    user_ids,
+    days: int,
+    slots: int,
+    fill_rate: float
+):
+    counts = {"showtimes": 0, "bookings": 0, "seat_bookings": 0, "payments": 0}
+    movie_ids = list(durations)
+    showtime_id = next_id(db, Showtime)
+    booking_id = next_id(db, Booking)
+    seat_booking_id = next_id(db, SeatBooking)
+    today = datetime.now()
+    payment_methods = list(PaymentMethod)
+    longest_minutes = max(durations.values())
+
+    # One day at a time, so memory stays flat however many days are generated
+    for day in range(days):
+        showtime_rows = []
+        booking_rows = []
+        seat_booking_rows = []
+        payment_rows = []
+        for start_time in show_start_times(today + timedelta(days=day), slots, longest_minutes):
+            for theater_id, seat_types in theaters.items():
+                movie_id = rng.choice(movie_ids)
+                price = 10.99 + (2.00 if start_time.hour >= 18 else 0.0)
+                showtime_rows.append((
+                    showtime_id,
+                    movie_id,
+                    theater_id,
+                    start_time,
+                    start_time + timedelta(minutes=durations[movie_id]),
+                    price,
+                    True
+                ))
+
+                # Each show lands somewhere around the target fill rate
+                show_fill = min(max(rng.gauss(fill_rate, 0.15), 0.0), 1.0)
+                booked_seat_ids = rng.sample(list(seat_types), round(len(seat_types) * show_fill))
+                position = 0
+                while position < len(booked_seat_ids):
+                    party = booked_seat_ids[position:position + rng.randint(1, MAX_PARTY_SIZE)]
+                    position += len(party)
+                    cancelled = rng.random() < CANCELLED_SHARE
+                    created_at = start_time - timedelta(hours=rng.uniform(1, 24 * 14))
+                    # Priced per seat type, as the booking path does
+                    seat_prices = [price * SEAT_TYPE_PRICE_MULTIPLIERS.get(seat_types[seat_id], 1) for seat_id in party]
+                    total_price = round(sum(seat_prices), 2)
+                    booking_rows.append((
+                        booking_id,
+                        rng.choice(user_ids),
+                        showtime_id,
+                        uuid.uuid4().hex[:12].upper(),
+                        BookingStatus.CANCELLED if cancelled else BookingStatus.CONFIRMED,
+                        total_price,
+                        False,
+                        created_at
+                    ))
+                    for seat_id, seat_price in zip(party, seat_prices):
+                        seat_booking_rows.append((seat_booking_id, booking_id, showtime_id, seat_id, seat_price, not cancelled))
+                        seat_booking_id += 1
+                    payment_rows.append((
+                        booking_id,
+                        total_price,
+                        rng.choice(payment_methods),
+                        PaymentStatus.REFUNDED if cancelled else PaymentStatus.COMPLETED,
+                        uuid.uuid4().hex,
+                        created_at
+                    ))
+                    booking_id += 1
+                showtime_id += 1
+
+        counts["showtimes"] += bulk_insert(db, Showtime, ("id",) + SHOWTIME_COLUMNS, showtime_rows)
+        counts["bookings"] += bulk_insert(db, Booking, BOOKING_COLUMNS, booking_rows)
+        counts["seat_bookings"] += bulk_insert(db, SeatBooking, SEAT_BOOKING_COLUMNS, seat_booking_rows)
+        counts["payments"] += bulk_insert(db, Payment, PAYMENT_COLUMNS, payment_rows)
+        db.commit()
+        logger.info(f"Generated day {day + 1}/{days}: {counts['seat_bookings']} seat bookings so far")
+    return counts
+
+def generate_synthetic_chain(
+    db: Session,
+    theaters: int,
+    movies: int,
+    days: int,
+    fill_rate: float,
+    slots: int = 5,
+    users: int = 1000,
+    seed: int = None
+):
+    # Meant for an otherwise idle database: rows are written with explicit IDs
+    rng = random.Random(seed)
+    run = uuid.uuid4().hex[:6]
+    started = time.perf_counter()
+
+    create_sample_genres(db)
+    user_ids = generate_users(db, rng, run, users)
+    durations = generate_movies(db, rng, movies)
+    theater_seats = generate_theaters(db, rng, run, theaters)
+    db.commit()
+
+    counts = generate_showtimes_and_bookings(db, rng, theater_seats, durations, user_ids, days, slots, fill_rate)
+
+    for model in (User, Movie, Theater, Seat, Showtime, Booking, SeatBooking):
+        reset_id_sequence(db, model)
+    db.commit()
+    refresh_search_documents(db)
+
+    counts.update({
+        "users": users,
+        "movies": movies,
+        "theaters": theaters,
+        "seats": sum(len(seat_types) for seat_types in theater_seats.values()),
+    })
+    logger.info(f"Generated synthetic chain in {time.perf_counter() - started:.1f}s: {counts}")
+    return counts
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic cinema chain for load testing")
+    parser.add_argument("--theaters", type=int, default=20, help="number of theaters")
+    parser.add_argument("--movies", type=int, default=200, help="number of movies")
+    parser.add_argument("--days", type=int, default=30, help="days of showtimes from today")
+    parser.add_argument("--slots", type=int, default=5, help="showtimes per theater per day, fewer if long movies leave no room")
+    parser.add_argument("--fill-rate", type=float, default=0.6, help="target share of seats booked per showtime")
+    parser.add_argument("--users", type=int, default=1000, help="number of customers placing the bookings")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for a reproducible dataset")
+    args = parser.parse_args(argv)
+
+    if not 0.0 <= args.fill_rate <= 1.0:
+        parser.error("--fill-rate must be between 0 and 1")
+
+    db = SessionLocal()
+    try:
+        generate_synthetic_chain(
+            db,
+            theaters=args.theaters,
+            movies=args.movies,
+            days=args.days,
+            fill_rate=args.fill_rate,
+            slots=args.slots,
+            users=args.users,
+            seed=args.seed
+        )
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
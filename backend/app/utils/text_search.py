@@ -0,0 +1,207 @@
+import bisect
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from dotenv import load_dotenv
+from .database import DATABASE_URL
+
+load_dotenv()
+
+# "postgres" ranks with tsvector and trigram indexes, "memory" with the in-process index below
+MOVIE_SEARCH_BACKEND = os.getenv(
+    "MOVIE_SEARCH_BACKEND",
+    "postgres" if DATABASE_URL.startswith("postgresql") else "memory"
+)
+# The in-process index is rebuilt after this long so that other workers' edits show up
+MOVIE_SEARCH_INDEX_TTL_SECONDS = float(os.getenv("MOVIE_SEARCH_INDEX_TTL_SECONDS", "300"))
+MAX_SEARCH_TERMS = 8
+# Shorter last terms only match whole words; a one-letter prefix would match most of the catalog
+MIN_PREFIX_LENGTH = 2
+
+# Same weights Postgres ts_rank gives the A, B and C labels of the search vector
+TITLE_WEIGHT = 1.0
+GENRE_WEIGHT = 0.4
+DESCRIPTION_WEIGHT = 0.2
+# A type-ahead prefix match counts for less than the whole word
+PREFIX_MATCH_FACTOR = 0.8
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+def query_terms(query: str) -> List[str]:
+    return list(dict.fromkeys(tokenize(query)))[:MAX_SEARCH_TERMS]
+
+def prefix_tsquery(terms: List[str]) -> str:
+    # Every term must match and the last one may be a partial word: "star & war:*".
+    # Terms only contain word characters, so they need no tsquery escaping.
+    last = terms[-1]
+    if len(last) >= MIN_PREFIX_LENGTH:
+        last = f"{last}:*"
+    return " & ".join(terms[:-1] + [last])
+
+class SearchDocument:
+    __slots__ = ("movie_id", "terms", "is_active", "genre_ids")
+
+    def __init__(self, movie_id: int, terms: Dict[str, float], is_active: bool, genre_ids: Set[int]):
+        self.movie_id = movie_id
+        self.terms = terms
+        self.is_active = is_active
+        self.genre_ids = genre_ids
+
+class MovieSearchIndex:
+    # Inverted index over title, genre names and description, for databases without
+    # full-text search. Terms are kept sorted so a prefix is a bisect range.
+    def __init__(self, ttl_seconds: float = MOVIE_SEARCH_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._terms: List[str] = []
+        self._documents: Dict[int, SearchDocument] = {}
+        self._loaded_at: Optional[float] = None
+
+    def is_loaded(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        return not self.ttl_seconds or time.monotonic() - self._loaded_at <= self.ttl_seconds
+
+    def load(self, movie_rows: Iterable[Tuple], genre_rows: Iterable[Tuple]):
+        # movie_rows are (id, title, description, is_active), genre_rows (movie_id, genre_id, name)
+        genres: Dict[int, List[Tuple[int, str]]] = {}
+        for movie_id, genre_id, name in genre_rows:
+            genres.setdefault(movie_id, []).append((genre_id, name))
+
+        postings: Dict[str, Dict[int, float]] = {}
+        documents: Dict[int, SearchDocument] = {}
+        for movie_id, title, description, is_active in movie_rows:
+            document = self._document(movie_id, title, description, genres.get(movie_id, ()), is_active)
+            documents[movie_id] = document
+            for term, weight in document.terms.items():
+                postings.setdefault(term, {})[movie_id] = weight
+
+        with self._lock:
+            self._postings = postings
+            self._terms = sorted(postings)
+            self._documents = documents
+            self._loaded_at = time.monotonic()
+
+    def upsert(self, movie_id: int, title: str, description: Optional[str], genres: Iterable[Tuple[int, str]], is_active: bool):
+        if self._loaded_at is None:
+            return
+        document = self._document(movie_id, title, description, genres, is_active)
+        with self._lock:
+            self._remove(movie_id)
+            self._documents[movie_id] = document
+            for term, weight in document.terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    bisect.insort(self._terms, term)
+                postings[movie_id] = weight
+
+    def remove(self, movie_id: int):
+        with self._lock:
+            self._remove(movie_id)
+
+    def clear(self):
+        with self._lock:
+            self._postings = {}
+            self._terms = []
+            self._documents = {}
+            self._loaded_at = None
+
+    def search(
+        self,
+        terms: List[str],
+        limit: int,
+        is_active: Optional[bool] = None,
+        genre_id: Optional[int] = None
+    ) -> List[int]:
+        # IDs of the best `limit` movies matching every term, best first
+        if not terms:
+            return []
+        with self._lock:
+            matches = [self._exact_matches(term) for term in terms[:-1]]
+            last = terms[-1]
+            matches.append(self._prefix_matches(last) if len(last) >= MIN_PREFIX_LENGTH else self._exact_matches(last))
+
+            # Intersect from the rarest term so large posting lists are only probed
+            matches.sort(key=len)
+            scores: Dict[int, float] = {}
+            for movie_id, weight in matches[0].items():
+                score = weight
+                for other in matches[1:]:
+                    other_weight = other.get(movie_id)
+                    if other_weight is None:
+                        break
+                    score += other_weight
+                else:
+                    document = self._documents[movie_id]
+                    if is_active is not None and document.is_active != is_active:
+                        continue
+                    if genre_id is not None and genre_id not in document.genre_ids:
+                        continue
+                    scores[movie_id] = score
+
+        return heapq.nsmallest(limit, scores, key=lambda movie_id: (-scores[movie_id], movie_id))
+
+    def _exact_matches(self, term: str) -> Dict[int, float]:
+        postings = self._postings.get(term, {})
+        idf = self._idf(len(postings))
+        return {movie_id: weight * idf for movie_id, weight in postings.items()}
+
+    def _prefix_matches(self, prefix: str) -> Dict[int, float]:
+        matches: Dict[int, float] = {}
+        terms = self._terms
+        for position in range(bisect.bisect_left(terms, prefix), len(terms)):
+            term = terms[position]
+            if not term.startswith(prefix):
+                break
+            postings = self._postings[term]
+            idf = self._idf(len(postings)) * (1.0 if term == prefix else PREFIX_MATCH_FACTOR)
+            for movie_id, weight in postings.items():
+                score = weight * idf
+                if score > matches.get(movie_id, 0.0):
+                    matches[movie_id] = score
+        return matches
+
+    def _idf(self, document_frequency: int) -> float:
+        return math.log(1 + len(self._documents) / (document_frequency or 1))
+
+    def _remove(self, movie_id: int):
+        document = self._documents.pop(movie_id, None)
+        if document is None:
+            return
+        for term in document.terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.pop(movie_id, None)
+            if not postings:
+                del self._postings[term]
+                position = bisect.bisect_left(self._terms, term)
+                if position < len(self._terms) and self._terms[position] == term:
+                    del self._terms[position]
+
+    @staticmethod
+    def _document(movie_id: int, title: str, description: Optional[str], genres: Iterable[Tuple[int, str]], is_active: bool):
+        genres = list(genres)
+        terms: Dict[str, float] = {}
+        for weight, text in (
+            (TITLE_WEIGHT, title),
+            (GENRE_WEIGHT, " ".join(name for _, name in genres)),
+            (DESCRIPTION_WEIGHT, description),
+        ):
+            # A term counts once per field, however often the field repeats it
+            for term in set(tokenize(text)):
+                terms[term] = terms.get(term, 0.0) + weight
+        return SearchDocument(movie_id, terms, bool(is_active), {genre_id for genre_id, _ in genres})
+
+movie_search_index = MovieSearchIndex()
@@ -0,0 +1,157 @@
+import threading
+import zlib
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+class SeatSnapshot:
+    __slots__ = ("id", "theater_id", "row", "number", "seat_type")
+
+    def __init__(self, id: int, theater_id: int, row: str, number: int, seat_type: str):
+        self.id = id
+        self.theater_id = theater_id
+        self.row = row
+        self.number = number
+        self.seat_type = seat_type
+
+class SeatRow:
+    __slots__ = ("label", "positions", "links")
+
+    def __init__(self, label: str, positions: List[int], numbers: List[int]):
+        self.label = label
+        # Layout positions of the row's seats, ordered by seat number
+        self.positions = tuple(positions)
+        # Bit j is set when seat j and seat j + 1 of the row sit side by side
+        self.links = 0
+        for j in range(len(numbers) - 1):
+            if numbers[j + 1] == numbers[j] + 1:
+                self.links |= 1 << j
+
+class TheaterLayout:
+    # Built once per theater and shared by every showtime; never modified after construction
+    __slots__ = (
+        "theater_id", "seat_ids", "row_labels", "numbers", "type_codes", "seat_types",
+        "positions", "type_masks", "rows", "version", "all_seats_mask"
+    )
+
+    def __init__(self, theater_id: int, seats: Iterable[Tuple[int, str, int, str]]):
+        seat_ids = array("q")
+        row_labels = []
+        numbers = array("l")
+        type_codes = array("B")
+        seat_types: Dict[str, int] = {}
+        for seat_id, row, number, seat_type in seats:
+            seat_ids.append(seat_id)
+            row_labels.append(row)
+            numbers.append(number)
+            type_codes.append(seat_types.setdefault(seat_type, len(seat_types)))
+
+        set_attribute = object.__setattr__
+        set_attribute(self, "theater_id", theater_id)
+        set_attribute(self, "seat_ids", seat_ids)
+        set_attribute(self, "row_labels", tuple(row_labels))
+        set_attribute(self, "numbers", numbers)
+        set_attribute(self, "type_codes", type_codes)
+        set_attribute(self, "seat_types", tuple(seat_types))
+        # Bit position of each seat in the showtime bitmaps
+        set_attribute(self, "positions", {seat_id: position for position, seat_id in enumerate(seat_ids)})
+        # Bitmap of the seats of each type, e.g. to restrict an allocation to premium seats
+        type_masks = dict.fromkeys(seat_types, 0)
+        for position, type_code in enumerate(type_codes):
+            type_masks[self.seat_types[type_code]] |= 1 << position
+        set_attribute(self, "type_masks", type_masks)
+        set_attribute(self, "rows", self._build_rows())
+        set_attribute(self, "all_seats_mask", (1 << len(seat_ids)) - 1)
+        # Changes whenever a seat is added, removed or altered, so clients can cache the layout
+        layout_key = "|".join(
+            f"{seat_ids[position]},{row_labels[position]},{numbers[position]},{self.seat_type(position)}"
+            for position in range(len(seat_ids))
+        )
+        set_attribute(self, "version", format(zlib.crc32(layout_key.encode()), "08x"))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TheaterLayout is immutable")
+
+    def __len__(self) -> int:
+        return len(self.seat_ids)
+
+    def seat_type(self, position: int) -> str:
+        return self.seat_types[self.type_codes[position]]
+
+    def seat_type_of(self, seat_id: int) -> Optional[str]:
+        position = self.positions.get(seat_id)
+        return self.seat_type(position) if position is not None else None
+
+    def snapshot(self, position: int) -> SeatSnapshot:
+        return SeatSnapshot(
+            self.seat_ids[position],
+            self.theater_id,
+            self.row_labels[position],
+            self.numbers[position],
+            self.seat_type(position)
+        )
+
+    def snapshots(self, positions: Optional[Iterable[int]] = None) -> List[SeatSnapshot]:
+        if positions is None:
+            positions = range(len(self.seat_ids))
+        return [self.snapshot(position) for position in positions]
+
+    def snapshots_of(self, bits: int) -> List[SeatSnapshot]:
+        # Seats whose bit is set, in layout order
+        return self.snapshots(position for position in range(len(self.seat_ids)) if bits >> position & 1)
+
+    def mask(self, seat_ids: Iterable[int]) -> int:
+        mask = 0
+        positions = self.positions
+        for seat_id in seat_ids:
+            position = positions.get(seat_id)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+    def _build_rows(self):
+        # Rows front to back, as laid out by create_seats_for_theater
+        positions_by_row: Dict[str, List[int]] = {}
+        for position, label in enumerate(self.row_labels):
+            positions_by_row.setdefault(label, []).append(position)
+
+        rows = []
+        for label in sorted(positions_by_row, key=lambda label: (len(label), label)):
+            positions = sorted(positions_by_row[label], key=lambda position: self.numbers[position])
+            rows.append(SeatRow(label, positions, [self.numbers[position] for position in positions]))
+        return tuple(rows)
+
+class TheaterLayoutCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._layouts: Dict[int, TheaterLayout] = {}
+        self._listeners: List[Callable[[int], None]] = []
+
+    def add_listener(self, listener: Callable[[int], None]):
+        # Called with the theater ID whenever its layout is invalidated
+        self._listeners.append(listener)
+
+    def get(self, theater_id: int) -> Optional[TheaterLayout]:
+        return self._layouts.get(theater_id)
+
+    def install(self, theater_id: int, seats: Iterable[Tuple[int, str, int, str]]) -> TheaterLayout:
+        layout = TheaterLayout(theater_id, seats)
+        with self._lock:
+            self._layouts[theater_id] = layout
+        return layout
+
+    def invalidate(self, theater_id: int):
+        # Call after seats of the theater are added, removed or changed
+        with self._lock:
+            self._layouts.pop(theater_id, None)
+        for listener in self._listeners:
+            listener(theater_id)
+
+    def clear(self):
+        with self._lock:
+            theater_ids = list(self._layouts)
+            self._layouts.clear()
+        for theater_id in theater_ids:
+            for listener in self._listeners:
+                listener(theater_id)
+
+theater_layout_cache = TheaterLayoutCache()
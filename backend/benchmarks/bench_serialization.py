@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.models.movie import Movie as MovieModel, Genre as GenreModel
+from app.models.ticket import Booking as BookingModel, SeatBooking as SeatBookingModel, Payment as PaymentModel
+from app.models.ticket import BookingStatus, PaymentStatus, PaymentMethod
+# Imported so every mapper is configured when run standalone
+from app.models import user, showtime, support, idempotency  # noqa: F401
+from app.schemas.movie import Movie
+from app.schemas.ticket import Booking
+from app.utils.fast_json import FastJSONResponse, dump_json, serializer
+
+# Compares FastAPI's response_model handling with the fast JSON path on the same
+# detached ORM objects, so no database is involved:
+#   python -m benchmarks.bench_serialization --items 100
+
+NOW = datetime(2024, 1, 1, 18, 30)
+
+def make_bookings(count: int) -> List[BookingModel]:
+    bookings = []
+    for booking_id in range(1, count + 1):
+        booking = BookingModel(
+            id=booking_id,
+            user_id=booking_id % 50 + 1,
+            showtime_id=booking_id % 20 + 1,
+            booking_reference=f"BK{booking_id:08d}",
+            status=BookingStatus.CONFIRMED,
+            total_price=32.97,
+            created_by_support=False,
+            support_agent_id=None,
+            created_at=NOW,
+            updated_at=NOW + timedelta(minutes=5),
+        )
+        booking.seat_bookings = [
+            SeatBookingModel(id=booking_id * 3 + seat, booking_id=booking_id, seat_id=seat + 1, price=10.99)
+            for seat in range(3)
+        ]
+        booking.payment = PaymentModel(
+            id=booking_id,
+            booking_id=booking_id,
+            amount=32.97,
+            payment_method=PaymentMethod.CREDIT_CARD,
+            payment_details=None,
+            status=PaymentStatus.COMPLETED,
+            transaction_id=f"TX{booking_id:010d}",
+            created_at=NOW,
+            updated_at=None,
+        )
+        bookings.append(booking)
+    return bookings
+
+def make_movies(count: int) -> List[MovieModel]:
+    genres = [GenreModel(id=genre_id, name=f"Genre {genre_id}") for genre_id in range(1, 6)]
+    return [
+        MovieModel(
+            id=movie_id,
+            title=f"Movie {movie_id}",
+            description="A long enough description to look like a real synopsis. " * 4,
+            duration_minutes=120,
+            release_date=NOW,
+            poster_url=f"https://example.com/posters/{movie_id}.jpg",
+            trailer_url=None,
+            rating=7.5,
+            is_active=True,
+            created_at=NOW,
+            updated_at=None,
+            genres=genres[movie_id % 5:] + genres[:movie_id % 5][:2],
+        )
+        for movie_id in range(1, count + 1)
+    ]
+
+def best_of(function, repeat: int, number: int) -> float:
+    # Best per-call time in seconds over repeat runs of number calls
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - started) / number)
+    return min(timings)
+
+def bench(name: str, annotation, items, repeat: int, number: int):
+    field = create_response_field(name=f"Response_{name}", type_=annotation)
+    loop = asyncio.new_event_loop()
+
+    def fastapi_path():
+        # What a route returning ORM objects with response_model=annotation does
+        content = loop.run_until_complete(serialize_response(field=field, response_content=items))
+        return JSONResponse(content).body
+
+    def fast_json_path():
+        return FastJSONResponse(dump_json(annotation, items)).body
+
+    models = serializer(annotation).validate_python(items, from_attributes=True)
+
+    def fast_json_validated_path():
+        return FastJSONResponse(dump_json(annotation, models, validated=True)).body
+
+    try:
+        baseline = best_of(fastapi_path, repeat, number)
+        results = [
+            ("response_model", baseline),
+            ("fast_json", best_of(fast_json_path, repeat, number)),
+            ("fast_json validated", best_of(fast_json_validated_path, repeat, number)),
+        ]
+    finally:
+        loop.close()
+
+    print(f"{name} ({len(items)} items, {len(fast_json_path())} bytes)")
+    for label, seconds in results:
+        print(f"  {label:<20} {seconds * 1e6:>10.1f} us/response  {baseline / seconds:>5.1f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark response serialization paths")
+    parser.add_argument("--items", type=int, default=100, help="items per list response")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs; the best is reported")
+    parser.add_argument("--number", type=int, default=200, help="responses serialized per run")
+    args = parser.parse_args(argv)
+
+    bench("bookings", List[Booking], make_bookings(args.items), args.repeat, args.number)
+    bench("movies", List[Movie], make_movies(args.items), args.repeat, args.number)
+
+if __name__ == "__main__":
+    main()
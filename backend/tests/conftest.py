@@ -0,0 +1,157 @@
+import itertools
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# The app's engines are created on import, so the test database is chosen first
+TEST_DATABASE_DIR = tempfile.mkdtemp(prefix="cinema-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(TEST_DATABASE_DIR, 'test.db')}"
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from app.main import app
+from app.models.user import User
+from app.models.movie import Genre, Movie, MovieGenre
+from app.models.showtime import Theater, Seat, Showtime
+from app.models.ticket import Booking, SeatBooking, Payment, BookingStatus, PaymentStatus, PaymentMethod
+from app.utils.database import SessionLocal
+from app.utils.security import create_access_token
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Enough rows that every list route can fill its largest tested page
+MOVIE_COUNT = 30
+BOOKING_COUNT = 30
+
+# Start days of showtimes created by tests, so none of them overlap
+showtime_days = itertools.count(2)
+
+def migrate():
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    command.upgrade(config, "head")
+
+def seed(db):
+    admin = User(
+        username="admin",
+        email="admin@cinema.com",
+        hashed_password="not-used",
+        full_name="Admin User",
+        is_active=True,
+        is_admin=True
+    )
+    db.add(admin)
+    
+    genres = [Genre(name=name) for name in ("Action", "Comedy", "Drama")]
+    db.add_all(genres)
+    movies = []
+    for number in range(MOVIE_COUNT):
+        movie = Movie(
+            title=f"Movie {number}",
+            description="A movie",
+            duration_minutes=120,
+            release_date=datetime(2024, 1, 1),
+            is_active=True
+        )
+        movie.genre_links = [MovieGenre(genre=genres[number % 3]), MovieGenre(genre=genres[(number + 1) % 3])]
+        movies.append(movie)
+    db.add_all(movies)
+    
+    theater = Theater(name="Main Theater", capacity=BOOKING_COUNT)
+    db.add(theater)
+    db.flush()
+    seats = [
+        Seat(theater_id=theater.id, row="A", number=number + 1, seat_type="regular")
+        for number in range(BOOKING_COUNT)
+    ]
+    db.add_all(seats)
+    start_time = datetime.now().replace(microsecond=0) + timedelta(days=1)
+    showtime = Showtime(
+        movie_id=movies[0].id,
+        theater_id=theater.id,
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        price=10.0,
+        is_active=True
+    )
+    db.add(showtime)
+    db.flush()
+    
+    # One seat per booking; every other booking is paid
+    for number, seat in enumerate(seats):
+        booking = Booking(
+            user_id=admin.id,
+            showtime_id=showtime.id,
+            booking_reference=f"BK{number:06d}",
+            status=BookingStatus.CONFIRMED if number % 2 else BookingStatus.PENDING,
+            total_price=10.0
+        )
+        booking.seat_bookings = [SeatBooking(showtime_id=showtime.id, seat_id=seat.id, price=10.0, is_active=True)]
+        if number % 2:
+            booking.payment = Payment(
+                amount=10.0,
+                payment_method=PaymentMethod.CREDIT_CARD,
+                status=PaymentStatus.COMPLETED,
+                transaction_id=f"TX{number:06d}"
+            )
+        db.add(booking)
+    db.commit()
+    return admin
+
+@pytest.fixture(scope="session")
+def admin():
+    migrate()
+    db = SessionLocal()
+    try:
+        admin = seed(db)
+        return {"id": admin.id, "username": admin.username}
+    finally:
+        db.close()
+
+@pytest.fixture(scope="session")
+def client(admin):
+    # Not entered as a context manager, so the background sweepers stay off and
+    # only the request under test touches the database
+    return TestClient(app)
+
+@pytest.fixture(scope="session")
+def admin_headers(admin):
+    token = create_access_token(data={"sub": admin["username"], "user_id": admin["id"], "is_admin": True})
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def db(admin):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture(scope="session")
+def seat_ids(admin):
+    session = SessionLocal()
+    try:
+        return [seat_id for (seat_id,) in session.query(Seat.id).order_by(Seat.id).all()]
+    finally:
+        session.close()
+
+@pytest.fixture
+def showtime_id(db):
+    # A new showtime in the seeded theater, so every seat is free
+    movie_id, theater_id = db.query(Showtime.movie_id, Showtime.theater_id).order_by(Showtime.id).first()
+    start_time = datetime.now().replace(microsecond=0) + timedelta(days=next(showtime_days))
+    showtime = Showtime(
+        movie_id=movie_id,
+        theater_id=theater_id,
+        start_time=start_time,
+        end_time=start_time + timedelta(hours=2),
+        price=10.0,
+        is_active=True
+    )
+    db.add(showtime)
+    db.commit()
+    return showtime.id
@@ -0,0 +1,54 @@
+import threading
+import pytest
+from fastapi import HTTPException
+from app.models.ticket import SeatBooking
+from app.schemas.ticket import BookingCreate
+from app.services.booking_queue import BookingQueue
+from app.services.ticket_service import TicketService
+
+@pytest.fixture
+def stalled_queue():
+    # One worker whose first validation waits until the test lets it go
+    ticket_service = TicketService()
+    validate_booking = ticket_service.validate_booking
+    started = threading.Event()
+    resume = threading.Event()
+
+    def stalled_validate_booking(db, booking):
+        started.set()
+        resume.wait(5)
+        validate_booking(db, booking)
+
+    ticket_service.validate_booking = stalled_validate_booking
+    queue = BookingQueue(ticket_service, enabled=True, workers=1, timeout_seconds=0.2)
+    try:
+        yield queue, started, resume
+    finally:
+        resume.set()
+        queue.shutdown()
+
+def test_timed_out_booking_is_withdrawn(db, admin, showtime_id, seat_ids, stalled_queue):
+    queue, started, resume = stalled_queue
+    first = BookingCreate(showtime_id=showtime_id, user_id=admin["id"], seat_ids=seat_ids[:1])
+    second = BookingCreate(showtime_id=showtime_id, user_id=admin["id"], seat_ids=seat_ids[1:2])
+
+    first_future = queue.enqueue(first)
+    assert started.wait(5)
+
+    # The worker is busy with the first booking, so the second times out while queued
+    with pytest.raises(HTTPException) as error:
+        queue.submit(second)
+    assert error.value.status_code == 503
+    assert queue.pending_count(showtime_id) == 0
+
+    # The running booking cannot be withdrawn and is still made
+    resume.set()
+    assert first_future.result(timeout=5) is not None
+
+    booked_seat_ids = {
+        seat_id for (seat_id,) in db.query(SeatBooking.seat_id).filter(SeatBooking.showtime_id == showtime_id).all()
+    }
+    assert booked_seat_ids == set(seat_ids[:1])
+
+    # The withdrawn booking released its seat claim, so the seat can be booked again
+    assert queue.submit(second) is not None
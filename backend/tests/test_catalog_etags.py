@@ -0,0 +1,25 @@
+from app.utils.query_budget import count_queries
+from app.utils.response_cache import catalog_cache
+
+def test_movie_list_etag_is_cached_and_changes_with_writes(client, admin_headers):
+    catalog_cache.clear()
+    with count_queries() as first_page:
+        first = client.get("/movies/", params={"limit": 5})
+    # Another page reuses the cached catalog version instead of scanning movies again
+    with count_queries() as second_page:
+        second = client.get("/movies/", params={"limit": 6})
+    assert second_page.count == first_page.count - 1
+    etag = first.headers["ETag"]
+    assert second.headers["ETag"] == etag
+    
+    response = client.get("/movies/", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    movie_id = first.json()[0]["id"]
+    response = client.put(f"/movies/{movie_id}", json={"rating": 8.8}, headers=admin_headers)
+    assert response.status_code == 200
+    
+    response = client.get("/movies/", params={"limit": 5}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()[0]["rating"] == 8.8
@@ -0,0 +1,42 @@
+import uuid
+import pytest
+from app.models.ticket import Booking
+from app.utils import idempotency
+from app.utils.idempotency import InMemoryIdempotencyStore, DatabaseIdempotencyStore
+
+@pytest.fixture(params=[InMemoryIdempotencyStore, DatabaseIdempotencyStore])
+def idempotency_store(request, monkeypatch, admin):
+    store = request.param()
+    monkeypatch.setattr(idempotency, "idempotency_store", store)
+    return store
+
+def test_retried_booking_is_made_once(client, db, admin, admin_headers, showtime_id, seat_ids, idempotency_store):
+    headers = {**admin_headers, "Idempotency-Key": str(uuid.uuid4())}
+    booking = {"showtime_id": showtime_id, "user_id": admin["id"], "seat_ids": seat_ids[:2]}
+
+    first = client.post("/tickets/bookings/", json=booking, headers=headers)
+    assert first.status_code == 200
+    retry = client.post("/tickets/bookings/", json=booking, headers=headers)
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json()["id"] == first.json()["id"]
+    assert db.query(Booking).filter(Booking.showtime_id == showtime_id).count() == 1
+
+    # The same key cannot be reused for a different booking
+    booking["seat_ids"] = seat_ids[2:4]
+    response = client.post("/tickets/bookings/", json=booking, headers=headers)
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Idempotency-Key was already used with a different request body"
+    assert db.query(Booking).filter(Booking.showtime_id == showtime_id).count() == 1
+
+def test_failed_request_can_be_retried_with_its_key(client, admin, admin_headers, showtime_id, seat_ids, idempotency_store):
+    headers = {**admin_headers, "Idempotency-Key": str(uuid.uuid4())}
+    booking = {"showtime_id": showtime_id, "user_id": admin["id"], "seat_ids": seat_ids[:1]}
+    assert client.post("/tickets/bookings/", json=booking, headers=admin_headers).status_code == 200
+
+    # The seat is taken, so the failure is not stored against the key
+    assert client.post("/tickets/bookings/", json=booking, headers=headers).status_code == 400
+    booking["seat_ids"] = seat_ids[1:2]
+    response = client.post("/tickets/bookings/", json=booking, headers=headers)
+    assert response.status_code == 200
+    assert "Idempotent-Replayed" not in response.headers
@@ -0,0 +1,36 @@
+from app.models.showtime import ShowtimeOccupancy
+from app.repositories.ticket_repository import TicketRepository
+from app.services.ticket_service import TicketService
+
+def read_occupancy(client, showtime_id):
+    response = client.get("/tickets/showtimes/occupancy", params={"showtime_ids": [showtime_id]})
+    assert response.status_code == 200
+    (occupancy,) = response.json()
+    return occupancy
+
+def counter_rows(db, showtime_id):
+    db.expire_all()
+    return db.query(ShowtimeOccupancy).filter(ShowtimeOccupancy.showtime_id == showtime_id).all()
+
+def test_occupancy_is_counted_without_writing(client, db, showtime_id, seat_ids):
+    occupancy = read_occupancy(client, showtime_id)
+    assert occupancy["total_seats"] == len(seat_ids)
+    assert occupancy["booked_seats"] == 0
+    assert counter_rows(db, showtime_id) == []
+
+def test_reconcile_fixes_drifted_counters(client, db, admin, admin_headers, showtime_id, seat_ids):
+    booking = {"showtime_id": showtime_id, "user_id": admin["id"], "seat_ids": seat_ids[:2]}
+    assert client.post("/tickets/bookings/", json=booking, headers=admin_headers).status_code == 200
+    (row,) = counter_rows(db, showtime_id)
+    assert row.booked_seats == 2
+
+    # Counters are trusted once they exist, so drift shows until it is reconciled
+    row.booked_seats = 0
+    db.commit()
+    assert read_occupancy(client, showtime_id)["booked_seats"] == 0
+
+    assert TicketService().reconcile_occupancy() >= 1
+    (row,) = counter_rows(db, showtime_id)
+    assert row.booked_seats == 2
+    assert read_occupancy(client, showtime_id)["available_seats"] == len(seat_ids) - 2
+    assert TicketRepository().reconcile_occupancy(db, [showtime_id]) == 0
@@ -0,0 +1,45 @@
+import pytest
+from app.utils.pagination import NEXT_CURSOR_HEADER, encode_cursor
+
+PAGE_SIZE = 7
+
+def ids(response):
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()]
+
+def test_booking_pages_survive_new_bookings(client, admin, admin_headers, showtime_id, seat_ids):
+    listed = ids(client.get("/tickets/bookings/", params={"limit": 1000}, headers=admin_headers))
+    assert listed == sorted(listed, reverse=True)
+
+    response = client.get("/tickets/bookings/", params={"limit": PAGE_SIZE}, headers=admin_headers)
+    walked = ids(response)
+
+    # Newest first, so a booking made mid-walk sorts before the cursor and shifts nothing
+    booking = {"showtime_id": showtime_id, "user_id": admin["id"], "seat_ids": seat_ids[:1]}
+    assert client.post("/tickets/bookings/", json=booking, headers=admin_headers).status_code == 200
+
+    while NEXT_CURSOR_HEADER in response.headers:
+        params = {"limit": PAGE_SIZE, "cursor": response.headers[NEXT_CURSOR_HEADER]}
+        response = client.get("/tickets/bookings/", params=params, headers=admin_headers)
+        page = ids(response)
+        assert 0 < len(page) <= PAGE_SIZE
+        walked += page
+    assert walked == listed
+
+def test_movie_pages_cover_the_catalog(client):
+    listed = ids(client.get("/movies/", params={"limit": 1000}))
+
+    response = client.get("/movies/", params={"limit": PAGE_SIZE})
+    walked = ids(response)
+    while NEXT_CURSOR_HEADER in response.headers:
+        response = client.get("/movies/", params={"limit": PAGE_SIZE, "cursor": response.headers[NEXT_CURSOR_HEADER]})
+        walked += ids(response)
+    assert walked == listed
+    assert len(walked) == len(set(walked))
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor([2 ** 40]), encode_cursor(["1"]), encode_cursor([1, 2])])
+def test_tampered_cursors_are_rejected(client, admin_headers, cursor):
+    for path in ("/tickets/bookings/", "/movies/"):
+        response = client.get(path, params={"cursor": cursor}, headers=admin_headers)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
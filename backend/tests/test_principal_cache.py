@@ -0,0 +1,51 @@
+import uuid
+import pytest
+from app.models.user import User
+from app.utils.principal_cache import PrincipalCache, UserChangePoller, principal_cache
+from app.utils.security import create_access_token
+
+@pytest.fixture
+def user(db):
+    name = f"viewer-{uuid.uuid4().hex[:8]}"
+    user = User(username=name, email=f"{name}@cinema.com", hashed_password="not-used", full_name="Viewer", is_active=True, is_admin=False)
+    db.add(user)
+    db.commit()
+    return user
+
+def user_headers(user):
+    token = create_access_token(data={"sub": user.username, "user_id": user.id, "is_admin": False})
+    return {"Authorization": f"Bearer {token}"}
+
+def test_admin_changes_reach_the_principal_cache(client, db, admin_headers, user):
+    headers = user_headers(user)
+    assert client.get("/auth/me", headers=headers).json()["full_name"] == "Viewer"
+    assert principal_cache.get(user.id) is not None
+
+    # Another worker's cache only learns about the change from polling users.updated_at
+    other_cache = PrincipalCache()
+    poller = UserChangePoller(other_cache)
+    poller.poll()
+    other_cache.install(user, other_cache.generation(user.id))
+    assert other_cache.get(user.id) is not None
+
+    response = client.put(f"/admin/users/{user.id}", json={"full_name": "Renamed"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert client.get("/auth/me", headers=headers).json()["full_name"] == "Renamed"
+
+    assert client.delete(f"/admin/users/{user.id}", headers=admin_headers).status_code == 200
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+    # Inactive users are never cached, so every request sees the deactivation
+    assert principal_cache.get(user.id) is None
+
+    assert other_cache.get(user.id) is not None
+    assert poller.poll() >= 1
+    assert other_cache.get(user.id) is None
+
+def test_lookup_racing_an_invalidation_is_not_cached(db, user):
+    cache = PrincipalCache()
+    generation = cache.generation(user.id)
+    cache.invalidate(user.id)
+    cache.install(user, generation)
+    assert cache.get(user.id) is None
@@ -0,0 +1,37 @@
+import pytest
+from app.utils.query_budget import assert_query_budget
+from app.utils.response_cache import catalog_cache
+
+# List routes load their relationships in a fixed number of queries, however large the page
+PAGE_SIZES = (5, 25)
+
+def list_query_counts(client, headers, path, budget):
+    counts = []
+    for limit in PAGE_SIZES:
+        # Cached catalog pages would answer without touching the database
+        catalog_cache.clear()
+        with assert_query_budget(budget) as counter:
+            response = client.get(path, params={"limit": limit}, headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) == limit
+        counts.append(counter.count)
+    return counts
+
+@pytest.fixture(autouse=True)
+def authenticated(client, admin_headers):
+    # The first authenticated request loads the user; later ones hit the principal cache
+    client.get("/tickets/bookings/", params={"limit": 1}, headers=admin_headers)
+
+def test_booking_list_query_count_does_not_grow_with_page_size(client, admin_headers):
+    small_page, large_page = list_query_counts(client, admin_headers, "/tickets/bookings/", budget=2)
+    assert small_page == large_page
+
+def test_movie_list_query_count_does_not_grow_with_page_size(client, admin_headers):
+    small_page, large_page = list_query_counts(client, admin_headers, "/movies/", budget=3)
+    assert small_page == large_page
+
+def test_query_budget_reports_the_statements_over_budget(client, admin_headers):
+    catalog_cache.clear()
+    with pytest.raises(AssertionError, match="Expected at most 1 queries, ran 3"):
+        with assert_query_budget(1):
+            client.get("/movies/", params={"limit": 5}, headers=admin_headers)
@@ -0,0 +1,53 @@
+import os
+import sqlite3
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.utils.read_replicas import Replica, READ_YOUR_WRITES_COOKIE, replica_router
+
+@pytest.fixture
+def stale_replica(monkeypatch, showtime_id):
+    # A read-only copy of the primary as it is now; later writes never reach it
+    primary_path = os.environ["DATABASE_URL"].removeprefix("sqlite:///")
+    path = os.path.join(os.path.dirname(primary_path), "replica.db")
+    primary = sqlite3.connect(primary_path)
+    copy = sqlite3.connect(path)
+    try:
+        primary.backup(copy)
+    finally:
+        copy.close()
+        primary.close()
+
+    replica = Replica(f"sqlite:///file:{path}?mode=ro&uri=true")
+    monkeypatch.setattr(replica_router, "replicas", [replica])
+    try:
+        yield replica
+    finally:
+        replica.engine.dispose()
+        os.remove(path)
+
+def booked_seats(client, showtime_id):
+    response = client.get("/tickets/showtimes/occupancy", params={"showtime_ids": [showtime_id]})
+    assert response.status_code == 200
+    return response.json()[0]["booked_seats"]
+
+def test_writer_reads_its_own_booking_from_the_primary(admin, admin_headers, showtime_id, seat_ids, stale_replica):
+    # Own clients, so the cookie does not leak into other tests
+    writer = TestClient(app)
+    reader = TestClient(app)
+
+    booking = {"showtime_id": showtime_id, "user_id": admin["id"], "seat_ids": seat_ids[:1]}
+    response = writer.post("/tickets/bookings/", json=booking, headers=admin_headers)
+    assert response.status_code == 200
+    assert READ_YOUR_WRITES_COOKIE in response.cookies
+
+    assert booked_seats(writer, showtime_id) == 1
+    # Everyone else reads the replica, which has not seen the booking yet
+    assert booked_seats(reader, showtime_id) == 0
+
+def test_failed_write_keeps_reading_replicas(admin, admin_headers, showtime_id, stale_replica):
+    client = TestClient(app)
+    booking = {"showtime_id": showtime_id, "user_id": admin["id"], "seat_ids": [0]}
+    response = client.post("/tickets/bookings/", json=booking, headers=admin_headers)
+    assert response.status_code >= 400
+    assert READ_YOUR_WRITES_COOKIE not in response.cookies
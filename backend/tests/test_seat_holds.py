@@ -0,0 +1,20 @@
+from datetime import datetime, timedelta
+from app.models.ticket import SeatHold
+from app.utils.seat_holds import SeatHoldStore, DatabaseHoldPersistence
+
+def test_purge_deletes_only_expired_persisted_holds(db, showtime_id, seat_ids):
+    now = datetime.utcnow()
+    db.add_all([
+        # Left behind by a worker that died before its sweeper ran
+        SeatHold(hold_reference="abandoned", showtime_id=showtime_id, seat_ids=str(seat_ids[0]), expires_at=now - timedelta(minutes=5)),
+        SeatHold(hold_reference="live", showtime_id=showtime_id, seat_ids=str(seat_ids[1]), expires_at=now + timedelta(minutes=5)),
+    ])
+    db.commit()
+    
+    store = SeatHoldStore(DatabaseHoldPersistence())
+    assert store.purge_expired() == 1
+    
+    db.expire_all()
+    references = {reference for (reference,) in db.query(SeatHold.hold_reference).all()}
+    assert "abandoned" not in references
+    assert "live" in references
@@ -0,0 +1,41 @@
+from app.models.showtime import Showtime
+from app.repositories.ticket_repository import TicketRepository
+from app.schemas.ticket import BookingCreate
+
+def test_deactivated_showtime_is_not_on_sale(client, admin, admin_headers, showtime_id, seat_ids):
+    response = client.delete(f"/showtimes/{showtime_id}", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["is_active"] is False
+    
+    booking = {"showtime_id": showtime_id, "user_id": admin["id"], "seat_ids": seat_ids[:1]}
+    response = client.post("/tickets/bookings/", json=booking, headers=admin_headers)
+    assert response.status_code == 409
+    assert response.json()["detail"] == "Showtime is no longer on sale"
+    
+    hold = {"showtime_id": showtime_id, "seat_ids": seat_ids[:1]}
+    response = client.post("/tickets/holds/", json=hold, headers=admin_headers)
+    assert response.status_code == 409
+    
+    request = {"showtime_id": showtime_id, "user_id": admin["id"], "party_size": 2}
+    response = client.post("/tickets/bookings/best-available", json=request, headers=admin_headers)
+    assert response.status_code == 409
+    
+    assert client.get(f"/tickets/showtimes/{showtime_id}/seats").json() == []
+    assert client.get(f"/tickets/showtimes/{showtime_id}/seats", params={"format": "bitset"}).status_code == 404
+
+def test_repository_rejects_bookings_for_inactive_showtimes(db, admin, showtime_id, seat_ids):
+    # The repository checks the showtime itself, for callers racing a deactivation
+    db.query(Showtime).filter(Showtime.id == showtime_id).update({Showtime.is_active: False})
+    db.commit()
+    booking = BookingCreate(showtime_id=showtime_id, user_id=admin["id"], seat_ids=seat_ids[:1])
+    assert TicketRepository().create_bookings(db, [booking]) is None
+
+def test_schedule_lists_carry_ids_only(client, showtime_id):
+    showtime = client.get(f"/showtimes/{showtime_id}").json()
+    assert showtime["movie"]["id"] == showtime["movie_id"]
+    assert showtime["theater"]["id"] == showtime["theater_id"]
+    
+    schedule = client.get("/showtimes/", params={"start": showtime["start_time"], "end": showtime["end_time"]}).json()
+    listed = next(scheduled for scheduled in schedule if scheduled["id"] == showtime_id)
+    assert "movie" not in listed and "theater" not in listed
+    assert listed["movie_id"] == showtime["movie_id"]
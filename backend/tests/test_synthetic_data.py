@@ -0,0 +1,33 @@
+from app.models.showtime import Seat, Showtime
+from app.models.ticket import SeatBooking
+from app.repositories.ticket_repository import SEAT_TYPE_PRICE_MULTIPLIERS
+from app.utils.synthetic_data import generate_synthetic_chain, generate_theaters
+
+def test_generated_showtimes_do_not_overlap_and_seats_are_priced_by_type(db, monkeypatch):
+    theater_ids = []
+    
+    def recording_generate_theaters(*args, **kwargs):
+        theaters = generate_theaters(*args, **kwargs)
+        theater_ids.extend(theaters)
+        return theaters
+    
+    monkeypatch.setattr("app.utils.synthetic_data.generate_theaters", recording_generate_theaters)
+    generate_synthetic_chain(db, theaters=2, movies=20, days=2, fill_rate=0.5, slots=6, users=3, seed=7)
+    
+    showtimes = db.query(Showtime)\
+        .filter(Showtime.theater_id.in_(theater_ids))\
+        .order_by(Showtime.theater_id, Showtime.start_time)\
+        .all()
+    assert showtimes
+    for previous, showtime in zip(showtimes, showtimes[1:]):
+        if previous.theater_id == showtime.theater_id:
+            assert previous.end_time <= showtime.start_time
+    
+    prices = {showtime.id: showtime.price for showtime in showtimes}
+    seat_bookings = db.query(SeatBooking.showtime_id, SeatBooking.price, Seat.seat_type)\
+        .join(Seat, Seat.id == SeatBooking.seat_id)\
+        .filter(SeatBooking.showtime_id.in_(list(prices)))\
+        .all()
+    assert {seat_type for _, _, seat_type in seat_bookings} >= set(SEAT_TYPE_PRICE_MULTIPLIERS)
+    for showtime_id, price, seat_type in seat_bookings:
+        assert price == prices[showtime_id] * SEAT_TYPE_PRICE_MULTIPLIERS.get(seat_type, 1)
@@ -105,6 +105,16 @@ class TicketRepository {
     }
   }
 
+  subscribeToSeatMap(showtimeId, onMessage, onError) {
+    // Server-sent events: a snapshot first, then only the seats that change state
+    const eventSource = new EventSource(`${this.baseUrl}/showtimes/${showtimeId}/seats/stream`);
+    eventSource.onmessage = (event) => onMessage(JSON.parse(event.data));
+    if (onError) {
+      eventSource.onerror = onError;
+    }
+    return () => eventSource.close();
+  }
+
   async createPayment(paymentData) {
     try {
       const token = localStorage.getItem('token');
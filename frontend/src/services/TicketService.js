@@ -76,6 +76,35 @@ class TicketService {
     }
   }
 
+  subscribeToSeatMap(showtimeId, onSeatsChange, onError) {
+    const knownSeats = new Map();
+    let available = new Set();
+
+    const emit = (event) => {
+      const seats = [...available].map(id => knownSeats.get(id));
+      onSeatsChange(seats, event);
+    };
+
+    return TicketRepository.subscribeToSeatMap(showtimeId, async (event) => {
+      if (event.type === 'snapshot') {
+        event.seats.forEach(seat => knownSeats.set(seat.id, seat));
+        available = new Set(event.seats.map(seat => seat.id));
+      } else if (event.state === 'released') {
+        // Seats never seen as available need their details fetched once
+        if (event.seat_ids.some(id => !knownSeats.has(id))) {
+          const seats = await TicketRepository.getAvailableSeats(showtimeId);
+          seats.forEach(seat => knownSeats.set(seat.id, seat));
+          available = new Set(seats.map(seat => seat.id));
+        } else {
+          event.seat_ids.forEach(id => available.add(id));
+        }
+      } else {
+        event.seat_ids.forEach(id => available.delete(id));
+      }
+      emit(event);
+    }, onError);
+  }
+
   async createPayment(bookingId, amount, paymentMethod, paymentDetails = null) {
     try {
       const paymentData = {